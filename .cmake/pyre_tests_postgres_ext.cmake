@@ -19,6 +19,8 @@ pyre_test_python_testcase(tests/postgres.ext/pyrepg_submit.py)
 # components
 pyre_test_python_testcase(tests/postgres.ext/postgres_database.py)
 pyre_test_python_testcase(tests/postgres.ext/postgres_attach.py)
+pyre_test_python_testcase(tests/postgres.ext/postgres_stream.py)
+pyre_test_python_testcase(tests/postgres.ext/postgres_load.py)
 pyre_test_python_testcase(tests/postgres.ext/postgres_database_create.py)
 pyre_test_python_testcase(tests/postgres.ext/postgres_table.py)
 pyre_test_python_testcase(tests/postgres.ext/postgres_reserved.py)
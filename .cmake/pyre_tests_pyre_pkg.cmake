@@ -274,6 +274,7 @@ pyre_test_python_testcase(tests/pyre.pkg/calc/expression_resolution.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/expression_circular.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/expression_syntaxerror.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/expression_typeerror.py)
+pyre_test_python_testcase(tests/pyre.pkg/calc/expression_cache.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/interpolation.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/interpolation_escaped.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/interpolation_circular.py)
@@ -281,11 +282,14 @@ pyre_test_python_testcase(tests/pyre.pkg/calc/memo.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/memo_model.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/memo_expression.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/memo_interpolation.py)
+pyre_test_python_testcase(tests/pyre.pkg/calc/memo_batch.py)
+pyre_test_python_testcase(tests/pyre.pkg/calc/memo_engine.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/hierarchical.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/hierarchical_patch.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/hierarchical_alias.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/hierarchical_group.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/hierarchical_contains.py)
+pyre_test_python_testcase(tests/pyre.pkg/calc/hierarchical_find.py)
 pyre_test_python_testcase(tests/pyre.pkg/calc/model.py)
 
 
@@ -355,6 +359,7 @@ pyre_test_python_testcase(tests/pyre.pkg/records/complex_immutable_data.py)
 pyre_test_python_testcase(tests/pyre.pkg/records/complex_immutable_kwds.py)
 pyre_test_python_testcase(tests/pyre.pkg/records/complex_immutable_conversions.py)
 pyre_test_python_testcase(tests/pyre.pkg/records/complex_immutable_validations.py)
+pyre_test_python_testcase(tests/pyre.pkg/records/complex_immutable_specialized.py)
 pyre_test_python_testcase(tests/pyre.pkg/records/complex_mutable_data.py)
 pyre_test_python_testcase(tests/pyre.pkg/records/complex_mutable_kwds.py)
 pyre_test_python_testcase(tests/pyre.pkg/records/complex_mutable_conversions.py)
@@ -382,7 +387,9 @@ pyre_test_python_testcase(tests/pyre.pkg/tabular/sheet_populate.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/sheet_columns.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/sheet_index.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/sheet_updates.py)
+pyre_test_python_testcase(tests/pyre.pkg/tabular/sheet_columnar.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/view.py)
+pyre_test_python_testcase(tests/pyre.pkg/tabular/bitmap.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/chart.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/chart_class_layout.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/chart_class_inheritance.py)
@@ -392,9 +399,12 @@ pyre_test_python_testcase(tests/pyre.pkg/tabular/chart_interval_config.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/chart_interval.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/chart_filter.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/chart_sales.py)
+pyre_test_python_testcase(tests/pyre.pkg/tabular/chart_incremental.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/pivot.py)
+pyre_test_python_testcase(tests/pyre.pkg/tabular/pivot_reductions.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/csv_instance.py)
 pyre_test_python_testcase(tests/pyre.pkg/tabular/csv_read.py)
+pyre_test_python_testcase(tests/pyre.pkg/tabular/csv_chunked.py)
 
 
 #
@@ -467,6 +477,8 @@ pyre_test_python_testcase(tests/pyre.pkg/config/configurator_assignments.py)
 pyre_test_python_testcase(tests/pyre.pkg/config/configurator_load_pml.py)
 pyre_test_python_testcase(tests/pyre.pkg/config/configurator_load_cfg.py)
 pyre_test_python_testcase(tests/pyre.pkg/config/configurator_load_pfg.py)
+pyre_test_python_testcase(tests/pyre.pkg/config/configurator_deferred.py)
+pyre_test_python_testcase(tests/pyre.pkg/config/configurator_cache.py)
 pyre_test_python_testcase(tests/pyre.pkg/config/command.py)
 pyre_test_python_testcase(tests/pyre.pkg/config/command_argv.py)
 pyre_test_python_testcase(tests/pyre.pkg/config/command_config.py)
@@ -491,6 +503,7 @@ pyre_test_python_testcase(tests/pyre.pkg/framework/registrar.py)
 pyre_test_python_testcase(tests/pyre.pkg/framework/linker.py)
 pyre_test_python_testcase(tests/pyre.pkg/framework/linker_codecs.py)
 pyre_test_python_testcase(tests/pyre.pkg/framework/linker_shelves.py)
+pyre_test_python_testcase(tests/pyre.pkg/framework/linker_catalog.py)
 pyre_test_python_testcase(tests/pyre.pkg/framework/externals.py)
 pyre_test_python_testcase(tests/pyre.pkg/framework/executive.py)
 pyre_test_python_testcase(tests/pyre.pkg/framework/executive_configuration.py)
@@ -620,6 +633,7 @@ pyre_test_python_testcase(tests/pyre.pkg/db/table_delete.py)
 pyre_test_python_testcase(tests/pyre.pkg/db/table_instantiation.py)
 pyre_test_python_testcase(tests/pyre.pkg/db/table_insert.py)
 pyre_test_python_testcase(tests/pyre.pkg/db/table_update.py)
+pyre_test_python_testcase(tests/pyre.pkg/db/table_templates.py)
 pyre_test_python_testcase(tests/pyre.pkg/db/query_star.py)
 pyre_test_python_testcase(tests/pyre.pkg/db/query_projection.py)
 pyre_test_python_testcase(tests/pyre.pkg/db/query_projection_expressions.py)
@@ -641,15 +655,21 @@ pyre_test_python_testcase(tests/pyre.pkg/ipc/pipe.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/tcp.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/pickler_over_pipe.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/pickler_over_tcp.py)
+pyre_test_python_testcase(tests/pyre.pkg/ipc/pickler_buffers.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/scheduler.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/scheduler_instantiation.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/scheduler_alarms.py)
+pyre_test_python_testcase(tests/pyre.pkg/ipc/scheduler_cancel.py)
+pyre_test_python_testcase(tests/pyre.pkg/ipc/scheduler_throughput.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/selector.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/selector_instantiation.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/selector_alarms.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/selector_signals.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/selector_pickler_over_pipe.py)
 pyre_test_python_testcase(tests/pyre.pkg/ipc/selector_pickler_over_tcp.py)
+pyre_test_python_testcase(tests/pyre.pkg/ipc/poller_pickler_over_pipe.py)
+pyre_test_python_testcase(tests/pyre.pkg/ipc/poller_exceptions.py)
+pyre_test_python_testcase(tests/pyre.pkg/ipc/poller_throughput.py)
 
 
 #
@@ -661,6 +681,13 @@ pyre_test_python_testcase(tests/pyre.pkg/nexus/node_instantiation.py)
 pyre_test_python_testcase(tests/pyre.pkg/nexus/node_signals.py)
 pyre_test_python_testcase(tests/pyre.pkg/nexus/pool.py)
 pyre_test_python_testcase(tests/pyre.pkg/nexus/pool.py --tasks=4 --team.size=2)
+pyre_test_python_testcase(tests/pyre.pkg/nexus/pool.py --tasks=8 --team.size=2 --team.batch=3 --team.prefetch=2)
+pyre_test_python_testcase(tests/pyre.pkg/nexus/pool_throughput.py)
+pyre_test_python_testcase(tests/pyre.pkg/nexus/pool.py --tasks=8 --team.size=2 --team.prefetch=3 --team.workplan=priority)
+pyre_test_python_testcase(tests/pyre.pkg/nexus/pool_rebalancing.py)
+pyre_test_python_testcase(tests/pyre.pkg/nexus/pool.py --tasks=8 --team.size=2 --team.recruiter=standby --team.recruiter.recycle=2)
+pyre_test_python_testcase(tests/pyre.pkg/nexus/pool_standby.py)
+pyre_test_python_testcase(tests/pyre.pkg/nexus/pool_remote.py)
 
 
 #
@@ -12,6 +12,11 @@ pyre_test_python_testcase(tests/sqlite.pkg/sqlite_database.py)
 pyre_test_python_testcase(tests/sqlite.pkg/sqlite_attach.py)
 pyre_test_python_testcase(tests/sqlite.pkg/sqlite_table.py)
 pyre_test_python_testcase(tests/sqlite.pkg/sqlite_references.py)
+pyre_test_python_testcase(tests/sqlite.pkg/sqlite_prepared.py)
+pyre_test_python_testcase(tests/sqlite.pkg/sqlite_load.py)
+pyre_test_python_testcase(tests/sqlite.pkg/sqlite_stream.py)
+pyre_test_python_testcase(tests/sqlite.pkg/sqlite_pool.py)
+pyre_test_python_testcase(tests/sqlite.pkg/sqlite_cache.py)
 # cleanup
 add_test(NAME tests.sqlite.clean
   WORKING_DIRECTORY "${PYRE_TESTSUITE_DIR}/sqlite.pkg"
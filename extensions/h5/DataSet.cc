@@ -9,6 +9,32 @@
 // namespace setup
 #include "forward.h"
 
+
+// helpers
+namespace pyre::h5::py {
+    // fill {data} with the tile @{origin}+{shape}; the interpreter lock is released while
+    // reading so other threads can run, but only when the hdf5 library is thread safe, since
+    // those threads may call into it while the read is in progress
+    template <class heapT>
+    auto readTile(
+        const DataSet & self, heapT & data, const DataType & memtype, const shape_t & origin,
+        const shape_t & shape) -> void
+    {
+        // ask the library whether it serializes access on its own
+        hbool_t threadsafe = false;
+        H5is_library_threadsafe(&threadsafe);
+        // if it doesn't
+        if (!threadsafe) {
+            // read while holding on to the interpreter lock
+            return read(self, data, memtype, origin, shape);
+        }
+        // otherwise, release it
+        py::gil_scoped_release release;
+        // and read
+        return read(self, data, memtype, origin, shape);
+    }
+} // namespace pyre::h5::py
+
 // datasets
 void
 pyre::h5::py::dataset(py::module & m)
@@ -171,6 +197,31 @@ pyre::h5::py::dataset(py::module & m)
         // the docstring
         "get my dataspace");
 
+    // the chunk layout
+    cls.def_property_readonly(
+        // the name
+        "chunks",
+        // the implementation
+        [](const DataSet & self) -> shape_t {
+            // get my creation property list
+            auto plist = self.getCreatePlist();
+            // if i'm not chunked
+            if (plist.getLayout() != H5D_CHUNKED) {
+                // there is no chunk shape
+                return shape_t();
+            }
+            // get my rank
+            auto rank = self.getSpace().getSimpleExtentNdims();
+            // make a correctly sized vector to hold the result
+            shape_t chunks(rank);
+            // populate it
+            plist.getChunk(rank, &chunks[0]);
+            // and return it
+            return chunks;
+        },
+        // the docstring
+        "get the shape of my chunks; empty if my storage is not chunked");
+
 
     // attempt to get the dataset contents as an int
     cls.def(
@@ -517,7 +568,7 @@ pyre::h5::py::dataset(py::module & m)
         // the name
         "read",
         // the implementation
-        &read<heap_int8_t>,
+        &readTile<heap_int8_t>,
         // the signature
         "data"_a, "memtype"_a, "origin"_a, "shape"_a,
         // the docstring
@@ -527,7 +578,7 @@ pyre::h5::py::dataset(py::module & m)
         // the name
         "read",
         // the implementation
-        &read<heap_int16_t>,
+        &readTile<heap_int16_t>,
         // the signature
         "data"_a, "memtype"_a, "origin"_a, "shape"_a,
         // the docstring
@@ -537,7 +588,7 @@ pyre::h5::py::dataset(py::module & m)
         // the name
         "read",
         // the implementation
-        &read<heap_int32_t>,
+        &readTile<heap_int32_t>,
         // the signature
         "data"_a, "memtype"_a, "origin"_a, "shape"_a,
         // the docstring
@@ -547,7 +598,7 @@ pyre::h5::py::dataset(py::module & m)
         // the name
         "read",
         // the implementation
-        &read<heap_int64_t>,
+        &readTile<heap_int64_t>,
         // the signature
         "data"_a, "memtype"_a, "origin"_a, "shape"_a,
         // the docstring
@@ -557,7 +608,7 @@ pyre::h5::py::dataset(py::module & m)
         // the name
         "read",
         // the implementation
-        &read<heap_float_t>,
+        &readTile<heap_float_t>,
         // the signature
         "data"_a, "memtype"_a, "origin"_a, "shape"_a,
         // the docstring
@@ -567,7 +618,7 @@ pyre::h5::py::dataset(py::module & m)
         // the name
         "read",
         // the implementation
-        &read<heap_double_t>,
+        &readTile<heap_double_t>,
         // the signature
         "data"_a, "memtype"_a, "origin"_a, "shape"_a,
         // the docstring
@@ -577,7 +628,7 @@ pyre::h5::py::dataset(py::module & m)
         // the name
         "read",
         // the implementation
-        &read<heap_complexfloat_t>,
+        &readTile<heap_complexfloat_t>,
         // the signature
         "data"_a, "memtype"_a, "origin"_a, "shape"_a,
         // the docstring
@@ -587,7 +638,7 @@ pyre::h5::py::dataset(py::module & m)
         // the name
         "read",
         // the implementation
-        &read<heap_complexdouble_t>,
+        &readTile<heap_complexdouble_t>,
         // the signature
         "data"_a, "memtype"_a, "origin"_a, "shape"_a,
         // the docstring
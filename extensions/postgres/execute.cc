@@ -7,12 +7,17 @@
 
 #include <portinfo>
 
+// the bulk loader extracts sized buffers
+#define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <libpq-fe.h>
 #include <pyre/journal.h>
+#include <string>
+#include <vector>
 
 #include "execute.h"
 #include "constants.h"
+#include "exceptions.h"
 #include "interlayer.h"
 
 
@@ -67,6 +72,251 @@ execute(PyObject *, PyObject * args) {
 }
 
 
+// prepare a parameterized statement
+const char * const
+pyre::extensions::postgres::
+prepare__name__ = "prepare";
+
+const char * const
+pyre::extensions::postgres::
+prepare__doc__ = "prepare a parameterized statement for repeated execution";
+
+PyObject *
+pyre::extensions::postgres::
+prepare(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * name;
+    const char * command;
+    PyObject * py_connection;
+    // extract the arguments
+    if (!PyArg_ParseTuple(
+            args, "O!ss:prepare", &PyCapsule_Type, &py_connection, &name, &command)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "preparing '" << name << "' as '" << command << "'"
+        << pyre::journal::endl;
+
+    // prepare the statement; let the server infer the parameter types
+    PGresult * result = PQprepare(connection, name, command, 0, 0);
+    // error check
+    // null result indicates we have run out of memory
+    if (!result) {
+        // convert the error to human readable form
+        const char * description = PQerrorMessage(connection);
+        // and return an error indicator
+        return raiseOperationalError(description);
+    }
+
+    // delegate
+    return processResult(command, result, buildResultTuple);
+}
+
+
+// execute a prepared statement
+const char * const
+pyre::extensions::postgres::
+executePrepared__name__ = "executePrepared";
+
+const char * const
+pyre::extensions::postgres::
+executePrepared__doc__ = "execute a prepared statement with the given parameters";
+
+PyObject *
+pyre::extensions::postgres::
+executePrepared(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * name;
+    PyObject * py_connection;
+    PyObject * parameters;
+    // extract the arguments
+    if (!PyArg_ParseTuple(
+            args, "O!sO!:executePrepared",
+            &PyCapsule_Type, &py_connection, &name, &PyTuple_Type, &parameters)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // get the number of parameters
+    Py_ssize_t count = PyTuple_Size(parameters);
+    // the parameters are sent to the server in text form; make room for their representations
+    std::vector<std::string> values(count);
+    // and for the pointers that {libpq} expects; null pointers stand for {NULL}
+    std::vector<const char *> pointers(count, nullptr);
+    // go through the parameters
+    for (Py_ssize_t index = 0; index < count; ++index) {
+        // get the parameter
+        PyObject * parameter = PyTuple_GET_ITEM(parameters, index);
+        // if it is {None} or the registered {NULL}
+        if (parameter == Py_None || parameter == null) {
+            // leave its pointer null
+            continue;
+        }
+        // otherwise, convert it to a string
+        PyObject * text = PyObject_Str(parameter);
+        // if that failed
+        if (!text) {
+            // bail
+            return 0;
+        }
+        // extract its contents
+        const char * contents = PyUnicode_AsUTF8(text);
+        // if that failed
+        if (!contents) {
+            // clean up
+            Py_DECREF(text);
+            // and bail
+            return 0;
+        }
+        // save a copy
+        values[index] = contents;
+        // clean up
+        Py_DECREF(text);
+        // and point to the copy
+        pointers[index] = values[index].c_str();
+    }
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "executing '" << name << "' with " << count << " parameters"
+        << pyre::journal::endl;
+
+    // execute the statement; all parameters are in text format, and so are the results
+    PGresult * result = PQexecPrepared(
+        connection, name, static_cast<int>(count), pointers.data(), 0, 0, 0);
+    // error check
+    // null result indicates we have run out of memory
+    if (!result) {
+        // convert the error to human readable form
+        const char * description = PQerrorMessage(connection);
+        // and return an error indicator
+        return raiseOperationalError(description);
+    }
+
+    // delegate
+    return processResult(name, result, buildResultTuple);
+}
+
+
+// bulk load data
+const char * const
+pyre::extensions::postgres::
+copy__name__ = "copy";
+
+const char * const
+pyre::extensions::postgres::
+copy__doc__ = "execute a 'COPY ... FROM STDIN' command and stream the given data to the server";
+
+PyObject *
+pyre::extensions::postgres::
+copy(PyObject *, PyObject * args) {
+    // the connection specification
+    const char * command;
+    const char * data;
+    Py_ssize_t size;
+    PyObject * py_connection;
+    // extract the arguments
+    if (!PyArg_ParseTuple(
+            args, "O!ss#:copy", &PyCapsule_Type, &py_connection, &command, &data, &size)) {
+        return 0;
+    }
+    // check that we were handed the correct kind of capsule
+    if (!PyCapsule_IsValid(py_connection, connectionCapsuleName)) {
+        PyErr_SetString(PyExc_TypeError, "the first argument must be a valid database connection");
+        return 0;
+    }
+    // get the connection object
+    PGconn * connection =
+        static_cast<PGconn *>(PyCapsule_GetPointer(py_connection, connectionCapsuleName));
+
+    // in case someone is listening...
+    pyre::journal::debug_t debug("postgres.execution");
+    debug
+        << pyre::journal::at(__HERE__)
+        << "copying " << size << " bytes with '" << command << "'"
+        << pyre::journal::endl;
+
+    // initiate the transfer
+    PGresult * result = PQexec(connection, command);
+    // null result indicates we have run out of memory
+    if (!result) {
+        // convert the error to human readable form
+        const char * description = PQerrorMessage(connection);
+        // and return an error indicator
+        return raiseOperationalError(description);
+    }
+    // if the server is not ready to receive the data
+    if (PQresultStatus(result) != PGRES_COPY_IN) {
+        // let the result processor report the problem
+        return processResult(command, result, buildResultTuple);
+    }
+    // otherwise, we are done with this result
+    PQclear(result);
+
+    // send the data and mark the end of the transfer; both block until the data is queued
+    if (PQputCopyData(connection, data, static_cast<int>(size)) != 1
+        || PQputCopyEnd(connection, 0) != 1) {
+        // convert the error to human readable form
+        const char * description = PQerrorMessage(connection);
+        // and return an error indicator
+        return raiseOperationalError(description);
+    }
+
+    // collect the outcome of the command
+    PyObject * value = 0;
+    // go through the results
+    while ((result = PQgetResult(connection)) != 0) {
+        // if we have already processed one
+        if (value) {
+            // discard it
+            Py_DECREF(value);
+        }
+        // process this one
+        value = processResult(command, result, buildResultTuple);
+        // if it signaled an error
+        if (!value) {
+            // drain the rest of the results
+            while ((result = PQgetResult(connection)) != 0) {
+                // by discarding them
+                PQclear(result);
+            }
+            // and bail
+            return 0;
+        }
+    }
+
+    // if there were no results
+    if (!value) {
+        // return {None}
+        Py_INCREF(Py_None);
+        value = Py_None;
+    }
+    // all done
+    return value;
+}
+
+
 // submit a query for asynchronous execution
 const char * const
 pyre::extensions::postgres::
@@ -17,6 +17,21 @@ namespace pyre {
             extern const char * const execute__doc__;
             PyObject * execute(PyObject *, PyObject *);
 
+            // prepare a parameterized statement
+            extern const char * const prepare__name__;
+            extern const char * const prepare__doc__;
+            PyObject * prepare(PyObject *, PyObject *);
+
+            // execute a prepared statement
+            extern const char * const executePrepared__name__;
+            extern const char * const executePrepared__doc__;
+            PyObject * executePrepared(PyObject *, PyObject *);
+
+            // bulk load data
+            extern const char * const copy__name__;
+            extern const char * const copy__doc__;
+            PyObject * copy(PyObject *, PyObject *);
+
             // submit a query for asynchronous processing
             extern const char * const submit__name__;
             extern const char * const submit__doc__;
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import collections
+
+
+# class declaration
+class Compiler:
+    """
+    A cache of compiled formulas
+
+    Configurations tend to use the same formula text in many places, so {Expression} and
+    {Interpolation} nodes share the result of scanning and compiling their formulas through
+    this cache, which is keyed by the formula text. The cached entries are independent of any
+    particular model: they hold the processed program and the names of the nodes it refers
+    to, so that building a new node requires nothing more than resolving these names. The
+    least recently used entries are evicted when the cache exceeds its capacity
+    """
+
+
+    # public data
+    capacity = 4096 # the maximum number of cached entries
+    hits = 0 # the number of lookups that found their entry in the cache
+    misses = 0 # the number of lookups that had to compile their formula
+
+    @property
+    def size(self):
+        """
+        The number of entries in the cache
+        """
+        # easy enough
+        return len(self._cache)
+
+
+    # interface
+    def lookup(self, category, formula, translator):
+        """
+        Retrieve the compiled form of the {category} {formula}; on a miss, invoke {translator}
+        to build it
+        """
+        # form the key
+        key = (category, formula)
+        # grab the cache
+        cache = self._cache
+        # attempt to
+        try:
+            # look up the entry
+            entry = cache[key]
+        # if it's not there
+        except KeyError:
+            # update the counter
+            self.misses += 1
+            # build the entry; let any exceptions propagate to the caller, without caching
+            # anything
+            entry = translator(formula)
+            # store the new entry
+            cache[key] = entry
+            # if the cache is over capacity
+            if len(cache) > self.capacity:
+                # evict the least recently used entry
+                cache.popitem(last=False)
+        # if it's there
+        else:
+            # update the counter
+            self.hits += 1
+            # and mark the entry as the most recently used one
+            cache.move_to_end(key)
+        # all done
+        return entry
+
+
+    def clear(self):
+        """
+        Empty the cache and reset the statistics
+        """
+        # empty the cache
+        self._cache.clear()
+        # and reset the counters
+        self.hits = 0
+        self.misses = 0
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, capacity=capacity, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # record my capacity
+        self.capacity = capacity
+        # initialize the cache
+        self._cache = collections.OrderedDict()
+        # all done
+        return
+
+
+# the instance shared by all formula nodes
+compiler = Compiler()
+
+
+# end of file
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import time
+
+
+# class declaration
+class Engine:
+    """
+    The evaluator of memoized nodes
+
+    Computing the value of a node whose cache is invalid used to recurse through the values of
+    its operands, so deep chains of references could exhaust the python stack. {Engine} walks
+    the dirty portion of the dependency graph of the node with an explicit stack instead, and
+    refreshes the caches of its dependencies in dependency order, so that by the time the node
+    itself gets evaluated all its operands are up to date.
+
+    The engine keeps track of the number of node evaluations and the time spent performing
+    them, so clients can assess the cost of cold starts
+    """
+
+
+    # exceptions
+    from .exceptions import CircularReferenceError
+
+
+    # public data
+    evaluations = 0 # the number of nodes whose values were recomputed
+    elapsed = 0 # the time spent recomputing node values, in seconds
+
+
+    # interface
+    def evaluate(self, node, evaluator, **kwds):
+        """
+        Bring the dependencies of {node} up to date, and invoke {evaluator} to compute its value
+        """
+        # if this is the outermost evaluation
+        if self._depth == 0:
+            # start the clock
+            start = time.perf_counter()
+        # either way, mark
+        self._depth += 1
+        # carefully
+        try:
+            # refresh my dependencies
+            self.prime(node=node)
+            # compute the value
+            value = evaluator(**kwds)
+        # no matter what happens
+        finally:
+            # unmark
+            self._depth -= 1
+            # update the evaluation count
+            self.evaluations += 1
+            # and if this was the outermost evaluation
+            if self._depth == 0:
+                # stop the clock
+                self.elapsed += time.perf_counter() - start
+        # all done
+        return value
+
+
+    def prime(self, node):
+        """
+        Refresh the caches of the dirty nodes in the dependency graph of {node}, without
+        recursing
+        """
+        # if none of the operands of {node} need refreshing
+        if not any(getattr(operand, "dirty", False) for operand in node.operands):
+            # nothing to do
+            return self
+
+        # the nodes in the current path from {node}, for cycle detection
+        path = {node}
+        # initialize the traversal stack; it holds nodes along with the operands left to visit
+        stack = [ (node, iter(node.operands)) ]
+        # as long as there are nodes to visit
+        while stack:
+            # get the node on the top of the stack
+            current, operands = stack[-1]
+            # go through its remaining operands
+            for operand in operands:
+                # if its cache is up to date
+                if not getattr(operand, "dirty", False):
+                    # move on
+                    continue
+                # if it is already on the current path
+                if operand in path:
+                    # we have a cycle; build the offending path
+                    cycle = tuple(entry for entry, _ in stack)
+                    # and complain
+                    raise self.CircularReferenceError(node=operand, path=cycle)
+                # otherwise, mark it
+                path.add(operand)
+                # and push it to the stack
+                stack.append((operand, iter(operand.operands)))
+                # so we can visit it next
+                break
+            # if all operands of {current} have been visited
+            else:
+                # we are done with it
+                stack.pop()
+                path.discard(current)
+                # {node} itself is evaluated by the caller; the others may have been refreshed
+                # already through some other path
+                if current is node or not current.dirty:
+                    # either way, move on
+                    continue
+                # all its operands are up to date, so this doesn't recurse
+                try:
+                    # refresh its cache
+                    current.getValue()
+                # if anything goes wrong
+                except Exception:
+                    # leave the rest to the regular evaluation of {node}, so that the error gets
+                    # reported with its usual context
+                    return self
+
+        # all done
+        return self
+
+
+    def reset(self):
+        """
+        Clear my counters
+        """
+        # reset
+        self.evaluations = 0
+        self.elapsed = 0
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the nesting level of the evaluation in progress
+        self._depth = 0
+        # all done
+        return
+
+
+# end of file
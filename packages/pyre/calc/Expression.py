@@ -10,6 +10,8 @@
 import re
 # so I can hold on to my model without making cycles
 import weakref
+# the cache of compiled formulas
+from .Compiler import compiler
 
 
 # class declaration
@@ -108,8 +110,27 @@ class Expression:
         Compile {expression} and build an evaluator that resolves named references to other
         nodes against {model}.
         """
-        # initialize the symbol table
-        operands = []
+        # get the compiled form of {expression}; the expensive part is shared among all the
+        # expressions with the same formula
+        normalized, program, identifiers = cls._compiler.lookup(
+            category="expression", formula=expression, translator=cls.translate)
+        # if there were no symbols, the expression had no node evaluations; but since it may
+        # have had escaped braces, make sure the caller has access to the processed value
+        if program is None: raise cls.EmptyExpressionError(formula=normalized)
+        # resolve the node references against {model}
+        operands = [ model.retrieve(name=identifier) for identifier in identifiers ]
+        # all is well
+        return program, operands
+
+
+    @classmethod
+    def translate(cls, expression):
+        """
+        Convert {expression} into a python program by replacing node references with lookups
+        in the model, and collect the names of the referenced nodes
+        """
+        # initialize the pile of node names
+        identifiers = []
         # define the {re.sub} callback as a local function so it has access to the symbol table
         def handler(match):
             """
@@ -129,10 +150,8 @@ class Expression:
             # only one case left: a valid node reference
             # extract the name from the match
             identifier = match.group('identifier')
-            # resolve it
-            node = model.retrieve(name=identifier)
-            # add the node to the operands
-            operands.append(node)
+            # add it to the pile
+            identifiers.append(identifier)
             # build and return the matching expression fragment
             return "(model[{!r}])".format(identifier)
 
@@ -140,10 +159,9 @@ class Expression:
         # print("Expression.parse: expression={!r}".format(expression))
         normalized = cls._scanner.sub(handler, expression)
         # print("  normalized: {!r}".format(normalized))
-        # print("  operands:", operands)
-        # if there were no symbols, the expression had no node evaluations; but since it may
-        # have had escaped braces, make sure the caller has access to the processed value
-        if not operands: raise cls.EmptyExpressionError(formula=normalized)
+        # print("  identifiers:", identifiers)
+        # if there were no symbols, there is nothing to compile
+        if not identifiers: return normalized, None, ()
         # now, attempt to compile the expression
         try:
             # by asking python to build a code object
@@ -153,7 +171,7 @@ class Expression:
             # complain
             raise cls.ExpressionSyntaxError(formula=expression, error=error) from error
         # all is well
-        return program, operands
+        return normalized, program, tuple(identifiers)
 
 
     @classmethod
@@ -168,6 +186,7 @@ class Expression:
 
 
     # private data
+    _compiler = compiler # the cache of compiled formulas
     _model = None # my symbol table
     _program = None # the compiled form of my expression
     _scanner = re.compile( # the expression tokenizer
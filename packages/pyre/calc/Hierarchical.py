@@ -8,7 +8,6 @@
 
 # externals
 import re
-import operator
 import collections.abc
 from .. import primitives
 # my base class
@@ -82,10 +81,16 @@ class Hierarchical(SymbolTable):
         if not self._nodes: return
         # build the name recognizer
         regex = re.compile(pattern)
-        # we need a sort key, since slots do not have a natural ordering
-        key = operator.attrgetter('name') if key is None else key
-        # iterate over my nodes
-        for info in sorted(self._metadata.values(), key=key):
+        # the names that match {pattern} must start with its literal prefix, so there is no need
+        # to look outside the portion of my name hash that is spanned by it; this also produces
+        # the candidates sorted by name, level by level
+        candidates = self.span(prefix=self._literalPrefix(pattern))
+        # if the caller asked for some other order
+        if key is not None:
+            # sort the candidates
+            candidates = sorted(candidates, key=key)
+        # iterate over the candidates
+        for info in candidates:
             # if the name matches
             if regex.match(info.name):
                 # yield the name and the node
@@ -94,6 +99,67 @@ class Hierarchical(SymbolTable):
         return
 
 
+    def span(self, prefix=''):
+        """
+        Generate the metadata of all nodes whose names start with {prefix}, sorted by name one
+        level at a time
+
+        The work done is proportional to the size of the portion of the name hash that is
+        spanned by {prefix}, rather than the total number of nodes in the model
+        """
+        # split the prefix; the last fragment may be a partial level name
+        *levels, fragment = self.split(prefix)
+        # starting at the root of my name hash
+        key = self._hash
+        # go through the complete levels
+        for level in levels:
+            # carefully, so we don't disturb the hash
+            try:
+                # look up the key of the next level
+                key = key.nodes[level]
+            # if it's not there
+            except KeyError:
+                # there is nothing to find
+                return
+        # the name of the base of the search
+        base = self.join(*levels)
+        # grab my metadata
+        metadata = self._metadata
+        # initialize the traversal stack; it holds the keys on the current path, along with
+        # their names and the children left to visit
+        stack = [ (key, base, key.children(prefix=fragment)) ]
+        # as long as there are keys to visit
+        while stack:
+            # get the key on the top of the stack
+            _, parent, children = stack[-1]
+            # get the next child
+            for name, child in children:
+                # build its full name
+                name = self.join(parent, name)
+                # if it is already on the current path, we followed an alias that points to one
+                # of its ancestors
+                if any(child is entry for entry, _, _ in stack):
+                    # skip it
+                    continue
+                # look up its metadata
+                info = metadata.get(child)
+                # if there is a node registered under this key and we reached it through its
+                # canonical name, rather than through an alias
+                if info is not None and info.name == name:
+                    # hand it to the caller
+                    yield info
+                # either way, visit its children next
+                stack.append((child, name, child.children()))
+                # and move on
+                break
+            # if all children of {parent} have been visited
+            else:
+                # we are done with it
+                stack.pop()
+        # all done
+        return
+
+
     # storing and retrieving nodes
     def alias(self, target, alias, base=None):
         """
@@ -285,9 +351,54 @@ class Hierarchical(SymbolTable):
 
 
     # implementation details
+    @classmethod
+    def _literalPrefix(cls, pattern):
+        """
+        Extract the longest string that all names matching the regular expression {pattern}
+        must start with
+        """
+        # if the pattern has alternatives, there is no common prefix we can rely on
+        if '|' in pattern: return ''
+        # initialize the pile of literal characters
+        prefix = []
+        # and the cursor
+        pos = 0
+        # go through the pattern
+        while pos < len(pattern):
+            # get the current character
+            char = pattern[pos]
+            # if it is an escape
+            if char == '\\':
+                # get the escaped character
+                char = pattern[pos+1:pos+2]
+                # escaped letters and digits are character classes or references, not literals
+                if not char or char.isalnum(): break
+                # the rest stand for themselves
+                step = 2
+            # if it is a special character
+            elif char in cls._specials:
+                # the literal part is over
+                break
+            # anything else
+            else:
+                # is a literal
+                step = 1
+            # if the character is followed by a quantifier, it may not actually be there
+            if pattern[pos+step:pos+step+1] in cls._quantifiers: break
+            # otherwise, add it to the pile
+            prefix.append(char)
+            # and move on
+            pos += step
+        # assemble the prefix and return it
+        return ''.join(prefix)
+
+
     # private data
     _hash = None
     _info = None
+    # regular expression syntax that affects the computation of literal prefixes
+    _specials = frozenset(".^$*+?{}[]()")
+    _quantifiers = frozenset("*+?{")
 
 
     # aliasing
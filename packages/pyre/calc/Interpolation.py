@@ -11,6 +11,8 @@ import re # for the formula compiler
 import weakref # to keep a reference to my model
 import operator # for the computation of my value
 import functools # for the computation of my value
+# the cache of compiled formulas
+from .Compiler import compiler
 
 
 # my declaration
@@ -101,10 +103,46 @@ class Interpolation:
             # complain
             raise cls.EmptyExpressionError(formula=expression)
 
+        # get the compiled form of {expression}; the expensive part is shared among all the
+        # interpolations with the same formula
+        fragments = cls._compiler.lookup(
+            category="interpolation", formula=expression, translator=cls.translate)
+
+        # if there were no references, the expression had no node evaluations; but since it may
+        # have had escaped braces, make sure the caller has access to the processed value
+        if isinstance(fragments, str):
+            # complain
+            raise cls.EmptyExpressionError(formula=fragments)
+
+        # build my operands
+        operands = [
+            # use the identifiers to locate the associated nodes, and turn the literal fragments
+            # into variables
+            model.retrieve(text) if identifier else model.literal(value=text)
+            # for each fragment
+            for identifier, text in fragments
+            ]
+
+        # summarize
+        # print(" ** SymbolTable.interpolation:")
+        # print("    expression:", expression)
+        # print("    operands:", operands)
+
+        # all done
+        return operands
+
+
+    @classmethod
+    def translate(cls, expression):
+        """
+        Split {expression} into a sequence of (identifier, text) pairs, where {text} is either
+        the name of a referenced node or a literal fragment, as indicated by the {identifier}
+        flag; if {expression} has no references, return its processed text instead
+        """
         # initialize the offset into the expression
         pos = 0
-        # storage for my operands
-        operands = []
+        # storage for the fragments
+        fragments = []
         # initial portion of the expression
         fragment = ''
         # iterate over all the matches
@@ -130,36 +168,26 @@ class Interpolation:
             else:
                 # it must be an identifier
                 identifier = match.group('identifier')
-                # if the current fragment is not empty, turn it into a variable node
-                if fragment: operands.append(model.literal(value=fragment))
+                # if the current fragment is not empty, save it
+                if fragment: fragments.append((False, fragment))
                 # reset the fragment
                 fragment = ''
-                # use the identifier to locate the associated node
-                reference = model.retrieve(identifier)
-                # add it to my operands
-                operands.append(reference)
+                # add the identifier to the pile
+                fragments.append((True, identifier))
             # update the location in {expression}
             pos = end
 
         # store the trailing part of the expression
         fragment += expression[pos:]
 
-        # if there were no matches, the expression had no node evaluations; but since it may
-        # have had escaped braces, make sure the caller has access to the processed value
-        if not operands:
-            # complain
-            raise cls.EmptyExpressionError(formula=fragment)
-
-        # and if it's not empty, turn it into a variable
-        if fragment: operands.append(model.literal(value=fragment))
+        # if there were no matches, return the processed text
+        if not fragments: return fragment
 
-        # summarize
-        # print(" ** SymbolTable.interpolation:")
-        # print("    expression:", expression)
-        # print("    operands:", operands)
+        # if the trailing fragment is not empty, save it
+        if fragment: fragments.append((False, fragment))
 
         # all done
-        return operands
+        return tuple(fragments)
 
 
     @classmethod
@@ -176,6 +204,7 @@ class Interpolation:
 
 
     # private data
+    _compiler = compiler # the cache of compiled formulas
     _scanner = re.compile( # the expression tokenizer
         r"(?P<esc_open>{{)"
         r"|"
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# class declaration
+class Invalidator:
+    """
+    A context manager that batches the delivery of value change notifications
+
+    While a block guarded by an {Invalidator} is active, observables that post notifications
+    do not walk their observers recursively; instead, they are recorded here. When the
+    outermost block exits, the notifications are delivered in a single pass over the affected
+    portion of the observer graph, in topological order, without any recursion. Observers whose
+    references have expired are purged from their observables only once, at the end of the
+    pass.
+
+    Reading the value of a memoized node while notifications are pending triggers their
+    delivery first, so clients never see stale values even if they interleave reads with the
+    writes in the block
+    """
+
+
+    # public data
+    active = None # the invalidator currently collecting notifications, if any
+
+    @property
+    def pending(self):
+        """
+        Check whether there are notifications that have not been delivered yet
+        """
+        # easy enough
+        return len(self._fired) > 0
+
+
+    # interface
+    def defer(self, observable):
+        """
+        Record that {observable} has posted a notification to its observers
+        """
+        # if this is the first time we hear from {observable} since its last delivery
+        if observable not in self._fired:
+            # mark it
+            self._fired.add(observable)
+            # and add it to the pile of nodes that seed the next pass
+            self._roots.append(observable)
+        # all done
+        return self
+
+
+    def propagate(self):
+        """
+        Deliver all pending notifications
+        """
+        # if there is a delivery in progress, or nothing to deliver
+        if self._propagating or not self._fired:
+            # nothing to do
+            return self
+        # mark
+        self._propagating = True
+        # the nodes whose observer piles need compacting
+        stale = []
+        # carefully
+        try:
+            # observers may post new notifications to nodes outside the span of the current
+            # pile of roots; keep going until everybody is settled
+            while self._roots:
+                # grab the current roots
+                roots = [ node for node in self._roots if node in self._fired ]
+                # and reset the pile
+                self._roots = []
+                # order the affected graph and go through it
+                for node, observers in self.order(roots=roots):
+                    # if {node} has not posted a notification
+                    if node not in self._fired:
+                        # it is still clean, so it does not affect its observers
+                        continue
+                    # we are about to deliver its notification
+                    self._fired.discard(node)
+                    # if some of its observers have expired
+                    if len(observers) < len(node._observers):
+                        # mark it for compaction
+                        stale.append(node)
+                    # go through its live observers
+                    for observer in observers:
+                        # and notify each one
+                        observer.flush(observable=node)
+        # no matter what happens
+        finally:
+            # purge the dead references from the piles that need it
+            for node in stale:
+                node._observers = {ref for ref in node._observers if ref() is not None}
+            # and mark the end of the pass
+            self._propagating = False
+        # all done
+        return self
+
+
+    def order(self, roots):
+        """
+        Build a topologically sorted sequence of (node, observers) pairs that covers the portion
+        of the observer graph reachable from {roots}
+        """
+        # get the observable base class
+        from .Observable import Observable
+        # the nodes we have visited, and the reverse post-order of the traversal
+        visited = set()
+        postorder = []
+        # the live observers of each node we visit
+        observers = {}
+        # go through the roots
+        for root in roots:
+            # skip the ones that are in the span of another root
+            if root in visited: continue
+            # mark this one
+            visited.add(root)
+            # get its observers
+            observers[root] = live = tuple(root.observers)
+            # initialize the traversal stack; it holds nodes with the observers that are left
+            # to visit
+            stack = [ (root, iter(live)) ]
+            # as long as there are nodes to visit
+            while stack:
+                # get the node on the top of the stack
+                node, pending = stack[-1]
+                # go through its remaining observers
+                for observer in pending:
+                    # if we have been there before, or it has no observers of its own
+                    if observer in visited or not isinstance(observer, Observable):
+                        # move on
+                        continue
+                    # if it is a memoized node whose cache is already invalid, it won't pass
+                    # the notification along, so there is no need to visit its observers
+                    if getattr(observer, "dirty", False) and observer not in self._fired:
+                        # move on
+                        continue
+                    # otherwise, mark it
+                    visited.add(observer)
+                    # get its observers
+                    observers[observer] = live = tuple(observer.observers)
+                    # and push it to the stack
+                    stack.append((observer, iter(live)))
+                    # so we can visit it next
+                    break
+                # if all observers of {node} have been visited
+                else:
+                    # we are done with it
+                    stack.pop()
+                    # so add it to the post-order pile
+                    postorder.append(node)
+        # reverse the post-order to get a topological sort
+        for node in reversed(postorder):
+            # and hand each node to the caller, along with its observers
+            yield node, observers[node]
+        # all done
+        return
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the nodes whose notifications are pending
+        self._fired = set()
+        # the nodes that seed the next delivery pass
+        self._roots = []
+        # the pile of markers that record whether entering a block activated me
+        self._blocks = []
+        # the reentrancy guard
+        self._propagating = False
+        # all done
+        return
+
+
+    def __enter__(self):
+        """
+        Start collecting notifications
+        """
+        # get the invalidator that is currently active
+        current = type(self).active
+        # if there is one, this is a nested block so piggyback on it; otherwise, activate me
+        self._blocks.append(current is None)
+        # if i'm the one in charge
+        if current is None:
+            # install me
+            Invalidator.active = self
+        # all done
+        return self
+
+
+    def __exit__(self, exc_type, exc_instance, exc_traceback):
+        """
+        Deliver the pending notifications when the outermost block exits
+        """
+        # if i was not the one activated by the matching block
+        if not self._blocks.pop():
+            # nothing to do
+            return False
+        # otherwise, carefully
+        try:
+            # deliver the pending notifications; do this even when the block raised an exception,
+            # since nodes that were marked dirty in the block would otherwise be out of sync with
+            # their observers
+            self.propagate()
+        # no matter what happens
+        finally:
+            # deactivate me
+            Invalidator.active = None
+        # re-raise any exception that occurred while executing the body of the with statement
+        return False
+
+
+# end of file
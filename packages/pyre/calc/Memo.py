@@ -6,6 +6,11 @@
 #
 
 
+# the evaluator of dirty nodes
+from .Engine import Engine
+# the manager of batched notifications
+from .Invalidator import Invalidator
+
 
 # class declaration
 class Memo:
@@ -24,10 +29,16 @@ class Memo:
         Override the node value retriever and return the contents of my value cache if it is up
         to date; otherwise, recompute the value and update the cache
         """
+        # get the active invalidator
+        invalidator = Invalidator.active
+        # if there are batched notifications that have not been delivered yet
+        if invalidator is not None and invalidator.pending:
+            # deliver them now, since one of them may be aimed at me
+            invalidator.propagate()
         # if my cache is invalid
         if self.dirty:
-            # recompute
-            self._cache = super().getValue(**kwds)
+            # refresh my dependencies and recompute
+            self._cache = self._engine.evaluate(node=self, evaluator=super().getValue, **kwds)
             # mark
             self.dirty = False
         # return the cache contents
@@ -61,6 +72,7 @@ class Memo:
 
     # private data
     _cache = None
+    _engine = Engine() # shared by all memoized nodes
 
 
 # end of file
@@ -10,6 +10,8 @@
 import weakref
 # the superclas
 from .Reactor import  Reactor
+# the manager of batched notifications
+from .Invalidator import Invalidator
 
 
 # class declaration
@@ -87,14 +89,25 @@ class Observable(Reactor):
         """
         Handler of the notification event from one of my observables
        """
-        # take this opportunity to clean up my observers
-        observers = set(self.observers)
+        # get the active invalidator
+        invalidator = Invalidator.active
+        # if notifications are being batched
+        if invalidator is not None:
+            # let it know i have changed; it will notify my observers when the batch is done
+            invalidator.defer(observable=self)
+            # and chain up
+            return super().flush(**kwds)
+
+        # otherwise, get my live observers
+        observers = tuple(self.observers)
         # go through the pile
         for observer in observers:
             # notify each one
             observer.flush(observable=self)
-        # rebuild the set of references
-        self._observers = set(map(weakref.ref, observers))
+        # if any of them have expired
+        if len(observers) < len(self._observers):
+            # take this opportunity to clean up the pile
+            self._observers = {ref for ref in self._observers if ref() is not None}
         # chain up
         return super().flush(**kwds)
 
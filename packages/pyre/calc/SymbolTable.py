@@ -129,6 +129,17 @@ class SymbolTable:
 
 
     # interface
+    def batch(self):
+        """
+        Build a context manager that defers the delivery of value change notifications until
+        the end of the block, when they are propagated in a single pass over the affected nodes
+        """
+        # get the invalidator
+        from .Invalidator import Invalidator
+        # build one and return it
+        return Invalidator()
+
+
     def get(self, name, default=None):
         """
         Attempt to resolve {name} and return its value; if {name} is not in the symbol table,
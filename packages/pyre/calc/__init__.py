@@ -153,6 +153,39 @@ def sum(*operands):
     return Node.sum(operands=list(operands))
 
 
+# evaluation management
+def engine():
+    """
+    Access the evaluator of memoized nodes, and its statistics
+    """
+    # get the memo mixin
+    from .Memo import Memo
+    # and return its evaluator
+    return Memo._engine
+
+
+def compiler():
+    """
+    Access the cache of compiled formulas, and its statistics
+    """
+    # get the shared instance
+    from .Compiler import compiler
+    # and return it
+    return compiler
+
+
+# notification management
+def batch():
+    """
+    Build a context manager that defers the delivery of value change notifications until the
+    end of the block
+    """
+    # get the invalidator
+    from .Invalidator import Invalidator
+    # build one and return it
+    return Invalidator()
+
+
 def debug():
     """
     Support for debugging the calc package
@@ -30,6 +30,7 @@ class Registrar:
     # public data
     protocols = None # the set of known protocols
     components = None # the map of component classes to their instances
+    named = None # the map of (component class, name) pairs to their instances
     implementers = None # a map of protocols to component classes that implement them
 
 
@@ -82,6 +83,12 @@ class Registrar:
         """
         # add this instance to the set of instances of its class
         self.components[type(instance)].add(instance)
+        # get its name
+        name = instance.pyre_name
+        # if it has one
+        if name:
+            # index it, so that looking it up by name doesn't require a scan of its siblings
+            self.named[(type(instance), name)] = instance
         # notify all observers
         for observer in self.instanceObservers:
             # by invoking the hook
@@ -190,12 +197,9 @@ class Registrar:
         """
         Look through the registered instances of {componentClass} for one with the given {name}
         """
-        # go through the pile
-        for instance in self.components[componentClass]:
-            # return the instance whose the name matches the given one
-            if instance.pyre_name == name:  return instance
-        # otherwise, no match
-        return None
+        # look up the instance that was registered under this name; instances are named after
+        # their configuration key, so their names don't change once they are registered
+        return self.named.get((componentClass, name))
 
 
     # meta-methods
@@ -204,6 +208,8 @@ class Registrar:
         super().__init__(**kwds)
         # map: components -> their instances
         self.components = {}
+        # map: (component, name) -> the instance registered under that name
+        self.named = weakref.WeakValueDictionary()
         # the known interfaces
         self.protocols = set()
         # map: protocols -> components that implement them
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import os
+import pickle
+import threading
+
+
+# class declaration
+class Cache:
+    """
+    A store of precompiled configuration events
+
+    Decoding a configuration source involves scanning and parsing its contents, and this has to
+    be repeated every time an application starts. {Cache} saves the events harvested from a
+    source in a file next to it, in a {__pycache__} subfolder, and replays them instead of
+    decoding the source as long as its path, modification time and size are unchanged.
+
+    Sources that don't correspond to files in the local filesystem are always decoded. Failure
+    to read or write a cache file is never an error: the source is decoded as if the cache were
+    not there. Clients that don't want cache files written, e.g. next to sources in shared or
+    system folders, ask {decode} not to {save} them; existing cache files are still consulted
+    """
+
+
+    # constants
+    version = 1 # the version of the format of the cache files
+    folder = "__pycache__" # the name of the folder with the cache files
+    suffix = "pyre" # the suffix of the cache files
+
+
+    # public data
+    active = True # the switch that controls whether the cache is consulted at all
+    hits = 0 # the number of sources whose events were retrieved from the cache
+    misses = 0 # the number of sources that had to be decoded
+
+
+    # interface
+    def decode(self, codec, uri, source, locator, save=True):
+        """
+        Retrieve the events in {source}, either from a cache file or by asking {codec} to decode
+        it; the decoded events are saved in a cache file only if {save} is true
+        """
+        # identify the source
+        stamp = self.stamp(codec=codec, source=source) if self.active else None
+        # if there is no way to validate a cache file
+        if stamp is None:
+            # just decode the source
+            return codec.decode(uri, source, locator)
+
+        # get the path to the cache file
+        path = self.path(source=stamp[1])
+        # attempt to
+        try:
+            # retrieve the events from it
+            events = self.load(path=path, stamp=stamp, locator=locator)
+        # if anything goes wrong
+        except Exception:
+            # we have to do this the hard way
+            events = None
+        # if we found them
+        if events is not None:
+            # update the counter
+            self.hits += 1
+            # and hand them to the caller
+            return events
+
+        # update the counter
+        self.misses += 1
+        # decode the source and harvest the events
+        events = list(codec.decode(uri, source, locator))
+        # if i'm allowed to
+        if save:
+            # save them
+            self.save(path=path, stamp=stamp, locator=locator, events=events)
+        # and hand them to the caller
+        return events
+
+
+    def stamp(self, codec, source):
+        """
+        Build the identification of {source}; returns {None} if {source} is not a file in the
+        local filesystem
+        """
+        # get the name of the source
+        name = getattr(source, "name", None)
+        # if it doesn't have a name, it doesn't correspond to a file
+        if not isinstance(name, str):
+            # so we can't help
+            return None
+        # attempt to
+        try:
+            # get the file metadata
+            meta = os.fstat(source.fileno())
+        # if this fails
+        except (AttributeError, OSError, ValueError):
+            # it's not a file we can track
+            return None
+        # build the stamp
+        return (self.version, os.path.abspath(name), meta.st_mtime_ns, meta.st_size,
+                codec.encoding)
+
+
+    def path(self, source):
+        """
+        Build the path to the cache file for the file at {source}
+        """
+        # split the source path
+        folder, name = os.path.split(source)
+        # assemble and return
+        return os.path.join(folder, self.folder, f"{name}.{self.suffix}")
+
+
+    def load(self, path, stamp, locator):
+        """
+        Retrieve the events in the cache file at {path}, provided it was built for the source
+        identified by {stamp}; returns {None} if there is no valid cache file
+        """
+        # attempt to
+        try:
+            # open the file
+            stream = open(path, "rb")
+        # if it's not there
+        except OSError:
+            # no dice
+            return None
+        # otherwise
+        with stream:
+            # build an unpickler that plugs {locator} back into the events
+            unpickler = self.Unpickler(stream, locator=locator)
+            # get the stamp of the cached source, and whether it was decoded with a locator
+            cached, bound = unpickler.load()
+            # if either one doesn't match
+            if cached != stamp or bound != (locator is not None):
+                # the file is out of date
+                return None
+            # otherwise, retrieve the events
+            return unpickler.load()
+
+
+    def save(self, path, stamp, locator, events):
+        """
+        Store {events} in the cache file at {path}
+        """
+        # other processes, or other threads in this one, may be saving the same file at the same
+        # time, so write the events to a private file first
+        scratch = f"{path}.{os.getpid()}.{threading.get_ident()}"
+        # attempt to
+        try:
+            # make sure the folder exists
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # open the scratch file
+            with open(scratch, "wb") as stream:
+                # build a pickler that leaves {locator} out of the file
+                pickler = self.Pickler(stream, locator=locator)
+                # save the stamp
+                pickler.dump((stamp, locator is not None))
+                # and the events
+                pickler.dump(events)
+            # move it into place; this is atomic, so readers see either the old or the new file
+            os.replace(scratch, path)
+        # if anything goes wrong
+        except Exception:
+            # the cache is just an optimization, so don't complain; just clean up
+            try:
+                os.remove(scratch)
+            except OSError:
+                pass
+        # all done
+        return self
+
+
+    # helpers
+    class Pickler(pickle.Pickler):
+        """
+        A pickler that replaces the locator supplied by the client with a placeholder
+        """
+
+        def persistent_id(self, obj):
+            # if {obj} is the client's locator, replace it with a placeholder
+            if self.locator is not None and obj is self.locator: return "locator"
+            # otherwise, pickle it normally
+            return None
+
+        def __init__(self, stream, locator, **kwds):
+            # chain up
+            super().__init__(stream, protocol=pickle.HIGHEST_PROTOCOL, **kwds)
+            # record the locator
+            self.locator = locator
+            # all done
+            return
+
+
+    class Unpickler(pickle.Unpickler):
+        """
+        An unpickler that replaces the placeholder with the locator supplied by the client
+        """
+
+        def persistent_load(self, pid):
+            # the only placeholder we know about is the client's locator
+            if pid == "locator": return self.locator
+            # anything else is an error
+            raise pickle.UnpicklingError(f"unknown persistent id {pid!r}")
+
+        def __init__(self, stream, locator, **kwds):
+            # chain up
+            super().__init__(stream, **kwds)
+            # record the locator
+            self.locator = locator
+            # all done
+            return
+
+
+# end of file
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import os
+import sys
+import json
+
+
+# class declaration
+class Catalog:
+    """
+    A record of the outcome of attempts to load shelves
+
+    Resolving a component specification involves probing a large number of candidate shelves,
+    most of which do not exist. {Catalog} remembers which candidates were found and which were
+    missing, along with the modification times of the folders whose contents determine the
+    outcome, so that the loaders can skip candidates that are known to be missing without
+    probing them again. An entry is discarded as soon as any of its folders changes.
+
+    The catalog can be persisted between runs; in that case, the entries are also tied to the
+    python search path and the current working directory, since these determine the folders
+    that get searched
+    """
+
+
+    # constants
+    version = 1 # the version of the persistent format
+
+
+    # public data
+    path = None # the file where the catalog is persisted, if any
+    hits = 0 # the number of candidates that were skipped because they are known to be missing
+    probes = 0 # the number of candidates that had to be loaded
+    invalidations = 0 # the number of entries that were discarded because they were out of date
+
+    @property
+    def size(self):
+        """
+        The number of entries in the catalog
+        """
+        # easy enough
+        return len(self._entries)
+
+
+    # interface
+    def known(self, uri):
+        """
+        Check whether {uri} is a known shelf: {True} if it was found, {False} if it was missing,
+        and {None} if there is no valid record for it
+        """
+        # attempt to
+        try:
+            # look up the entry
+            found, stamp = self._entries[uri]
+        # if it's not there
+        except KeyError:
+            # we know nothing
+            return None
+        # go through the folders that determined the outcome
+        for folder, mtime in stamp:
+            # if any of them has changed since the entry was recorded
+            if self.mtime(folder) != mtime:
+                # the entry is no longer valid; discard it
+                del self._entries[uri]
+                # mark me as modified
+                self._modified = True
+                # update the counter
+                self.invalidations += 1
+                # and report ignorance
+                return None
+        # if the candidate is known to be missing
+        if not found:
+            # we are about to save the caller a probe
+            self.hits += 1
+        # all done
+        return found
+
+
+    def record(self, uri, found, folders):
+        """
+        Remember whether {uri} was {found}, along with the current state of {folders}
+        """
+        # if there are no folders
+        if not folders:
+            # the outcome can't be validated, so don't record it
+            return self
+        # build the stamp
+        stamp = tuple((folder, self.mtime(folder)) for folder in folders)
+        # record the entry
+        self._entries[uri] = (found, stamp)
+        # mark me as modified
+        self._modified = True
+        # all done
+        return self
+
+
+    def refresh(self):
+        """
+        Prepare for a new round of lookups
+        """
+        # the state of the folders may have changed since the last round, so forget what we
+        # know about them
+        self._mtimes.clear()
+        # compute the current search context
+        signature = self.signature()
+        # if it has changed
+        if signature != self._signature:
+            # all my entries are suspect
+            self.invalidations += len(self._entries)
+            # so discard them
+            self._entries.clear()
+            # mark me as modified
+            self._modified = True
+            # and save the new context
+            self._signature = signature
+        # all done
+        return self
+
+
+    def mtime(self, folder):
+        """
+        Look up the modification time of {folder}; the result is {None} if {folder} does not exist
+        """
+        # attempt to
+        try:
+            # look up the time in my memo
+            return self._mtimes[folder]
+        # if it's not there
+        except KeyError:
+            # carry on
+            pass
+        # attempt to
+        try:
+            # get the modification time of the folder
+            mtime = os.stat(folder).st_mtime_ns
+        # if anything goes wrong
+        except OSError:
+            # mark it as missing
+            mtime = None
+        # memoize it
+        self._mtimes[folder] = mtime
+        # and return it
+        return mtime
+
+
+    def signature(self):
+        """
+        Build a representation of the context that determines the folders that get searched
+        """
+        # the current working directory
+        cwd = os.getcwd()
+        # and the python search path
+        return [cwd] + [ entry or cwd for entry in sys.path ]
+
+
+    def clear(self):
+        """
+        Discard all entries and reset the statistics
+        """
+        # empty the catalog
+        self._entries.clear()
+        self._mtimes.clear()
+        # reset the counters
+        self.hits = 0
+        self.probes = 0
+        self.invalidations = 0
+        # mark me as modified
+        self._modified = True
+        # all done
+        return self
+
+
+    # persistence
+    def load(self, path=None):
+        """
+        Retrieve the entries in the file at {path}, if it exists; on success, the catalog is
+        saved back to {path} by {save}
+        """
+        # use my own path if the caller didn't supply one
+        path = self.path if path is None else str(path)
+        # if there isn't one
+        if path is None:
+            # nothing to do
+            return self
+        # remember it
+        self.path = path
+        # attempt to
+        try:
+            # open the file
+            with open(path, "r") as stream:
+                # and read its contents
+                document = json.load(stream)
+            # unpack
+            version = document["version"]
+            signature = document["signature"]
+            entries = document["entries"]
+        # if anything goes wrong
+        except (OSError, ValueError, KeyError, TypeError):
+            # the file is missing or corrupt; we will overwrite it when we save
+            return self
+        # if the file was written in a different format, or in a different context
+        if version != self.version or signature != self.signature():
+            # none of its entries apply
+            return self
+        # go through the entries
+        for uri, (found, stamp) in entries.items():
+            # and add the ones we don't already know about
+            self._entries.setdefault(
+                uri, (found, tuple((folder, mtime) for folder, mtime in stamp)))
+        # update the signature
+        self._signature = signature
+        # all done
+        return self
+
+
+    def save(self, path=None):
+        """
+        Persist my entries in the file at {path}
+        """
+        # use my own path if the caller didn't supply one
+        path = self.path if path is None else str(path)
+        # if there isn't one, or i have nothing new to say
+        if path is None or not self._modified:
+            # nothing to do
+            return self
+        # build the document
+        document = {
+            "version": self.version,
+            "signature": self.signature(),
+            "entries": {
+                uri: [found, [ list(pair) for pair in stamp ]]
+                for uri, (found, stamp) in self._entries.items()
+            },
+        }
+        # other processes may be saving their own catalogs at the same time, so write the
+        # document to a private file first
+        scratch = f"{path}.{os.getpid()}"
+        # attempt to
+        try:
+            # open the scratch file
+            with open(scratch, "w") as stream:
+                # and write the document
+                json.dump(document, stream)
+            # move it into place; this is atomic, so readers see either the old or the new file
+            os.replace(scratch, path)
+        # if anything goes wrong
+        except OSError:
+            # the catalog is just an optimization, so don't complain; just clean up
+            try:
+                os.remove(scratch)
+            except OSError:
+                pass
+            # and bail
+            return self
+        # mark me as clean
+        self._modified = False
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, path=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # record the location of my persistent store
+        self.path = None if path is None else str(path)
+        # the map from uris to their outcomes
+        self._entries = {}
+        # the modification times of the folders we have looked at in the current round
+        self._mtimes = {}
+        # the search context of my entries
+        self._signature = self.signature()
+        # the dirty bit
+        self._modified = False
+        # all done
+        return
+
+
+# end of file
@@ -7,7 +7,10 @@
 
 
 # externals
+import sys # for dont_write_bytecode
+import heapq # for merge
 import weakref # for access to my executive
+import itertools # for count
 import collections # for defaultdict
 from .. import tracking
 
@@ -22,12 +25,15 @@ class Configurator:
     # types
     from . import events
     from . import exceptions
+    from .Cache import Cache
 
     # constants
     locator = tracking.simple('during pyre startup') # the default locator
+    cachekey = "pyre.configcache" # the key that controls whether cache files are written
 
     # public data
     codecs = None
+    cache = None
 
 
     # interface
@@ -59,14 +65,44 @@ class Configurator:
             # and get out of here
             return errors
 
-        # convert the input source into a stream of events
-        events = reader.decode(uri, source, locator)
+        # convert the input source into a stream of events, unless they are already available in
+        # precompiled form
+        events = self.cache.decode(
+            codec=reader, uri=uri, source=source, locator=locator, save=self.saveCache())
         # process it
         errors.extend(self.processEvents(events=events, priority=priority))
         # and return the errors
         return errors
 
 
+    def saveCache(self):
+        """
+        Decide whether the events decoded from configuration files should be saved in cache
+        files, according to the interpreter's policy on writing bytecode and the value of
+        {pyre.configcache}
+        """
+        # cache files live in {__pycache__}, so honor the interpreter's policy
+        if sys.dont_write_bytecode: return False
+        # if i don't have an executive, there are no settings to consult
+        if self.executive is None: return True
+        # get the nameserver
+        nameserver = self.executive.nameserver
+        # if the user has not said anything
+        if self.cachekey not in nameserver:
+            # save them
+            return True
+        # access the schemata
+        from .. import schemata
+        # attempt to
+        try:
+            # interpret the setting
+            return schemata.bool().coerce(value=nameserver[self.cachekey])
+        # if it's not a recognizable boolean
+        except Exception:
+            # err on the side of leaving the filesystem alone
+            return False
+
+
     # access to codecs
     def codec(self, encoding):
         """
@@ -102,11 +138,14 @@ class Configurator:
         """
         # error accumulator
         errors = []
-        # loop over events
-        for event in events:
-            # process the event
-            # print("pyre.config.Configurator.configure:", event)
-            event.identify(inspector=self, priority=priority)
+        # the assignments in a configuration source tend to touch many related nodes, so batch
+        # the change notifications they trigger
+        with self.executive.nameserver.batch():
+            # loop over events
+            for event in events:
+                # process the event
+                # print("pyre.config.Configurator.configure:", event)
+                event.identify(inspector=self, priority=priority)
         # all done
         return errors
 
@@ -136,12 +175,35 @@ class Configurator:
         """
         Process a conditional assignment
         """
+        # get the nameserver
+        nameserver = self.executive.nameserver
         # build the key
-        key = self.executive.nameserver.hash(name=assignment.component)
+        key = nameserver.hash(name=assignment.component)
         # compute the priority
         priority = priority()
+        # hash the conditions once, so we don't have to do it every time an instance is configured
+        conditions = [
+            (nameserver.hash(name), nameserver.hash(family))
+            for name, family in assignment.conditions
+            ]
+        # the family that the instance itself must belong to; {None} if there is no such
+        # condition
+        family = None
+        # go through the conditions
+        for pos, (name, required) in enumerate(conditions):
+            # if this one refers to the instance
+            if name is key:
+                # it is satisfied by every instance found in the index under its family
+                family = required
+                # so there is no need to check it again
+                del conditions[pos]
+                # done
+                break
+        # build the entry; the sequence number preserves the order of assignments that end up in
+        # different families
+        entry = (next(self._sequence), assignment, priority, tuple(conditions))
         # add it to the pile
-        self.deferred[key].append((assignment, priority))
+        self.deferred[key][family].append(entry)
 
         # dump
         # print("Configurator.defer:")
@@ -256,14 +318,26 @@ class Configurator:
         # access the nameserver
         nameserver = self.executive.nameserver
 
-        # go through all deferred assignment that were meant for this instance
-        for assignment, priority in self.deferred[key]:
-            # check all the conditions
-            for name, family in assignment.conditions:
-                # hash the conditions
-                name = nameserver.hash(name)
-                family = nameserver.hash(family)
-                # if the hashed name matches the instance we are configuring
+        # get the deferred assignments that were meant for this instance, indexed by the family
+        # the instance must belong to
+        index = self.deferred.get(key)
+        # if there aren't any
+        if not index:
+            # nothing to do
+            return
+
+        # the relevant assignments are the ones that place no requirements on the family of the
+        # instance, and the ones that require the family of the instance, if we have one
+        family = None if instance is None else type(instance).pyre_inventory.key
+        # collect the relevant piles
+        piles = [ index.get(family, ()) ] if family is None else [
+            index.get(None, ()), index.get(family, ()) ]
+
+        # go through all the candidates in the order they were recorded
+        for _, assignment, priority, conditions in heapq.merge(*piles):
+            # check the remaining conditions
+            for name, family in conditions:
+                # if the condition refers to the instance we are configuring
                 if name is key:
                     # no need to look it up; chances are good it's not there yet anyway
                     ref = instance
@@ -327,10 +401,14 @@ class Configurator:
 
         # initialize my codecs
         self.codecs = self._indexDefaultCodecs()
+        # and the store of precompiled configuration events
+        self.cache = self.Cache()
 
         # configuration events
         self.commands = []
-        self.deferred = collections.defaultdict(list)
+        self.deferred = collections.defaultdict(lambda: collections.defaultdict(list))
+        # the source of sequence numbers for deferred assignments
+        self._sequence = itertools.count()
 
         # the record of configuration sources in the order they were encountered
         self.sources = []
@@ -38,6 +38,10 @@ class Loader:
 
         # access the linker
         linker = executive.linker
+        # and its record of previous attempts
+        catalog = linker.catalog
+        # the folders may have changed since the last search
+        catalog.refresh()
         # print(" -- priming the search for shelves")
         # use {protocol} to build a sequence of candidate locations
         candidates = cls.locateShelves(executive=executive, protocol=protocol,
@@ -56,12 +60,18 @@ class Loader:
                 # print("    shelf {!r} previously loaded".format(candidate.uri))
             # otherwise
             except KeyError:
+                # if the candidate is known to be missing
+                if catalog.known(candidate.uri) is False:
+                    # move on to the next candidate without probing it
+                    continue
                 # show me
                 # print("    new shelf; loading")
                 # make an empty shelf and register it with the
                 # linker to prevent it from attempting to load this shelf again, in case there
                 # are loading side effects
                 linker.shelves[candidate.uri] = cls.shelf(uri=candidate)
+                # update the probe count
+                catalog.probes += 1
                 # attempt to
                 try:
                     # load it
@@ -72,10 +82,18 @@ class Loader:
                     # print(" ## skipping: {}".format(error))
                     # remove the bogus registration
                     del linker.shelves[candidate.uri]
+                    # remember the miss
+                    catalog.record(
+                        uri=candidate.uri, found=False,
+                        folders=cls.folders(executive=executive, uri=candidate, error=error))
                     # move on to the next candidate
                     continue
                 # if the shelf was loaded correctly, replace the bogus registration
                 linker.shelves[candidate.uri] = shelf
+                # and remember the hit
+                catalog.record(
+                    uri=candidate.uri, found=True,
+                    folders=cls.folders(executive=executive, uri=candidate))
                 # show me
                 # print("      success; registering {!r} with the linker".format(candidate.uri))
 
@@ -216,6 +234,17 @@ class Loader:
         return
 
 
+    @classmethod
+    def folders(cls, executive, uri, error=None):
+        """
+        Build the sequence of physical folders whose contents determine whether the shelf at
+        {uri} exists; {error} is the reason the attempt to load it failed, if it did. The
+        outcome of loading shelves whose sequence is empty is not recorded in the catalog
+        """
+        # by default, nothing gets recorded
+        return ()
+
+
     # initialization
     @classmethod
     def register(cls, index):
@@ -7,6 +7,7 @@
 
 
 # externals
+import os
 import sys
 # support
 from ... import primitives, tracking
@@ -72,6 +73,47 @@ class Importer(Loader):
         return cls.shelf(module=sys.modules[source], uri=uri, locator=locator)
 
 
+    @classmethod
+    def folders(cls, executive, uri, error=None):
+        """
+        Build the sequence of physical folders whose contents determine whether the module at
+        {uri} exists
+        """
+        # if the import failed
+        if error is not None:
+            # get the reason
+            reason = error.__cause__
+            # if it's not because the module, or one of its parent packages, is missing
+            if not isinstance(reason, ModuleNotFoundError) or reason.name is None:
+                # the failure may have been caused by the contents of the module, so the outcome
+                # should not be recorded
+                return ()
+            # get the name of the module
+            source = str(uri.address)
+            # and if the missing module is not an ancestor of ours
+            if source != reason.name and not source.startswith(reason.name + '.'):
+                # the module exists but it imports something that doesn't
+                return ()
+        # get the current working directory
+        cwd = os.getcwd()
+        # the top level package is searched for along the python path
+        folders = [ entry or cwd for entry in sys.path ]
+        # form the sequence of the names of all packages that contain the module
+        names = str(uri.address).split('.')[:-1]
+        # go through them
+        for pos in range(1, len(names)+1):
+            # look up the package
+            package = sys.modules.get('.'.join(names[:pos]))
+            # if it hasn't been imported
+            if package is None:
+                # neither have any of its subpackages
+                break
+            # otherwise, its subpackages are searched for along its path
+            folders.extend(getattr(package, '__path__', ()))
+        # all done
+        return tuple(folders)
+
+
     @classmethod
     def locateShelves(cls, protocol, scheme, context, **kwds):
         """
@@ -6,6 +6,8 @@
 #
 
 
+# externals
+import os
 # access to the locator factories
 from ... import primitives, tracking
 # and my ancestors
@@ -60,6 +62,21 @@ class ODB(Loader):
         return shelf
 
 
+    @classmethod
+    def folders(cls, executive, uri, error=None):
+        """
+        Build the sequence of physical folders whose contents determine whether the shelf at
+        {uri} exists
+        """
+        # the contents of the virtual filesystem depend on which packages have been registered
+        # and which folders have been explored so far, so only local files are recorded
+        if uri.scheme != 'file':
+            # nothing to record
+            return ()
+        # the only folder that matters is the one that contains the file
+        return (os.path.dirname(os.path.abspath(str(uri.address))),)
+
+
     @classmethod
     def locateShelves(cls, executive, protocol, scheme, context, **kwds):
         """
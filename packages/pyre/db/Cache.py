@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import threading
+import time
+
+
+# declaration
+class Cache:
+    """
+    A store of query results keyed by the text of the statement and its parameters
+
+    Entries are evicted when they expire, when the cache is full and they are the least
+    recently used ones, or when one of the tables they were computed from is modified. The
+    cache keeps track of its activity in {counters}. It may be shared by the connections of a
+    pool, so access to its state is serialized by {lock}
+
+    Each table has a generation that is bumped whenever it is invalidated. Clients take a
+    snapshot of the generations of the tables a query depends on before executing it, and hand
+    it to {put}, which discards the results if any of these tables were invalidated while they
+    were being computed, e.g. by a modification committed through another connection
+    """
+
+
+    # public data
+    entries = None # a map from keys to expiration times, results and the names of their tables
+    tables = None # a map from table names to the keys of the entries that depend on them
+    generations = None # a map from table names to the number of times they were invalidated
+    epoch = 0 # the number of times the entire cache was invalidated
+    counters = None # my activity counters
+    lock = None # the lock that protects my state
+
+
+    # interface
+    def get(self, key):
+        """
+        Look up the results stored under {key}; returns {None} if there aren't any
+        """
+        # while holding the lock
+        with self.lock:
+            # get my entries
+            entries = self.entries
+            # look up the key, removing it so it can be reinserted as the most recently used
+            entry = entries.pop(key, None)
+            # if it's not there
+            if entry is None:
+                # update the counters
+                self.counters["misses"] += 1
+                # and bail
+                return None
+            # unpack
+            expiration, results, tables = entry
+            # if it has expired
+            if time.monotonic() >= expiration:
+                # forget it
+                self.unlink(key=key, tables=tables)
+                # update the counters
+                self.counters["expirations"] += 1
+                self.counters["misses"] += 1
+                # and bail
+                return None
+            # otherwise, put it back
+            entries[key] = entry
+            # update the counters
+            self.counters["hits"] += 1
+            # and hand the results to the caller
+            return results
+
+
+    def generation(self, tables):
+        """
+        Take a snapshot of the generations of the {tables} with the given names
+        """
+        # while holding the lock
+        with self.lock:
+            # get the generations
+            generations = self.generations
+            # and build the snapshot
+            return self.epoch, {table: generations.get(table, 0) for table in tables}
+
+
+    def put(self, key, results, tables, capacity, lifetime, generation=None):
+        """
+        Store {results} under {key} for {lifetime} seconds, noting that they were computed from
+        the {tables} with the given names; the least recently used entries are evicted so that
+        there are at most {capacity} of them. If {generation}, a snapshot taken before the
+        results were computed, is out of date, the results are not stored
+        """
+        # while holding the lock
+        with self.lock:
+            # if the results were computed from tables that have been invalidated since
+            if generation is not None and not self.current(generation=generation):
+                # update the counters
+                self.counters["stale"] += 1
+                # and hand them back without storing them
+                return results
+            # get my entries
+            entries = self.entries
+            # if there is an older version of this entry
+            if key in entries:
+                # forget it
+                self.unlink(key=key, tables=entries.pop(key)[2])
+            # as long as the cache is full
+            while entries and len(entries) >= capacity:
+                # get the least recently used entry
+                lru = next(iter(entries))
+                # forget it
+                self.unlink(key=lru, tables=entries.pop(lru)[2])
+                # and update the counters
+                self.counters["evictions"] += 1
+            # store the new entry
+            entries[key] = (time.monotonic() + lifetime, results, tables)
+            # go through its tables
+            for table in tables:
+                # and index it
+                self.tables.setdefault(table, set()).add(key)
+            # all done
+            return results
+
+
+    def invalidate(self, tables=None):
+        """
+        Discard the entries that depend on any of the {tables} with the given names, or all of
+        them if {tables} is {None}
+        """
+        # while holding the lock
+        with self.lock:
+            # if there are no tables
+            if tables is None:
+                # start a new epoch
+                self.epoch += 1
+                # update the counters
+                self.counters["invalidations"] += len(self.entries)
+                # and forget everything
+                self.entries.clear()
+                self.tables.clear()
+                # all done
+                return
+            # get my entries
+            entries = self.entries
+            # and their generations
+            generations = self.generations
+            # go through the tables
+            for table in tables:
+                # bump the generation
+                generations[table] = generations.get(table, 0) + 1
+                # get the keys of the entries that depend on this one
+                for key in self.tables.pop(table, ()):
+                    # remove the entry, if it hasn't been removed already through another table
+                    entry = entries.pop(key, None)
+                    # if it was still there
+                    if entry is not None:
+                        # remove it from the index of its other tables
+                        self.unlink(key=key, tables=entry[2])
+                        # and update the counters
+                        self.counters["invalidations"] += 1
+            # all done
+            return
+
+
+    def statistics(self):
+        """
+        Build a snapshot of my counters, along with my size and hit ratio
+        """
+        # while holding the lock
+        with self.lock:
+            # make a copy of my counters
+            statistics = dict(self.counters)
+            # add my size
+            statistics["entries"] = len(self.entries)
+        # and the hit ratio
+        statistics["ratio"] = statistics["hits"] / max(1, statistics["hits"] + statistics["misses"])
+        # all done
+        return statistics
+
+
+    # implementation details
+    def current(self, generation):
+        """
+        Check whether the snapshot {generation} is still current; the caller must hold the lock
+        """
+        # unpack
+        epoch, tables = generation
+        # get the generations
+        generations = self.generations
+        # check
+        return epoch == self.epoch and all(
+            generations.get(table, 0) == count for table, count in tables.items())
+
+
+    def unlink(self, key, tables):
+        """
+        Remove {key} from the index of the given {tables}; the caller must hold the lock
+        """
+        # go through the tables
+        for table in tables:
+            # get the keys that depend on this one
+            keys = self.tables.get(table)
+            # if there are any
+            if keys is not None:
+                # remove this one
+                keys.discard(key)
+                # and if that was the last one
+                if not keys:
+                    # remove the table from the index
+                    del self.tables[table]
+        # all done
+        return
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # make my lock
+        self.lock = threading.Lock()
+        # initialize my containers
+        self.entries = {}
+        self.tables = {}
+        self.generations = {}
+        # and my counters
+        self.counters = {
+            "hits": 0, # the number of lookups that found valid results
+            "misses": 0, # the number of lookups that came up empty
+            "expirations": 0, # the number of entries that were discarded because they expired
+            "evictions": 0, # the number of entries discarded to make room for new ones
+            "invalidations": 0, # the number of entries discarded because a table was modified
+            "stale": 0, # the number of results not stored because a table was modified meanwhile
+            }
+        # all done
+        return
+
+
+    def __len__(self):
+        # easy enough
+        return len(self.entries)
+
+
+# end of file
@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import contextlib
+import threading
+import time
+# access to the framework
+import pyre
+# my protocols
+from .DataStore import DataStore
+# the query result cache
+from .Cache import Cache
+# the units of time
+from pyre.units.SI import second
+
+
+# declaration
+class Pool(pyre.component, family="pyre.db.pool"):
+    """
+    A pool of connections to a data store that can be shared by multiple threads
+
+    The connections are instances of the type of {server}, configured like it; {server} itself
+    is never attached. Clients lease connections by {checkout} and return them by {checkin},
+    or, preferably, through {connection}, a context manager that leases a connection for the
+    duration of a transaction. At most {maximum} connections are open at any time; clients that
+    find them all in use wait for up to {timeout} for one to be returned.
+
+    Connections that have been idle for longer than {stale} are verified by executing {check}
+    before they are leased, and replaced if they are found to be broken. Idle connections in
+    excess of {minimum} are closed after {idle}. The pool keeps track of its activity in
+    {counters}; a summary is available from {statistics}.
+
+    The connections share a single cache of query results, {results}, so that the
+    modifications made through any of them invalidate the results cached by the rest.
+    """
+
+
+    # types
+    from . import exceptions
+
+
+    # user configurable state
+    server = DataStore()
+    server.doc = "the prototype of the connections in the pool"
+
+    minimum = pyre.properties.int(default=1)
+    minimum.doc = "the number of connections to keep open, even when idle"
+
+    maximum = pyre.properties.int(default=8)
+    maximum.doc = "the maximum number of connections that can be open at any time"
+
+    timeout = pyre.properties.dimensional(default=30*second)
+    timeout.doc = "the longest a client waits for a connection before giving up"
+
+    idle = pyre.properties.dimensional(default=300*second)
+    idle.doc = "idle connections in excess of {minimum} are closed after this long"
+
+    stale = pyre.properties.dimensional(default=30*second)
+    stale.doc = "connections idle for longer than this are verified before they are leased"
+
+    check = pyre.properties.str(default="SELECT 1;")
+    check.doc = "the statement that verifies that a connection is usable"
+
+
+    # interface
+    def attach(self):
+        """
+        Open {minimum} connections
+        """
+        # make a pile for the new connections
+        servers = []
+        # while holding the lock
+        with self.lock:
+            # figure out how many connections are missing
+            missing = max(0, min(self.minimum, self.maximum) - self.counters["connections"])
+            # and reserve them
+            self.counters["connections"] += missing
+        # carefully
+        try:
+            # open the connections
+            for _ in range(missing):
+                # one at a time
+                servers.append(self.spawn())
+        # no matter what happens
+        finally:
+            # while holding the lock
+            with self.lock:
+                # release the reservations that weren't used
+                self.counters["connections"] -= missing - len(servers)
+                # get the time
+                now = time.monotonic()
+                # add the new connections to the idle pile
+                self.available.extend((server, now, False) for server in servers)
+                # and wake up anybody waiting for one
+                self.lock.notify_all()
+        # all done
+        return self
+
+
+    def detach(self):
+        """
+        Close all idle connections
+        """
+        # while holding the lock
+        with self.lock:
+            # grab the idle connections
+            servers = [ server for server, _, _ in self.available ]
+            # clear the pile
+            self.available.clear()
+            # and update the counters
+            self.counters["connections"] -= len(servers)
+            self.counters["closed"] += len(servers)
+        # close them
+        for server in servers:
+            # one at a time
+            self.discard(server=server)
+        # all done
+        return
+
+
+    def checkout(self):
+        """
+        Lease a connection
+        """
+        # get the time
+        start = time.monotonic()
+        # figure out how long i can wait
+        deadline = start + self.timeout / second
+        # get my counters
+        counters = self.counters
+        # i haven't had to wait yet
+        waited = False
+        # the connections that have been idle for too long
+        expired = []
+
+        # while holding the lock
+        with self.lock:
+            # until a connection becomes available
+            while True:
+                # collect the connections that have been idle for too long
+                expired.extend(self.prune())
+                # if there are idle connections
+                if self.available:
+                    # grab the most recently used one; this keeps the hot connections busy and
+                    # lets the rest age out
+                    server, since, suspect = self.available.pop()
+                    # and stop waiting
+                    break
+                # if there is room for another connection
+                if counters["connections"] < self.maximum:
+                    # reserve it
+                    counters["connections"] += 1
+                    # there is no connection yet
+                    server, since, suspect = None, None, False
+                    # and stop waiting
+                    break
+                # otherwise, figure out how much longer i can wait
+                remaining = deadline - time.monotonic()
+                # if i'm out of time
+                if remaining <= 0:
+                    # update the counters
+                    counters["timeouts"] += 1
+                    # and complain
+                    raise self.exceptions.PoolExhaustedError(
+                        pool=self, timeout=time.monotonic() - start)
+                # otherwise, wait
+                waited = True
+                self.lock.wait(remaining)
+
+            # get the time
+            now = time.monotonic()
+            # update the counters
+            counters["checkouts"] += 1
+            counters["leased"] += 1
+            counters["peak"] = max(counters["peak"], counters["leased"])
+            # if i had to wait
+            if waited:
+                # record it
+                counters["waits"] += 1
+                counters["waited"] += now - start
+                counters["longest"] = max(counters["longest"], now - start)
+
+        # close the expired connections, now that the lock is released; pruning frees up room
+        # for a new connection, so there are none to close when waiting times out
+        for connection in expired:
+            # one at a time
+            self.discard(server=connection)
+        # carefully
+        try:
+            # if i have to make a new connection
+            if server is None:
+                # do it
+                server = self.spawn()
+            # if the connection is suspect or has been idle for a while, and it is broken
+            elif ((suspect or now - since > self.stale / second)
+                  and not self.verify(server=server)):
+                # close it
+                self.discard(server=server)
+                # update the counters
+                with self.lock:
+                    counters["failures"] += 1
+                    counters["closed"] += 1
+                # and replace it
+                server = self.spawn()
+        # if anything goes wrong
+        except BaseException:
+            # while holding the lock
+            with self.lock:
+                # release the reservation
+                counters["connections"] -= 1
+                counters["leased"] -= 1
+                # and let somebody else try
+                self.lock.notify()
+            # and complain
+            raise
+
+        # hand the connection to the caller
+        return server
+
+
+    def checkin(self, server, suspect=False):
+        """
+        Return {server}, a connection obtained from {checkout}, to the pool; if {suspect} is
+        true, the connection is verified before it is leased again
+        """
+        # while holding the lock
+        with self.lock:
+            # update the counters
+            self.counters["leased"] -= 1
+            # add the connection to the idle pile
+            self.available.append((server, time.monotonic(), suspect))
+            # collect the connections that have been idle for too long
+            expired = self.prune()
+            # and wake up somebody waiting for a connection
+            self.lock.notify()
+        # close the expired connections, now that the lock is released
+        for connection in expired:
+            # one at a time
+            self.discard(server=connection)
+        # all done
+        return
+
+
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Lease a connection for the duration of a transaction
+
+        The transaction is managed by the context manager protocol of the connection: it is
+        committed when the block exits normally and rolled back if the block raises an
+        exception, after which the connection is verified before it is leased again
+        """
+        # get a connection
+        server = self.checkout()
+        # assume the worst
+        suspect = True
+        # carefully
+        try:
+            # start a transaction
+            with server:
+                # hand the connection to the caller
+                yield server
+            # if we get this far, the connection is fine
+            suspect = False
+        # no matter what happens
+        finally:
+            # return it to the pool
+            self.checkin(server=server, suspect=suspect)
+        # all done
+        return
+
+
+    def statistics(self):
+        """
+        Build a snapshot of my counters, along with the fraction of my {maximum} connections
+        that are leased and the average time clients waited for a connection
+        """
+        # while holding the lock
+        with self.lock:
+            # make a copy of my counters
+            statistics = dict(self.counters)
+        # add the utilization
+        statistics["utilization"] = statistics["leased"] / max(1, self.maximum)
+        # and the average wait
+        statistics["wait"] = statistics["waited"] / max(1, statistics["checkouts"])
+        # all done
+        return statistics
+
+
+    # implementation details
+    def spawn(self):
+        """
+        Make a new connection
+        """
+        # make a copy of the prototype
+        server = self.replicate(component=self.server)
+        # have it share my query result cache
+        server.results = self.results
+        # connect
+        server.attach()
+        # update the counters
+        with self.lock:
+            self.counters["created"] += 1
+        # and return the new connection
+        return server
+
+
+    def replicate(self, component):
+        """
+        Make an instance of the type of {component}, configured like it; the components bound
+        to its facilities are replicated as well, so the copy shares no state with {component}
+        """
+        # make an instance of its type
+        clone = type(component)()
+        # go through its configurable state
+        for trait in component.pyre_configurables():
+            # get the value
+            value = getattr(component, trait.name)
+            # if it is a component, e.g. the {sql} mill of a server, which stores the state of
+            # the statement under construction
+            if trait.isFacility and value is not None:
+                # make a copy of its own
+                value = self.replicate(component=value)
+            # and copy it
+            setattr(clone, trait.name, value)
+        # all done
+        return clone
+
+
+    def verify(self, server):
+        """
+        Check whether {server} is usable
+        """
+        # carefully
+        try:
+            # execute the check
+            server.execute(self.check)
+        # if anything goes wrong
+        except Exception:
+            # the connection is broken
+            return False
+        # otherwise, all is well
+        return True
+
+
+    def discard(self, server):
+        """
+        Close {server}
+        """
+        # carefully
+        try:
+            # disconnect
+            server.detach()
+        # the connection may be broken already
+        except Exception:
+            # in which case there is nothing to do
+            pass
+        # all done
+        return
+
+
+    def prune(self):
+        """
+        Remove the connections in excess of {minimum} that have been idle for too long from the
+        pile of available ones; the caller must hold the lock, and is responsible for closing
+        the connections in the list that is returned after releasing it
+        """
+        # get my idle connections
+        available = self.available
+        # and my counters
+        counters = self.counters
+        # figure out the oldest allowed timestamp
+        horizon = time.monotonic() - self.idle / second
+        # make a pile for the expired connections
+        expired = []
+        # as long as there are too many connections and the oldest idle one has expired
+        while counters["connections"] > self.minimum and available and available[0][1] < horizon:
+            # remove it from the pile
+            server, _, _ = available.pop(0)
+            # update the counters
+            counters["connections"] -= 1
+            counters["closed"] += 1
+            # and add it to the pile
+            expired.append(server)
+        # all done
+        return expired
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the lock that protects my state; clients waiting for connections wait on it
+        self.lock = threading.Condition()
+        # the idle connections, along with the time they were returned to the pool and whether
+        # they must be verified before they are leased again
+        self.available = []
+        # the query result cache shared by the connections
+        self.results = Cache()
+        # my activity counters
+        self.counters = {
+            "connections": 0, # the number of open connections, both idle and leased
+            "leased": 0, # the number of connections currently leased
+            "peak": 0, # the largest number of connections leased at the same time
+            "checkouts": 0, # the number of leases
+            "waits": 0, # the number of leases that had to wait for a connection
+            "waited": 0.0, # the total time spent waiting for connections, in seconds
+            "longest": 0.0, # the longest wait, in seconds
+            "timeouts": 0, # the number of clients that gave up waiting
+            "created": 0, # the number of connections opened
+            "closed": 0, # the number of connections closed
+            "failures": 0, # the number of connections that failed verification
+            }
+        # all done
+        return
+
+
+    # private data
+    lock = None
+    available = None
+    results = None
+    counters = None
+
+
+# end of file
@@ -7,6 +7,7 @@
 
 
 # externals
+import itertools
 import pyre
 # superclass
 from .Server import Server
@@ -22,6 +23,11 @@ class Postgres(Server, family="pyre.db.server.postgres"):
     from pyre.db.exceptions import OperationalError
 
 
+    # constants
+    placeholder = "${}" # postgres parameter markers are numbered
+    parameterLimit = 65535 # the protocol counts the parameters of a statement in 16 bits
+
+
     # public state
     database = pyre.properties.str(default="postgres")
     database.doc = "the name of the database to connect to"
@@ -88,6 +94,8 @@ class Postgres(Server, family="pyre.db.server.postgres"):
         status = self.postgres.disconnect(self.connection)
         # invalidate the member
         self.connection = None
+        # and forget the statements that were prepared on it
+        self.statements.clear()
 
         # and return the status
         return status
@@ -102,7 +110,159 @@ class Postgres(Server, family="pyre.db.server.postgres"):
         return self.postgres.execute(self.connection, "\n".join(sql))
 
 
+    # bulk loading
+    def load(self, records, batch=None):
+        """
+        Insert {records}, an iterable of table records, in batches of at most {batch} records
+        within a single transaction; returns the number of records inserted
+
+        If the client has a transaction in progress, the records are loaded as part of it and
+        left for the client to commit or roll back
+        """
+        # in a transaction, so the batches don't get committed one at a time
+        with self.atomic():
+            # chain up
+            return super().load(records=records, batch=batch)
+
+
+    def bulk(self, table, rows):
+        """
+        Insert {rows}, a list of tuples with the parameter values of the fields of {table},
+        using the {COPY} protocol
+        """
+        # build the command
+        command = "COPY {} ({}) FROM STDIN;".format(
+            table.pyre_name, ", ".join(field.name for field in table.pyre_fields))
+        # render the values
+        encode = self.encode
+        # in the default text format: one line per row, with tab separated fields
+        data = "".join("\t".join(map(encode, row)) + "\n" for row in rows)
+        # ship it
+        return self.postgres.copy(self.connection, command, data)
+
+
+    @staticmethod
+    def encode(value):
+        """
+        Render {value} in the text format of the {COPY} protocol
+        """
+        # {NULL} has its own marker
+        if value is None:
+            return "\\N"
+        # so do booleans
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        # everything else is converted to a string, with backslashes and the separators escaped
+        return (str(value)
+                .replace("\\", "\\\\")
+                .replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r"))
+
+
+    # streaming queries
+    def batches(self, query, fetch):
+        """
+        Execute {query} through a server side cursor and generate batches of at most {fetch}
+        rows from its result set
+        """
+        # render the query; {DECLARE} can't be prepared, so its values are rendered literally
+        sql = self.sql.select(query=query)
+        # generate a name for the cursor
+        cursor = "pyre_cursor_{}".format(next(self.names))
+        # cursors only live within transaction blocks; if the client hasn't started one
+        local = not self.transaction
+        # if necessary
+        if local:
+            # start one
+            self.execute(*self.sql.transaction())
+            # and remember it, so that work done while the result set is being consumed joins
+            # it instead of committing it, which would destroy the cursor
+            self.transaction = True
+        # carefully
+        try:
+            # declare the cursor
+            self.execute("DECLARE {} NO SCROLL CURSOR FOR".format(cursor), *sql)
+            # carefully
+            try:
+                # as long as there are rows
+                while True:
+                    # grab the next batch; the result set starts with the headers
+                    rows = self.execute("FETCH FORWARD {} FROM {};".format(fetch, cursor))[1:]
+                    # if there weren't any
+                    if not rows:
+                        # we are done
+                        break
+                    # otherwise, hand them over
+                    yield rows
+            # if the client abandoned the result set
+            except GeneratorExit:
+                # and the cursor outlives this generator
+                if not local:
+                    # close it
+                    self.execute("CLOSE {};".format(cursor))
+                # and move on
+                raise
+            # if all went well and the cursor outlives this generator
+            if not local:
+                # close it
+                self.execute("CLOSE {};".format(cursor))
+        # no matter what happens
+        finally:
+            # if i started the transaction
+            if local:
+                # it is over
+                self.transaction = False
+                # end it; this closes the cursor as well, and rolls back if the transaction was
+                # aborted by an error
+                self.execute(*self.sql.commit())
+                # and discard the cached results that depend on the tables it modified
+                self.settle()
+        # all done
+        return
+
+
+    # support for prepared statements
+    def prepare(self, template):
+        """
+        Prepare the statement {template} for repeated execution
+        """
+        # generate a name for the statement
+        name = "pyre_{}".format(next(self.names))
+        # ask the server to prepare it
+        self.postgres.prepare(self.connection, name, template)
+        # and return the name as the handle
+        return name
+
+
+    def invoke(self, statement, parameters):
+        """
+        Execute the prepared {statement} with the given {parameters}
+        """
+        # pass it on to the connection
+        return self.postgres.executePrepared(self.connection, statement, tuple(parameters))
+
+
+    def release(self, statement):
+        """
+        Discard the prepared {statement}
+        """
+        # ask the server to forget it
+        self.execute("DEALLOCATE {};".format(statement))
+        # all done
+        return
+
+
     # meta methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # make a source of names for my prepared statements
+        self.names = itertools.count()
+        # and a pile for the {with} blocks in progress
+        self.blocks = []
+        # all done
+        return
+
+
     def __new__(cls, **kwds):
         # if necessary
         if cls.postgres is None:
@@ -117,8 +277,17 @@ class Postgres(Server, family="pyre.db.server.postgres"):
         """
         Hook invoked when the context manager is entered
         """
-        # mark the beginning of a transaction
-        self.execute(*self.sql.transaction())
+        # blocks entered while there is a transaction in progress, e.g. one started to stream a
+        # result set, join it
+        started = not self.transaction
+        # otherwise
+        if started:
+            # mark the beginning of a transaction
+            self.execute(*self.sql.transaction())
+            # and remember it
+            self.transaction = True
+        # make a note of whether this block owns the transaction
+        self.blocks.append(started)
         # and hand me back to the caller
         return self
 
@@ -127,6 +296,13 @@ class Postgres(Server, family="pyre.db.server.postgres"):
         """
         Hook invoked when the context manager's block exits
         """
+        # if the block joined a transaction in progress
+        if not self.blocks.pop():
+            # leave it to its owner, and indicate that we want to re-raise any exceptions that
+            # occurred while executing the body of the {with} statement
+            return False
+        # otherwise, the transaction is over
+        self.transaction = False
         # if there were no errors detected
         if exc_type is None:
             # commit the transaction to the datastore
@@ -136,14 +312,16 @@ class Postgres(Server, family="pyre.db.server.postgres"):
             # roll back
             self.execute(*self.sql.rollback())
 
-        # indicate that we want to re-raise any exceptions that occurred while executing the
-        # body of the {with} statement
-        return False
+        # chain up
+        return super().__exit__(exc_type, exc_instance, exc_traceback)
 
 
     # implementation details
     postgres = None # the handle to the extension module
     connection = None # the handle to the session with the back-end
+    names = None # the source of names for prepared statements and cursors
+    transaction = False # whether there is a transaction block in progress
+    blocks = None # whether each of the {with} blocks in progress started its own transaction
 
 
     # helper routine to initialize the extension module
@@ -35,6 +35,14 @@ class Reference(Measure):
         return self.referent.sql(value=value)
 
 
+    def parameter(self, value):
+        """
+        Convert {value} into a statement parameter
+        """
+        # my referent knows
+        return self.referent.parameter(value=value)
+
+
     # markers
     def onDelete(self, action):
         """
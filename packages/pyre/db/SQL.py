@@ -34,6 +34,36 @@ class SQL(Mill, family="pyre.db.sql"):
     from .Query import Query as query
 
 
+    # parameterized statements
+    def template(self, statement, placeholder="?"):
+        """
+        Render {statement}, the output of one of my statement generators, as a template with
+        markers in place of the values of fields and the literals in expressions; returns the
+        template and the tuple of values to bind to its parameters
+
+        Each marker is built by formatting {placeholder} with the one-based index of the
+        parameter, so both the anonymous markers of sqlite, "?", and the numbered ones of
+        postgres, "${}", are supported. The special values {NULL} and {DEFAULT} are always
+        rendered literally
+        """
+        # make a pile for the values
+        parameters = []
+        # save the current settings
+        saved = self._parameters, self._placeholder
+        # install the new ones
+        self._parameters, self._placeholder = parameters, placeholder
+        # carefully
+        try:
+            # assemble the statement; its values are collected as the generator runs
+            template = "\n".join(statement)
+        # no matter what happens
+        finally:
+            # restore the settings
+            self._parameters, self._placeholder = saved
+        # all done
+        return template, tuple(parameters)
+
+
     # queries
     def select(self, query):
         """
@@ -60,12 +90,17 @@ class SQL(Mill, family="pyre.db.sql"):
         if isinstance(query, self.selector) or isinstance(query, self.query):
             # figure out how many field references there are
             fields = len(query.pyre_fields)
+            # some back ends can't deduce the types of parameters in the projection, so render
+            # its literals in place
+            parameters, self._parameters = self._parameters, None
             # build the projection
             for index, entry in enumerate(query.pyre_fields):
                 # do we need a comma?
                 comma = ',' if index+1 < fields else ''
                 # render this field
                 yield self.place("{} AS {}{}".format(self.expression(entry), entry.name, comma))
+            # restore the parameter pile
+            self._parameters = parameters
             # push out
             self.outdent()
 
@@ -353,7 +388,7 @@ class SQL(Mill, family="pyre.db.sql"):
             values = (
                 value.value
                 if value is table.default or value is table.null
-                else field.sql(value=value)
+                else self.value(field=field, value=value)
                 for field, value in zip(table.pyre_fields, record))
             # render them
             dangling = "({})".format(", ".join(values))
@@ -366,6 +401,33 @@ class SQL(Mill, family="pyre.db.sql"):
         return
 
 
+    def insertParameters(self, table):
+        """
+        Generate an INSERT statement for {table} with a parameter marker for each of its
+        fields, suitable for executing repeatedly with the values of many records
+        """
+        # initiate the statement
+        yield self.place("INSERT INTO {}".format(table.pyre_name))
+        # indent
+        self.indent(increment=2)
+        # the field names in declaration order
+        yield self.place("({})".format(", ".join(field.name for field in table.pyre_fields)))
+        # start the section with the markers
+        self.outdent()
+        yield self.place("VALUES")
+        # further in
+        self.indent()
+        # build the markers
+        markers = (
+            self._placeholder.format(index) for index in range(1, len(table.pyre_fields)+1))
+        # render them
+        yield self.place("({});".format(", ".join(markers)))
+        # bounce out to top level
+        self.outdent(decrement=2)
+        # all done
+        return
+
+
     def deleteRecords(self, table, condition):
         """
         Remove all {table} records that match {condition}
@@ -414,13 +476,16 @@ class SQL(Mill, family="pyre.db.sql"):
             # skip values set to {None}
             if value is None: continue
 
-            # handle 'NULL'
-            if value is table.null: value = 'NULL'
-            # handle 'DEFAULT'
-            elif value is table.default: value = 'DEFAULT'
             # this pair needs an update
             names.append(name)
-            values.append(field.sql(value))
+            # the special values are rendered literally
+            if value is table.null or value is table.default:
+                # as is
+                values.append(value.value)
+            # everything else
+            else:
+                # is up to the field
+                values.append(self.value(field=field, value=value))
 
         # render the names
         names = "(" + ", ".join(names) + ")"
@@ -448,6 +513,24 @@ class SQL(Mill, family="pyre.db.sql"):
         return
 
 
+    # value rendering
+    def value(self, field, value):
+        """
+        Render the {value} of {field}, either literally or as a parameter when building a
+        statement template
+        """
+        # get the pile of parameters
+        parameters = self._parameters
+        # if we are not building a template
+        if parameters is None:
+            # render the value literally
+            return field.sql(value=value)
+        # otherwise, convert the value and add it to the pile
+        parameters.append(field.parameter(value=value))
+        # and build its marker
+        return self._placeholder.format(len(parameters))
+
+
     # meta-methods
     def __init__(self, **kwds):
         # get the field definition
@@ -481,6 +564,24 @@ class SQL(Mill, family="pyre.db.sql"):
 
 
     # implementation details
+    def _literalRenderer(self, node, **kwds):
+        """
+        Render {node} as a literal, or as a parameter when building a statement template
+        """
+        # get the pile of parameters
+        parameters = self._parameters
+        # get the value
+        value = node._value
+        # if we are not building a template, or the value knows how to render itself
+        if parameters is None or hasattr(value, "sql"):
+            # render it in place
+            return super()._literalRenderer(node, **kwds)
+        # otherwise, add it to the pile
+        parameters.append(value)
+        # and build its marker
+        return self._placeholder.format(len(parameters))
+
+
     def _collationRenderer(self, order, context=None, **kwds):
         """
         Render the collation order specification
@@ -598,4 +699,9 @@ class SQL(Mill, family="pyre.db.sql"):
         return
 
 
+    # private data
+    _parameters = None # the values of the parameters of the template under construction
+    _placeholder = "?" # the marker of its parameters
+
+
 # end of file
@@ -37,8 +37,12 @@ class SQLite(Server, family="pyre.db.server.sqlite"):
         """
         # if i have an existing connection to the database, do nothing
         if self.connection is not None: return
-        # otherwise, make a connection
-        self.connection = sqlite3.connect(self.database)
+        # otherwise, make a connection; {sqlite3} compiles statements on first use and keeps
+        # them in a cache keyed by their text, so size it to match mine. connections may be
+        # handed from one thread to another by a {pool}, which makes sure they are never used
+        # by more than one thread at a time
+        self.connection = sqlite3.connect(
+            self.database, cached_statements=self.prepared, check_same_thread=False)
         # and a cursor
         self.cursor = self.connection.cursor()
         # and return
@@ -59,6 +63,8 @@ class SQLite(Server, family="pyre.db.server.sqlite"):
         # reset the connection objects
         self.cursor = None
         self.connection = None
+        # and forget the statements that were prepared on it
+        self.statements.clear()
         # all done
         return
 
@@ -74,6 +80,117 @@ class SQLite(Server, family="pyre.db.server.sqlite"):
         return self.cursor
 
 
+    # transaction support
+    @property
+    def transaction(self):
+        """
+        Check whether there is a transaction in progress on my connection; {sqlite3} starts one
+        implicitly before the first statement that modifies the database
+        """
+        # ask the connection
+        return self.connection is not None and self.connection.in_transaction
+
+
+    # bulk loading
+    def load(self, records, batch=None):
+        """
+        Insert {records}, an iterable of table records, in batches of at most {batch} records
+        within a single transaction; returns the number of records inserted
+
+        If the client has a transaction in progress, the records are loaded as part of it and
+        left for the client to commit or roll back
+        """
+        # in a transaction
+        with self.atomic():
+            # chain up
+            return super().load(records=records, batch=batch)
+
+
+    def bulk(self, table, rows):
+        """
+        Insert {rows}, a list of tuples with the parameter values of the fields of {table}
+        """
+        # hand the whole batch to my cursor
+        self.cursor.executemany(self.insertion(table=table), rows)
+        # all done
+        return
+
+
+    # streaming queries
+    def batches(self, query, fetch):
+        """
+        Execute {query} and generate lists of at most {fetch} rows from its result set
+        """
+        # build the statement template and its parameters
+        template, parameters = self.template(statement=self.sql.select(query=query))
+        # execute it on a cursor of its own, so other statements can be executed while the
+        # result set is being consumed; {sqlite3} steps through the result set as rows are
+        # fetched, so they are never all in memory at once
+        cursor = self.connection.execute(template, parameters)
+        # carefully
+        try:
+            # as long as there are rows
+            while True:
+                # grab the next batch
+                rows = cursor.fetchmany(fetch)
+                # if there weren't any
+                if not rows:
+                    # we are done
+                    break
+                # otherwise, hand them over
+                yield rows
+        # no matter what happens, even if the client abandons the result set
+        finally:
+            # close the cursor
+            cursor.close()
+        # all done
+        return
+
+
+    # support for prepared statements
+    def prepare(self, template):
+        """
+        Prepare the statement {template} for repeated execution
+        """
+        # {sqlite3} does this on its own, so the template is all i need
+        return template
+
+
+    def invoke(self, statement, parameters):
+        """
+        Execute the prepared {statement} with the given {parameters}
+        """
+        # hand the statement and its parameters to my cursor
+        self.cursor.execute(statement, parameters)
+        # return the cursor
+        return self.cursor
+
+
+    # context manager interface
+    def __enter__(self):
+        """
+        Hook invoked when the context manager is entered
+        """
+        # {sqlite3} starts transactions implicitly, before the first statement that modifies the
+        # database; start one now, unless there is one in progress already, so that work done
+        # at the top of the block can tell it is part of a transaction
+        if not self.connection.in_transaction:
+            # by asking the connection
+            self.connection.execute("BEGIN;")
+        # and hand me back to the caller
+        return self
+
+
+    def __exit__(self, exc_type, exc_instance, exc_traceback):
+        """
+        Hook invoked when the context manager's block exits
+        """
+        # let the connection commit the transaction, or roll it back if there were errors
+        self.connection.__exit__(exc_type, exc_instance, exc_traceback)
+        # and chain up
+        return super().__exit__(exc_type, exc_instance, exc_traceback)
+
+
     # implementation details
     cursor = None
     connection = None
@@ -6,10 +6,18 @@
 #
 
 
+# externals
+import contextlib
+import itertools
 # packages
 import pyre
 import pyre.weaver
 from . import datastore, sql
+# support
+from .Cache import Cache
+from .Schemer import Schemer
+# the units of time
+from pyre.units.SI import second
 
 
 # declaration
@@ -30,12 +38,29 @@ class Server(pyre.component, implements=datastore):
 
     # constants
     providesHeaders = True
+    placeholder = "?" # the marker of the parameters in statement templates
+    parameterLimit = 999 # the largest number of parameters in a statement
 
 
     # traits
     sql = pyre.weaver.language(default=sql)
     sql.doc = "the generator of the SQL statements"
 
+    prepared = pyre.properties.int(default=128)
+    prepared.doc = "the maximum number of prepared statements to keep per connection"
+
+    batch = pyre.properties.int(default=1000)
+    batch.doc = "the number of records sent to the back end at a time during bulk loads"
+
+    fetch = pyre.properties.int(default=1000)
+    fetch.doc = "the number of rows retrieved from the back end at a time by streaming queries"
+
+    cache = pyre.properties.int(default=0)
+    cache.doc = "the maximum number of query results to cache; zero disables the cache"
+
+    lifetime = pyre.properties.dimensional(default=60*second)
+    lifetime.doc = "how long cached query results remain valid"
+
 
     # required interface
     @pyre.export
@@ -64,6 +89,90 @@ class Server(pyre.component, implements=datastore):
             "class {.__name__!r} must override 'execute'".format(type(self)))
 
 
+    # support for prepared statements
+    def prepare(self, template):
+        """
+        Ask the back end to prepare the statement {template} for repeated execution; returns a
+        handle to the prepared statement
+        """
+        raise NotImplementedError(
+            "class {.__name__!r} must override 'prepare'".format(type(self)))
+
+
+    def invoke(self, statement, parameters):
+        """
+        Execute the prepared {statement} with the given {parameters}
+        """
+        raise NotImplementedError(
+            "class {.__name__!r} must override 'invoke'".format(type(self)))
+
+
+    def release(self, statement):
+        """
+        Discard the prepared {statement}
+        """
+        # nothing to do, by default
+        return
+
+
+    def run(self, template, parameters=()):
+        """
+        Execute the statement {template} with the given {parameters}
+
+        The statement is prepared the first time it is encountered on the current connection,
+        and the prepared statement is reused by subsequent invocations with the same
+        template. The cache holds at most {prepared} statements; the least recently used one
+        is released to make room for new ones
+        """
+        # get the cache
+        statements = self.statements
+        # look up the template, removing it so it can be reinserted as the most recently used
+        statement = statements.pop(template, None)
+        # if it's not there
+        if statement is None:
+            # if the cache is full
+            while statements and len(statements) >= self.prepared:
+                # release the least recently used statement
+                self.release(statement=statements.pop(next(iter(statements))))
+            # prepare the new one
+            statement = self.prepare(template=template)
+        # put it back in the cache
+        statements[template] = statement
+        # and execute it
+        return self.invoke(statement=statement, parameters=parameters)
+
+
+    def template(self, statement):
+        """
+        Render {statement}, the output of one of the statement generators of my {sql} mill,
+        as a template with my parameter {placeholder}; returns the template and its parameters
+        """
+        # delegate to the mill
+        return self.sql.template(statement=statement, placeholder=self.placeholder)
+
+
+    # transaction support
+    @contextlib.contextmanager
+    def atomic(self):
+        """
+        Execute the body of the block in a transaction, or as part of the one in progress, if
+        the client has started one already
+        """
+        # if there is a transaction in progress
+        if self.transaction:
+            # join it
+            yield self
+            # all done
+            return
+        # otherwise, start one; it is committed when the block exits normally and rolled back
+        # if the block raises an exception
+        with self:
+            # hand me to the caller
+            yield self
+        # all done
+        return
+
+
     # convenience
     def createDatabase(self, name):
         """
@@ -101,6 +210,8 @@ class Server(pyre.component, implements=datastore):
         """
         # build the sql statement
         sql = self.sql.dropTable(table)
+        # discard the cached query results that depend on the table
+        self.modified(tables={table.pyre_name})
         # and execute it
         return self.execute(*sql)
 
@@ -108,13 +219,137 @@ class Server(pyre.component, implements=datastore):
     def insert(self, *records):
         """
         Insert {records} into the database
+
+        Consecutive records that go to the same table and have {NULL} and {DEFAULT} in the same
+        fields share a template, so they are inserted by a single multi-row statement of at
+        most {batch} rows and {parameterLimit} parameters. If more than one statement is
+        necessary, they are executed atomically
         """
         # if there are no records to insert, bail
         if not records: return
-        # build the sql statements
-        sql = self.sql.insertRecords(*records)
-        # and execute
-        return self.execute(*sql)
+        # discard the cached query results that depend on the affected tables
+        self.modified(tables={record.pyre_layout.pyre_name for record in records})
+        # build the statement templates and their parameters
+        statements = [
+            self.template(statement=self.sql.insertRecords(*rows))
+            for rows in self.groups(records=records) ]
+        # if there is only one
+        if len(statements) == 1:
+            # execute it
+            return self.run(*statements[0])
+        # otherwise, in a transaction
+        with self.atomic():
+            # go through the statements
+            for template, parameters in statements:
+                # and execute each one
+                result = self.run(template=template, parameters=parameters)
+        # all done
+        return result
+
+
+    def load(self, records, batch=None):
+        """
+        Insert {records}, an iterable of table records, in batches of at most {batch} records;
+        returns the number of records inserted
+
+        The records are consumed as they are loaded, so {records} can be a generator of
+        arbitrary length: memory usage is bounded by the size of the batches. Each table
+        accumulates its own batch; whenever one of them fills up, all pending batches are
+        shipped in the order their tables were first encountered, so records that refer to
+        rows of tables that appear earlier in the stream are loaded after them
+        """
+        # normalize the batch size
+        batch = max(1, self.batch if batch is None else batch)
+        # the pending rows of each table, in the order the tables were encountered
+        pending = {}
+        # the number of records loaded so far
+        count = 0
+
+        # go through the records
+        for record in records:
+            # get the table of this record
+            table = record.pyre_layout
+            # {DEFAULT} can't be bound to a parameter
+            if any(value is table.default for value in record):
+                # so ship whatever is pending, to preserve the order of the records
+                count += self.flush(pending=pending)
+                # discard the cached query results that depend on the table
+                self.modified(tables={table.pyre_name})
+                # and insert this one on its own
+                self.run(*self.template(statement=self.sql.insertRecords(record)))
+                # update the count
+                count += 1
+                # and move on
+                continue
+            # get the batch of this table
+            rows = pending.setdefault(table, [])
+            # convert the values and add the row to it
+            rows.append(tuple(
+                None if value is table.null else field.parameter(value=value)
+                for field, value in zip(table.pyre_fields, record)))
+            # if the batch is full
+            if len(rows) >= batch:
+                # ship everything
+                count += self.flush(pending=pending)
+
+        # ship the left overs
+        count += self.flush(pending=pending)
+        # all done
+        return count
+
+
+    def flush(self, pending):
+        """
+        Ship the batches in {pending}, a map from tables to lists of rows, and clear it; returns
+        the number of rows shipped
+        """
+        # initialize the count
+        count = 0
+        # discard the cached query results that depend on the affected tables
+        self.modified(tables={table.pyre_name for table in pending})
+        # go through the batches, in order
+        for table, rows in pending.items():
+            # ship each one
+            self.bulk(table=table, rows=rows)
+            # and update the count
+            count += len(rows)
+        # start over
+        pending.clear()
+        # all done
+        return count
+
+
+    def bulk(self, table, rows):
+        """
+        Insert {rows}, a list of tuples with the parameter values of the fields of {table}
+
+        This implementation executes a prepared INSERT statement for each row; back ends with
+        more efficient ways to ingest many rows at once should override it
+        """
+        # get the statement template
+        template = self.insertion(table=table)
+        # go through the rows
+        for row in rows:
+            # and insert each one
+            self.run(template=template, parameters=row)
+        # all done
+        return
+
+
+    def insertion(self, table):
+        """
+        Build the template of the statement that inserts a row of parameters into {table}
+        """
+        # look it up
+        template = self.insertions.get(table)
+        # if this is the first time we've seen this table
+        if template is None:
+            # render it; it only depends on the table, so it gets reused by all batches
+            template, _ = self.template(statement=self.sql.insertParameters(table=table))
+            # and save it
+            self.insertions[table] = template
+        # all done
+        return template
 
 
     def update(self, *specifications):
@@ -128,10 +363,12 @@ class Server(pyre.component, implements=datastore):
         """
         # go through the {specifications}
         for template, condition in specifications:
+            # discard the cached query results that depend on the affected table
+            self.modified(tables={template.pyre_layout.pyre_name})
             # build the sql statement for this update
             sql = self.sql.updateRecords(template=template, condition=condition)
             # and execute it
-            self.execute(*sql)
+            self.run(*self.template(statement=sql))
         # all done
         return
 
@@ -142,19 +379,173 @@ class Server(pyre.component, implements=datastore):
         """
         # build the sql statements
         sql = self.sql.deleteRecords(table=table, condition=condition)
+        # discard the cached query results that depend on the table
+        self.modified(tables={table.pyre_name})
         # and execute
-        return self.execute(*sql)
+        return self.run(*self.template(statement=sql))
 
 
     def select(self, query):
         """
         Execute the given {query} and return the retrieved data
+
+        If the {cache} is enabled, the records are kept for {lifetime} and reused by identical
+        queries, until one of the tables they were computed from is modified through me, or
+        through any of the connections of the {pool} i belong to, which share my cache. Queries
+        that depend on tables modified by a transaction in progress bypass the cache, since the
+        modifications may yet be rolled back. Modifications by other clients, or by SQL
+        statements passed directly to {execute}, are not detected; use {invalidate} to discard
+        the affected results
+        """
+        # build the sql statements
+        sql = self.sql.select(query=query)
+        # render them
+        template, parameters = self.template(statement=sql)
+        # if the cache is disabled, or the query may see uncommitted modifications
+        if self.cache <= 0 or self.uncommitted(query=query):
+            # execute the statement and convert the rows as they are retrieved
+            yield from self.harvest(query=query, results=self.run(template, parameters))
+            # all done
+            return
+
+        # form the key of the results
+        key = (template, parameters)
+        # look them up
+        records = self.results.get(key=key)
+        # if they are not there
+        if records is None:
+            # get the tables the query depends on
+            tables = self.dependencies(query=query)
+            # take a snapshot of their generations, so the results are not stored if any of them
+            # is modified through another connection while the statement is executing
+            generation = self.results.generation(tables=tables)
+            # execute the statement, convert the rows and save them
+            records = self.results.put(
+                key=key,
+                results=tuple(self.harvest(query=query, results=self.run(template, parameters))),
+                tables=tables, generation=generation,
+                capacity=self.cache, lifetime=self.lifetime / second)
+        # hand the records to the caller
+        yield from records
+        # all done
+        return
+
+
+    def invalidate(self, tables=None):
+        """
+        Discard the cached query results that depend on any of {tables}, or all of them if
+        {tables} is {None}
+        """
+        # delegate to the cache
+        return self.results.invalidate(
+            tables=None if tables is None else {table.pyre_name for table in tables})
+
+
+    def statistics(self):
+        """
+        Build a snapshot of the activity of the query result cache
+        """
+        # delegate to the cache
+        return self.results.statistics()
+
+
+    def stream(self, query, fetch=None, columns=False):
+        """
+        Execute the given {query} and retrieve its results {fetch} rows at a time
+
+        Unlike {select}, which may hold the entire result set in memory, only one batch of rows
+        is kept around at any time, so memory usage stays flat regardless of the size of the
+        result set. If {columns} is false, the rows are converted into records and yielded one
+        at a time; otherwise, each batch is yielded as a tuple with the converted values of each
+        field of the {query}, in field order
+        """
+        # normalize the fetch size
+        fetch = max(1, self.fetch if fetch is None else fetch)
+        # get the record factory
+        build = query.pyre_immutable
+        # go through the batches
+        for rows in self.batches(query=query, fetch=fetch):
+            # convert the rows
+            records = ( build(data=row) for row in rows )
+            # if the client wants columns
+            if columns:
+                # transpose the batch
+                yield tuple(zip(*records))
+                # and move on
+                continue
+            # otherwise, hand the records over one at a time
+            yield from records
+        # all done
+        return
+
+
+    def batches(self, query, fetch):
+        """
+        Execute {query} and generate lists of at most {fetch} raw rows from its result set
+
+        This implementation slices the result set of {select}; back ends that can retrieve the
+        result set incrementally should override it
         """
         # build the sql statements
         sql = self.sql.select(query=query)
         # execute them
-        results = iter(self.execute(*sql))
+        results = iter(self.run(*self.template(statement=sql)))
+        # skip the headers, if the server provides them
+        if self.providesHeaders: next(results)
+        # as long as there are rows
+        while True:
+            # grab the next batch
+            rows = list(itertools.islice(results, fetch))
+            # if there weren't any
+            if not rows:
+                # we are done
+                break
+            # otherwise, hand them over
+            yield rows
+        # all done
+        return
+
+
+    # helpers
+    def groups(self, records):
+        """
+        Split {records} into runs of consecutive records that can be inserted by the same
+        multi-row statement
+        """
+        # go through the runs of records that share a table and a template
+        for (table, _), run in itertools.groupby(records, key=self.shape):
+            # make a list
+            run = list(run)
+            # figure out how many rows fit in a statement
+            size = max(1, min(self.batch, self.parameterLimit // len(table.pyre_fields)))
+            # and split it
+            for start in range(0, len(run), size):
+                # into pieces that are small enough
+                yield run[start:start+size]
+        # all done
+        return
+
 
+    @staticmethod
+    def shape(record):
+        """
+        Build a key that identifies the template of the statement that inserts {record}: its
+        table and the fields that are set to {DEFAULT} or {NULL}, which are rendered literally
+        """
+        # get the table
+        table = record.pyre_layout
+        # build the key
+        return table, tuple(
+            value.value if value is table.default or value is table.null else None
+            for value in record)
+
+
+    def harvest(self, query, results):
+        """
+        Convert the rows in {results} into {query} records
+        """
+        # get an iterator over the results
+        results = iter(results)
         # get the headers, if the server provides them; ignore them, for now, since the order
         # of the results matches exactly the field order, by construction
         if self.providesHeaders: headers = next(results)
@@ -167,7 +558,79 @@ class Server(pyre.component, implements=datastore):
         return
 
 
+    def modified(self, tables):
+        """
+        Discard the cached query results that depend on {tables}, a set of table names that are
+        being modified, and remember them until the transaction that modifies them is over
+        """
+        # discard the cached results
+        self.results.invalidate(tables=tables)
+        # and remember the tables; this happens even when there is no transaction in progress
+        # yet, since some back ends start one implicitly
+        self.touched.update(tables)
+        # all done
+        return
+
+
+    def settle(self):
+        """
+        If the transaction that modified the tables in {touched} is over, discard the cached
+        query results that depend on them and start over
+        """
+        # get the modified tables
+        touched = self.touched
+        # if there are any and the transaction is over
+        if touched and not self.transaction:
+            # discard the results that were cached while the transaction was in progress,
+            # possibly by other connections that share my cache, since the modifications have
+            # been committed or rolled back since
+            self.results.invalidate(tables=touched)
+            # and start over
+            touched.clear()
+        # all done
+        return
+
+
+    def uncommitted(self, query):
+        """
+        Check whether {query} depends on tables modified by the transaction in progress
+        """
+        # reconcile my bookkeeping with the state of the transaction
+        self.settle()
+        # get the tables modified by the transaction in progress
+        touched = self.touched
+        # and check whether the query depends on any of them
+        return bool(touched) and not touched.isdisjoint(self.dependencies(query=query))
+
+
+    def dependencies(self, query):
+        """
+        Build the set of names of the tables referenced by {query}
+        """
+        # if the query is a table specification
+        if isinstance(query, Schemer):
+            # it's the only one
+            return {query.pyre_name}
+        # otherwise, collect the tables referenced by the query
+        return {table.pyre_name for table in query.pyre_tables.values()}
+
+
     # meta methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize the cache of prepared statements
+        self.statements = {}
+        # and the cache of bulk insertion templates
+        self.insertions = {}
+        # and the cache of query results
+        self.results = Cache()
+        # and the tables modified by the current transaction
+        self.touched = set()
+        # all done
+        return
+
+
     # context manager support
     def __enter__(self):
         """
@@ -180,8 +643,19 @@ class Server(pyre.component, implements=datastore):
         """
         Hook invoked when the context manager's block exits
         """
+        # the transaction is over, so discard the cached results that depend on the tables it
+        # modified
+        self.settle()
         # re-raise any exception that occurred while executing the body of the with statement
         return False
 
 
+    # implementation details
+    transaction = False # whether there is a transaction in progress on my connection
+    statements = None # the prepared statements of the current connection, keyed by template
+    insertions = None # the templates of the bulk insertion statements, keyed by table
+    results = None # the cache of query results
+    touched = None # the names of the tables modified by the current transaction
+
+
 # end of file
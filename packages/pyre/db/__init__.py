@@ -71,6 +71,7 @@ from .DataStore import DataStore as datastore
 from .SQL import SQL as sql
 from .Server import Server as server
 from .Client import Client as client
+from .Pool import Pool as pool
 
 # supported servers
 from .Backup import Backup as backup
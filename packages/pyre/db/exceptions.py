@@ -37,6 +37,25 @@ class InterfaceError(Error):
     """
 
 
+class PoolExhaustedError(InterfaceError):
+    """
+    Exception raised when a connection pool runs out of connections
+    """
+
+    # public data
+    description = "{0.pool.pyre_name}: no connection became available within {0.timeout:.3f} s"
+
+    # meta-methods
+    def __init__(self, pool, timeout, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the error info
+        self.pool = pool
+        self.timeout = timeout
+        # all done
+        return
+
+
 class DatabaseError(Error):
     """
     Base class for exceptions raised by the database back end
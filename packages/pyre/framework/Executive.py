@@ -34,6 +34,7 @@ class Executive:
 
     # constants
     hostmapkey = "pyre.hostmap"  # the key with the nicknames of known hosts
+    catalogkey = "pyre.catalog"  # the key with the location of the persistent shelf catalog
 
     # public data
     # the managers; patched during boot
@@ -638,10 +639,58 @@ class Executive:
         # all done
         return self
 
+    def attachCatalog(self):
+        """
+        Persist the record of attempts to load shelves in the file named by {pyre.catalog}, if
+        the user has supplied one
+        """
+        # get the nameserver
+        nameserver = self.nameserver
+        # if the user has not said anything
+        if self.catalogkey not in nameserver:
+            # nothing to do
+            return self
+        # get the location of the file
+        path = nameserver[self.catalogkey]
+        # if it's not trivial
+        if path:
+            # load the catalog from it; it will be saved back there on shutdown
+            self.linker.catalog.load(path=path)
+        # all done
+        return self
+
+    def reportCatalog(self):
+        """
+        Report the statistics of the record of attempts to load shelves
+        """
+        # get the catalog
+        catalog = self.linker.catalog
+        # get the journal
+        import journal
+
+        # make a channel
+        channel = journal.debug("pyre.catalog")
+        # if it is active
+        if channel.active:
+            # report
+            channel.line(f"shelf catalog: {catalog.size} entries")
+            channel.line(f"  hits: {catalog.hits}")
+            channel.line(f"  probes: {catalog.probes}")
+            channel.line(f"  invalidations: {catalog.invalidations}")
+            channel.log(f"  persistent store: {catalog.path}")
+        # all done
+        return self
+
     def shutdown(self):
         """
         Clean up
         """
+        # if i have a linker
+        if self.linker is not None:
+            # report the activity of its catalog
+            self.reportCatalog()
+            # and save it
+            self.linker.catalog.save()
         # my error pile is probably full of circular references
         self.errors = []
         # all done
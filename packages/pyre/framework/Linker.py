@@ -25,6 +25,7 @@ class Linker:
     # public data
     codecs = None
     shelves = None
+    catalog = None
 
 
     # support for framework requests
@@ -134,6 +135,8 @@ class Linker:
 
         # the map from uris to known shelves
         self.shelves = {}
+        # the record of the outcome of attempts to load shelves
+        self.catalog = self.newCatalog()
         # setup my default codecs and initialize my scheme index
         codecs, schemes = self.indexDefaultCodecs()
         # save them
@@ -150,6 +153,16 @@ class Linker:
 
 
     # implementation details
+    def newCatalog(self, **kwds):
+        """
+        Build a record of attempts to load shelves
+        """
+        # get the factory
+        from ..config.Catalog import Catalog
+        # make one and return it
+        return Catalog(**kwds)
+
+
     def indexDefaultCodecs(self):
         """
         Initialize my codec index
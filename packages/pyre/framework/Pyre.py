@@ -46,6 +46,8 @@ class Pyre(Executive):
         events = parser.parse(argv=sys.argv[1:])
         # ask my configurator to process the configuration events
         self.configurator.processEvents(events=events, priority=self.priority.command)
+        # the command line may have asked for a persistent shelf catalog
+        self.attachCatalog()
 
         # all done
         return self
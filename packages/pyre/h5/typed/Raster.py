@@ -4,7 +4,11 @@
 # (c) 1998-2023 all rights reserved
 
 # support
+import collections
+import itertools
 import math
+import queue
+import threading
 import weakref
 
 
@@ -17,6 +21,9 @@ class Raster:
     # types
     from .Tile import Tile as tile
 
+    # the number of cells in the tiles of datasets whose storage is not chunked
+    cells = 1 << 20
+
     @property
     def rank(self):
         """
@@ -33,6 +40,19 @@ class Raster:
         # go straight to the source
         return self._dataset._pyre_id.space.shape
 
+    @property
+    def chunks(self):
+        """
+        Get the shape of my chunks, or {None} if my storage is not chunked
+        """
+        # get my dataset handle
+        hid = self._dataset._pyre_id
+        # if i'm not connected to a source, i have no chunks
+        if hid is None:
+            return None
+        # otherwise, ask it; storage that is not chunked has no chunk shape
+        return tuple(hid.chunks) or None
+
     @property
     def disktype(self):
         """
@@ -66,10 +86,11 @@ class Raster:
         return self._dataset._pyre_id.type
 
     # interface
-    def read(self, shape=None, origin=None):
+    def read(self, shape=None, origin=None, data=None):
         """
         Allocate a buffer of the given {shape} on the heap, optionally initializing it with
-        my contents from {origin}
+        my contents from {origin}; if {data} is given, it is reused instead of allocating a new
+        buffer, and it must have exactly as many cells as the {shape}
         """
         # normalize the shape
         if shape is None:
@@ -81,8 +102,10 @@ class Raster:
             origin = [0] * len(shape)
         # look up my in-memory type
         memtype = self.memtype
-        # ask it for enough memory to hold the requested data
-        data = memtype.heap(cells=math.prod(shape))
+        # if the caller didn't supply a buffer
+        if data is None:
+            # ask my type for enough memory to hold the requested data
+            data = memtype.heap(cells=math.prod(shape))
         # get my dataset handle
         hid = self._dataset._pyre_id
         # if i'm connected to a source
@@ -92,6 +115,123 @@ class Raster:
         # wrap all this up in a tile and return it
         return self.tile(data=data, type=memtype, origin=origin, shape=shape)
 
+    def tiles(self, shape=None, prefetch=2):
+        """
+        Iterate over my contents in tiles of the given {shape}
+
+        By default, the tiles follow the chunk layout of my dataset, so that each one is read
+        with a single pass over the chunks that contain it; datasets without chunked storage are
+        split along their leading axis. The tiles are read by a background thread that stays at
+        most {prefetch} tiles ahead, so that processing can overlap with reading. The buffers
+        are recycled: the buffer of a tile is reused as soon as the iteration moves past it, so
+        copy anything that must outlive the current tile.
+
+        Reading overlaps with processing only when libhdf5 is built thread safe: otherwise, the
+        reads hold on to the interpreter lock, since the library must not be entered by more
+        than one thread at a time. Either way, the file must not be accessed by other threads
+        while the iteration is in progress
+        """
+        # get my shape
+        extent = self.shape
+        # normalize the tile shape
+        if shape is None:
+            # by following my chunks
+            shape = self.chunks
+        # if i'm not chunked
+        if shape is None:
+            # the number of cells in each slice along my leading axis
+            stride = math.prod(extent[1:])
+            # split my leading axis
+            shape = (max(1, self.cells // max(1, stride)),) + tuple(extent[1:])
+        # build the tile origins
+        origins = itertools.product(
+            *(range(0, span, step) for span, step in zip(extent, shape)))
+        # and the work plan
+        plan = (
+            (origin, tuple(min(step, span - start)
+                           for start, step, span in zip(origin, shape, extent)))
+            for origin in map(list, origins))
+
+        # the tiles that are ready
+        ready = queue.Queue(maxsize=max(1, prefetch))
+        # the buffers that are available for reuse, by size; the tiles at the edges of the
+        # dataset may be smaller than the rest, so they get their own buffers
+        buffers = collections.defaultdict(list)
+        # the signal to stop reading
+        done = threading.Event()
+        # the end of the iteration
+        sentinel = object()
+
+        # the reader
+        def read():
+            # carefully
+            try:
+                # go through the plan
+                for origin, size in plan:
+                    # if the client has lost interest
+                    if done.is_set():
+                        # bail
+                        return
+                    # get the pile of buffers for tiles of this size
+                    pile = buffers[math.prod(size)]
+                    # read the tile, reusing a buffer if one is available
+                    tile = self.read(shape=size, origin=origin, data=pile.pop() if pile else None)
+                    # and queue it
+                    ready.put(tile)
+            # if anything goes wrong
+            except Exception as error:
+                # hand the error to the client
+                ready.put(error)
+            # mark the end of the iteration
+            ready.put(sentinel)
+            # all done
+            return
+
+        # make the reader thread
+        reader = threading.Thread(target=read, name="pyre.h5.raster", daemon=True)
+        # and start it
+        reader.start()
+        # carefully
+        try:
+            # the tile the client is working on
+            current = None
+            # as long as there are tiles
+            while True:
+                # get the next one
+                tile = ready.get()
+                # if the client was working on a tile
+                if current is not None:
+                    # recycle its buffer
+                    buffers[math.prod(current.shape)].append(current.data)
+                # if we have reached the end
+                if tile is sentinel:
+                    # bail
+                    break
+                # if the reader ran into trouble
+                if isinstance(tile, Exception):
+                    # complain
+                    raise tile
+                # hand the tile to the client
+                yield tile
+                # and remember it
+                current = tile
+        # when we are done, whether because the tiles are exhausted or the client lost interest
+        finally:
+            # tell the reader to stop
+            done.set()
+            # drain the queue, in case the reader is blocked
+            while reader.is_alive():
+                # by discarding the tiles
+                try:
+                    ready.get(timeout=0.1)
+                # until the reader is gone
+                except queue.Empty:
+                    pass
+            # and wait for it
+            reader.join()
+        # all done
+        return
+
     # metamethods
     def __init__(self, dataset, **kwds):
         # chain up
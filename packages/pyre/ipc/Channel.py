@@ -15,6 +15,10 @@ class Channel:
     """
 
 
+    # constants
+    iovmax = 1024 # the maximum number of buffers to hand to a single scatter/gather call
+
+
     # interface
     # channel life cycle management
     @classmethod
@@ -67,4 +71,70 @@ class Channel:
             "class {.__name__!r} must implement 'write'".format(type(self)))
 
 
+    # scatter/gather input/output; subclasses should override these with implementations that
+    # avoid the copies
+    def readinto(self, buffer):
+        """
+        Fill {buffer}, a writable object that supports the buffer protocol, with bytes from my
+        input channel; returns the number of bytes read, which is short only if the channel was
+        closed before {buffer} could be filled
+        """
+        # get a byte view of the buffer
+        view = memoryview(buffer).cast("B")
+        # get its size
+        size = len(view)
+        # reset the byte count
+        total = 0
+        # for as long as it takes
+        while total < size:
+            # pull something from the channel
+            packet = self.read(maxlen=size-total)
+            # get its length
+            got = len(packet)
+            # if we got nothing, the channel is closed; bail
+            if got == 0: break
+            # otherwise, copy it into place
+            view[total:total+got] = packet
+            # and update the total
+            total += got
+        # return the number of bytes read
+        return total
+
+
+    def writev(self, buffers):
+        """
+        Write the contents of each of the {buffers} to my output channel, in order; returns the
+        total number of bytes written
+        """
+        # go through the buffers and write them out one at a time
+        return sum(self.write(bstr=buffer) for buffer in buffers)
+
+
+    # implementation details
+    @staticmethod
+    def _views(buffers):
+        """
+        Build byte views of the {buffers}, skipping the empty ones
+        """
+        # easy enough
+        return [ view for view in (memoryview(buffer).cast("B") for buffer in buffers) if view ]
+
+
+    @staticmethod
+    def _advance(views, count):
+        """
+        Adjust the pile of byte {views} after a partial write of {count} bytes
+        """
+        # go through the views that made it out in their entirety
+        while views and count >= len(views[0]):
+            # remove them from the pile
+            count -= len(views.pop(0))
+        # if there is a partial one left
+        if count:
+            # skip the part that was written
+            views[0] = views[0][count:]
+        # all done
+        return views
+
+
 # end of file
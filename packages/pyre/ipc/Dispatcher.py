@@ -24,7 +24,8 @@ class Dispatcher(pyre.protocol, family="pyre.ipc.dispatchers"):
         """
         The suggested implementation of the {Dispatcher} protocol
         """
-        # currently, {Selector} is the only choice
+        # {Selector} works everywhere; applications that watch many channels can switch to
+        # {Poller} through their configuration
         from .Selector import Selector
         # so publish it
         return Selector
@@ -49,7 +50,14 @@ class Dispatcher(pyre.protocol, family="pyre.ipc.dispatchers"):
     def alarm(self, interval, call):
         """
         Schedule {call} to be invoked after {interval} elapses. {interval} is expected to be
-        a dimensional quantity from {pyre.units} with units of time
+        a dimensional quantity from {pyre.units} with units of time; returns a handle that can
+        be used to cancel the alarm
+        """
+
+    @pyre.provides
+    def cancel(self, alarm):
+        """
+        Retract the {alarm}, a handle that was returned by {alarm}
         """
 
     @pyre.export
@@ -25,12 +25,28 @@ class Pickler(pyre.component, family="pyre.ipc.marshalers.pickler", implements=m
     string and uses that information to pull the object representation from the input
     channel. This is necessary to simplify interacting with streams that may make only portions
     of their contents available at a time.
+
+    Objects are pickled using protocol 5, which lets objects that own large memory buffers,
+    such as {numpy} arrays, hand them to the pickler instead of copying them into the payload.
+    Buffers whose size exceeds {threshold} are kept out of the payload and shipped after it,
+    straight from the memory of the object, using a single scatter/gather write. The header
+    records the number and the sizes of these buffers, so that {recv} can allocate them ahead
+    of time and read their contents directly into place.
     """
 
 
+    # user configurable state
+    threshold = pyre.properties.int(default=64*1024)
+    threshold.doc = "the size in bytes above which buffers are shipped out of band"
+
+
     # public data
-    packing = "<L" # the struct format for encoding the payload length
+    protocol = 5 # the pickle protocol; out of band buffers require 5 or higher
+    packing = "<LL" # the struct format for encoding the payload length and the buffer count
     headerSize = struct.calcsize(packing)
+    sizePacking = "<Q" # the struct format for encoding the size of an out of band buffer
+    sizeSize = struct.calcsize(sizePacking)
+
 
     # interface
     @pyre.export
@@ -38,14 +54,17 @@ class Pickler(pyre.component, family="pyre.ipc.marshalers.pickler", implements=m
         """
         Pack and ship {item} over {channel}
         """
+        # make a pile for the out of band buffers
+        buffers = []
         # pickle the item
-        body = pickle.dumps(item)
+        body = pickle.dumps(
+            item, protocol=self.protocol, buffer_callback=self.collect(buffers=buffers))
         # build its header
-        header = struct.pack(self.packing, len(body))
-        # put it together
-        message = header + body
-        # send it off
-        return channel.write(bstr=message)
+        header = struct.pack(self.packing, len(body), len(buffers))
+        # and the table with the sizes of the out of band buffers
+        sizes = b"".join(struct.pack(self.sizePacking, buffer.nbytes) for buffer in buffers)
+        # send everything off without assembling the message
+        return channel.writev(buffers=[header, sizes, body] + buffers)
 
 
     @pyre.export
@@ -53,14 +72,68 @@ class Pickler(pyre.component, family="pyre.ipc.marshalers.pickler", implements=m
         """
         Extract and return a single item from {channel}
         """
-        # get the length
-        header = channel.read(maxlen=self.headerSize)
+        # get the header
+        header = self.fill(channel=channel, size=self.headerSize)
         # unpack it
-        length, = struct.unpack(self.packing, header)
-        # get the body
-        body = channel.read(minlen=length)
+        length, count = struct.unpack(self.packing, header)
+        # get the sizes of the out of band buffers, along with the body
+        sizes = self.fill(channel=channel, size=count*self.sizeSize + length)
+        # split off the body
+        body = memoryview(sizes)[count*self.sizeSize:]
+        # allocate the out of band buffers and fill them
+        buffers = [
+            self.fill(channel=channel, size=size)
+            for size, in struct.iter_unpack(self.sizePacking, sizes[:count*self.sizeSize])
+            ]
         # extract the object and return it
-        return pickle.loads(body)
+        return pickle.loads(body, buffers=buffers)
+
+
+    # implementation details
+    def collect(self, buffers):
+        """
+        Build a pickler callback that adds large buffers to the pile of out of band {buffers}
+        """
+        # get the threshold
+        threshold = self.threshold
+
+        # the callback
+        def collect(buffer):
+            # attempt to
+            try:
+                # get a flat byte view of the buffer
+                raw = buffer.raw()
+            # if the buffer is not contiguous
+            except BufferError:
+                # it has to be serialized in band
+                return True
+            # if it's small
+            if raw.nbytes <= threshold:
+                # it's cheaper to serialize it in band
+                return True
+            # otherwise, add it to the pile
+            buffers.append(raw)
+            # and ask the pickler to leave it out of the payload
+            return False
+
+        # all done
+        return collect
+
+
+    def fill(self, channel, size):
+        """
+        Allocate a buffer with room for {size} bytes and fill it from {channel}
+        """
+        # make the buffer
+        buffer = bytearray(size)
+        # fill it
+        got = channel.readinto(buffer=buffer)
+        # if the channel was closed before the buffer could be filled
+        if got < size:
+            # complain
+            raise EOFError(f"{channel}: expected {size} bytes, got {got}")
+        # all done
+        return buffer
 
 
 # end of file
@@ -105,6 +105,49 @@ class Pipe(Channel):
         return os.write(self.outfd, bstr)
 
 
+    def readinto(self, buffer):
+        """
+        Fill {buffer} with bytes from my input channel, without any intermediate copies
+        """
+        # get a byte view of the buffer
+        view = memoryview(buffer).cast("B")
+        # get its size
+        size = len(view)
+        # reset the byte count
+        total = 0
+        # for as long as it takes
+        while total < size:
+            # read straight into the remainder of the buffer
+            got = os.readv(self.infd, [view[total:]])
+            # if we got nothing, the channel is closed; bail
+            if got == 0: break
+            # otherwise, update the total
+            total += got
+        # return the number of bytes read
+        return total
+
+
+    def writev(self, buffers):
+        """
+        Write the contents of each of the {buffers} to my output channel using a single system
+        call, if possible
+        """
+        # build the byte views
+        views = self._views(buffers)
+        # reset the byte count
+        total = 0
+        # for as long as there is something to write
+        while views:
+            # hand the kernel as many views as it can take
+            sent = os.writev(self.outfd, views[:self.iovmax])
+            # update the total
+            total += sent
+            # and skip over what was written
+            self._advance(views, sent)
+        # return the number of bytes written
+        return total
+
+
     # meta methods
     def __init__(self, infd, outfd, **kwds):
         # chain up
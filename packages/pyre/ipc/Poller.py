@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import pyre
+import select
+import selectors
+import collections
+# my interface
+from . import dispatcher
+# my base class
+from .Scheduler import Scheduler
+
+
+# declaration
+class Poller(Scheduler, family='pyre.ipc.dispatchers.poller', implements=dispatcher):
+    """
+    An event demultiplexer implemented using the most efficient mechanism provided by the
+    {selectors} module on this platform, e.g. {epoll} on linux and {kqueue} on the BSDs.
+
+    {Poller} has the same interface as {Selector}, but it registers the descriptors of the
+    channels it watches with the kernel once, when a channel acquires its first handler, and
+    removes them when the last handler of a channel is retired. The cost of going to sleep is
+    independent of the number of idle channels, and there is no limit on the size of the
+    descriptor values it can watch.
+
+    The {selectors} module does not expose exceptional conditions on descriptors, so the
+    descriptors of channels with handlers registered through {whenException} are watched for
+    urgent data by a separate {epoll} object, whose own descriptor is watched by the selector.
+    On platforms without {epoll}, they are watched for reading instead, and checked for urgent
+    data using {poll} whenever the selector wakes up; neither has a limit on descriptor values.
+    """
+
+
+    # interface
+    @pyre.export
+    def whenReadReady(self, channel, call):
+        """
+        Add {call} to the list of routines to call when {channel} is ready to be read
+        """
+        # get the descriptor
+        fd = channel.inbound
+        # add the handler to the pile
+        self._read[fd].append(self._event(channel=channel, handler=call))
+        # and update the registration of the descriptor
+        self._register(fd)
+        # all done
+        return
+
+
+    @pyre.export
+    def whenWriteReady(self, channel, call):
+        """
+        Add {call} to the list of routines to call when {channel} is ready to be written
+        """
+        # get the descriptor
+        fd = channel.outbound
+        # add the handler to the pile
+        self._write[fd].append(self._event(channel=channel, handler=call))
+        # and update the registration of the descriptor
+        self._register(fd)
+        # all done
+        return
+
+
+    @pyre.export
+    def whenException(self, channel, call):
+        """
+        Add {call} to the list of routines to call when something exceptional has happened
+        to {channel}
+        """
+        # go through both endpoints
+        for fd in {channel.inbound, channel.outbound} - {None}:
+            # add the handler to the pile
+            self._exception[fd].append(self._event(channel=channel, handler=call))
+            # and update the registration of the descriptor
+            self._register(fd)
+        # and return
+        return
+
+
+    @pyre.export
+    def stop(self):
+        """
+        Request the poller to stop watching for further events
+        """
+        # adjust my state
+        self._watching = False
+        # and return
+        return
+
+
+    @pyre.export
+    def watch(self):
+        """
+        Enter an indefinite loop of monitoring all registered event sources and invoking the
+        registered event handlers
+        """
+        # reset my state
+        self._watching = True
+        # grab a channel
+        channel = self._debug
+        # and my selector
+        selector = self._selector
+        # until someone says otherwise
+        while self._watching:
+            # compute how long i am allowed to be asleep
+            timeout = self.poll()
+            # if my channel is active
+            if channel:
+                # show me
+                channel.line("watching:")
+                channel.line(f"    max sleep: {timeout}")
+                channel.line(f"    registered descriptors: {len(selector.get_map())}")
+                channel.log()
+
+            # check for indefinite block
+            if not selector.get_map() and timeout is None:
+                # show me
+                channel.log("** no registered handlers left; exiting")
+                # and bail
+                return
+
+            # wait for an event
+            try:
+                ready = selector.select(timeout)
+            # when a signal is delivered to a handler registered by the application, the wait
+            # is interrupted and raises {InterruptedError}, a subclass of {OSError}
+            except InterruptedError as error:
+                # show me
+                channel.line(f"signal received: errno={error.errno}: {error.strerror}")
+                channel.line(f"  more watching: {self._watching}")
+                channel.log()
+                # keep going
+                continue
+
+            # sort the active descriptors by the kind of activity
+            reads = []
+            writes = []
+            # go through them
+            for key, events in ready:
+                # if this is the monitor of urgent data
+                if key.fileobj == self._urgentfd:
+                    # skip it; its descriptors are checked below
+                    continue
+                # if the descriptor is ready for reading
+                if events & selectors.EVENT_READ:
+                    # add it to the pile
+                    reads.append(key.fileobj)
+                # if the descriptor is ready for writing
+                if events & selectors.EVENT_WRITE:
+                    # add it to the pile
+                    writes.append(key.fileobj)
+
+            # if my channel is active
+            if channel:
+                # show me
+                channel.line("activity detected:")
+                # some details
+                channel.line(f"      read clients: {len(reads)}")
+                channel.line(f"      write clients: {len(writes)}")
+                # flush
+                channel.log()
+
+            # dispatch to the handlers of file events
+            self.dispatch(index=self._exception, entities=self.exceptional())
+            self.dispatch(index=self._write, entities=writes)
+            self.dispatch(index=self._read, entities=reads)
+
+            # raise the overdue alarms
+            self.awaken()
+
+        # sign off
+        channel.log("done watching")
+        # all done
+        return
+
+
+    def dispatch(self, index, entities):
+        """
+        Invoke the handlers registered in {index} that are associated with the descriptors in
+        {entities}
+        """
+        # iterate over the active entities
+        for active in entities:
+            # get the handlers; the descriptor may have been retired by a handler that was
+            # invoked earlier in this round
+            handlers = index.get(active)
+            # if there aren't any
+            if not handlers:
+                # move on
+                continue
+            # invoke the event handlers and save the events whose handlers return {True}
+            events = list(
+                event for event in handlers
+                if event.handler(channel=event.channel)
+                )
+            # if no handlers requested to be rescheduled
+            if not events:
+                # remove the descriptor from the index
+                del index[active]
+                # and update its registration
+                self._register(active)
+            # otherwise
+            else:
+                # reschedule them
+                index[active] = events
+        # all done
+        return
+
+
+    def exceptional(self):
+        """
+        Build the sequence of the descriptors with exception handlers that are in an
+        exceptional state
+        """
+        # if there are no descriptors with exception handlers
+        if not self._urgency:
+            # nothing to do
+            return []
+        # otherwise, check their state without blocking; the kernel always reports errors and
+        # hangups, so pick the descriptors with urgent data
+        return [ fd for fd, events in self._urgent.poll(0) if events & self._priority ]
+
+
+    # meta methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+
+        # my file descriptor event indices
+        self._read = collections.defaultdict(list)
+        self._write = collections.defaultdict(list)
+        self._exception = collections.defaultdict(list)
+        # the kernel event notification mechanism
+        self._selector = selectors.DefaultSelector()
+        # the monitor of urgent data on the descriptors with exception handlers; if possible,
+        # an {epoll} object, which is itself a descriptor that becomes ready for reading when
+        # any of the descriptors it watches has urgent data
+        if hasattr(select, "epoll"):
+            # make one
+            self._urgent = select.epoll()
+            # get its descriptor, so the selector can watch it
+            self._urgentfd = self._urgent.fileno()
+            # and the event that marks urgent data
+            self._priority = select.EPOLLPRI
+        # otherwise
+        else:
+            # use a {poll} object, which is checked every time the selector wakes up
+            self._urgent = select.poll()
+            # and the event that marks urgent data
+            self._priority = select.POLLPRI
+        # the descriptors watched for urgent data
+        self._urgency = set()
+
+        # my debug aspect
+        import journal
+        self._debug = journal.debug('pyre.ipc.poller')
+
+        # all done
+        return
+
+
+    # implementation details
+    def _register(self, fd):
+        """
+        Adjust the kernel registration of {fd} to match the handlers that are interested in it
+        """
+        # get my selector
+        selector = self._selector
+        # update the watch for urgent data
+        exceptional = self._watchUrgent(fd)
+        # compute the events of interest; without an {epoll} object to wake me up, descriptors
+        # with exception handlers are watched for reading
+        events = (
+            (selectors.EVENT_READ
+             if self._read.get(fd) or (exceptional and self._urgentfd is None) else 0) |
+            (selectors.EVENT_WRITE if self._write.get(fd) else 0)
+            )
+        # attempt to
+        try:
+            # get the current registration
+            key = selector.get_key(fd)
+        # if there isn't one
+        except KeyError:
+            # and there is interest in this descriptor
+            if events:
+                # register it
+                selector.register(fd, events)
+            # all done
+            return
+        # if nobody is interested any more
+        if not events:
+            # remove it
+            selector.unregister(fd)
+        # otherwise, if the events of interest have changed
+        elif events != key.events:
+            # adjust them
+            selector.modify(fd, events)
+        # all done
+        return
+
+
+    def _watchUrgent(self, fd):
+        """
+        Adjust the watch for urgent data on {fd} to match its exception handlers; returns whether
+        {fd} is being watched
+        """
+        # get the descriptors being watched
+        urgency = self._urgency
+        # check whether {fd} has exception handlers
+        exceptional = bool(self._exception.get(fd))
+        # if it has and it's not being watched
+        if exceptional and fd not in urgency:
+            # start watching it
+            self._urgent.register(fd, self._priority)
+            urgency.add(fd)
+        # if it hasn't any more but it's being watched
+        elif not exceptional and fd in urgency:
+            # stop watching it
+            self._urgent.unregister(fd)
+            urgency.discard(fd)
+        # otherwise, there is nothing to do
+        else:
+            # so bail
+            return exceptional
+        # if the monitor of urgent data has a descriptor
+        if self._urgentfd is not None:
+            # the selector watches it as long as the monitor has descriptors to watch
+            if urgency and len(urgency) == 1 and exceptional:
+                # so register it
+                self._selector.register(self._urgentfd, selectors.EVENT_READ)
+            elif not urgency:
+                # or remove it
+                self._selector.unregister(self._urgentfd)
+        # all done
+        return exceptional
+
+
+    # private types
+    class _event:
+        """Encapsulate a channel and the associated call-back"""
+
+        def __init__(self, channel, handler):
+            self.channel = channel
+            self.handler = handler
+            return
+
+        __slots__ = ('channel', 'handler')
+
+    # private data
+    _watching = True # controls whether to continue monitoring the event sources
+    _urgentfd = None # the descriptor of the monitor of urgent data, if it has one
+
+
+# end of file
@@ -8,7 +8,8 @@
 
 # externals
 import pyre
-import operator
+import heapq
+import itertools
 from time import time as now
 
 
@@ -23,8 +24,11 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
 
     The current implementation converts the time interval before the alarm comes due into an
     absolute time, and pairs it with the handler into an {_alarm} instance. The {_alarm} is
-    then stored into a list of such {_alarms}, and the list is sorted in reverse order,
-    i.e. with the alarm that is due next at the end of the list.
+    then stored in {_alarms}, a heap of (time, sequence, alarm) triplets, so that scheduling an
+    alarm and retrieving the one that is due next take logarithmic time. {alarm} returns the {_alarm}
+    instance as a handle that clients can pass to {cancel} to retract it. Cancelled alarms are
+    left in place and discarded when they reach the top of the heap, unless they start to
+    dominate it.
     """
 
 
@@ -41,14 +45,67 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         parameters:
            {call}: a function that takes the current time and returns a reschedule interval
            {interval}: a dimensional quantity from {pyre.units} with units of time
+
+        The return value is a handle that can be used to {cancel} the alarm
         """
         # create a new alarm instance
         alarm = self._alarm(time=now()+interval/self.second, handler=call)
-        # add it to my list
-        self._alarms.append(alarm)
-        # sort
-        self._alarms.sort(key=operator.attrgetter('time'), reverse=True)
-        # and return
+        # and schedule it
+        self.schedule(alarm=alarm)
+        # return it
+        return alarm
+
+
+    @pyre.export
+    def cancel(self, alarm):
+        """
+        Retract the {alarm}, a handle that was returned by {alarm}; this includes alarms whose
+        handler is in progress, which then don't get rescheduled
+        """
+        # if the alarm has been cancelled already
+        if alarm.handler is None:
+            # nothing to do
+            return
+        # otherwise, disarm it
+        alarm.handler = None
+        # if it's not in the heap
+        if not alarm.pending:
+            # we are done
+            return
+        # otherwise, add it to the pile of cancelled alarms still in the heap
+        cancelled = self._cancelled
+        cancelled.add(alarm)
+        # get my alarms
+        alarms = self._alarms
+        # if the cancelled ones have started to dominate the heap
+        if 2 * len(cancelled) > len(alarms):
+            # purge them in place, so that the heap retains its identity
+            alarms[:] = [ entry for entry in alarms if entry[-1].handler is not None ]
+            # restore the heap order
+            heapq.heapify(alarms)
+            # go through the ones we removed
+            for entry in cancelled:
+                # and mark them
+                entry.pending = False
+            # reset the pile
+            cancelled.clear()
+        # all done
+        return
+
+
+    def schedule(self, alarm):
+        """
+        Add {alarm} to the heap of pending alarms
+        """
+        # stamp the alarm, so that alarms due at the same time are raised in the order they
+        # were scheduled
+        alarm.sequence = next(self._sequence)
+        # mark it
+        alarm.pending = True
+        # and add it to the heap; the sequence number is unique, so the comparison never
+        # reaches the alarm itself
+        heapq.heappush(self._alarms, (alarm.time, alarm.sequence, alarm))
+        # all done
         return
 
 
@@ -60,21 +117,19 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         returns 0. This slightly strange logic is designed to satisfy the requirements for
         calling {select}.
         """
-        # the necessary information is in the last entry in my {_alarms}, since they are
-        # always in descending order
-        try:
-            # try to grab it
-            alarm = self._alarms[-1]
-        # if there is nothing there
-        except IndexError:
+        # get my alarms
+        alarms = self._alarms
+        # discard any cancelled alarms at the top of the heap
+        while alarms and alarms[0][-1].handler is None:
+            # by removing them
+            self._discard()
+        # if there is nothing left
+        if not alarms:
             # we have no scheduled alarms
             return None
-        # if it succeeded
-        else:
-            # get the scheduled time
-            due = alarm.time
-        # return the number of seconds until it comes due, bound from below
-        return max(0, due - now())
+        # the alarm at the top of the heap is the one that is due next; return the number of
+        # seconds until it comes due, bound from below
+        return max(0, alarms[0][0] - now())
 
 
     def awaken(self):
@@ -88,28 +143,21 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         # get the time
         time = now()
 
-        # iterate through my alarms
-        while 1:
-            # attempt
-            try:
-                # to grab one
-                alarm = alarms.pop()
-            # if none are left
-            except IndexError:
-                # we are all done raising alarms
-                break
-            # if this alarm is not due yet
-            if time < alarm.time:
-                # put it back at the end of the list
-                alarms.append(alarm)
-                # no need to look any further
-                break
-            # otherwise, this alarm is overdue; invoke the handler
+        # as long as there are overdue alarms
+        while alarms and alarms[0][0] <= time:
+            # grab the one that is due next
+            alarm = self._discard()
+            # if it has been cancelled
+            if alarm.handler is None:
+                # move on
+                continue
+            # otherwise, invoke the handler
             delta = alarm.handler(timestamp=time)
-            # if the handler indicated that it wants to reschedule this alarm
-            if delta:
+            # if the handler indicated that it wants to reschedule this alarm, and it didn't
+            # cancel it in the process
+            if delta and alarm.handler is not None:
                 # save it
-                reschedule.append((delta, alarm.handler))
+                reschedule.append((delta, alarm))
 
         # if there is nothing to reschedule
         if not reschedule:
@@ -119,13 +167,12 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         # otherwise, get a fresh timestamp
         time = now()
         # go through the pile
-        for interval, call in reschedule:
-            # create a new alarm instance
-            alarm = self._alarm(time=time+interval/self.second, handler=call)
-            # add it to my list
-            self._alarms.append(alarm)
-        # sort
-        self._alarms.sort(key=operator.attrgetter('time'), reverse=True)
+        for interval, alarm in reschedule:
+            # update the due time of the alarm; reusing the alarm instance keeps the handle the
+            # client may be holding valid
+            alarm.time = time + interval/self.second
+            # and put it back in the heap
+            self.schedule(alarm=alarm)
 
         # all done
         return
@@ -135,14 +182,34 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
     def __init__(self, **kwds):
         # chain up
         super().__init__(**kwds)
-        # the list of alarms; kept sorted in descending order by alarm time, i.e. with the next
-        # alarm to go off at the end of the list
+        # the heap of alarms, with the next alarm to go off at the top
         self._alarms = []
+        # the cancelled alarms that are still in the heap; {_cancelled} is a container rather
+        # than a counter so that maintaining it doesn't involve the trait machinery
+        self._cancelled = set()
+        # the source of alarm sequence numbers
+        self._sequence = itertools.count()
         # all done
         return
 
 
     # implementation details
+    def _discard(self):
+        """
+        Remove the alarm at the top of the heap and return it
+        """
+        # remove the alarm
+        _, _, alarm = heapq.heappop(self._alarms)
+        # mark it
+        alarm.pending = False
+        # if it was cancelled
+        if alarm.handler is None:
+            # remove it from the pile
+            self._cancelled.discard(alarm)
+        # and return it
+        return alarm
+
+
     # private types
     class _alarm:
         """Encapsulate the time and event handler of an alarm"""
@@ -150,11 +217,13 @@ class Scheduler(pyre.component, family='pyre.ipc.dispatchers.scheduler'):
         def __init__(self, time, handler):
             self.time = time
             self.handler = handler
+            self.sequence = 0
+            self.pending = False
             return
 
         def __str__(self): return "alarm: {.time}".format(self)
 
-        __slots__ = ('time', 'handler')
+        __slots__ = ('time', 'handler', 'sequence', 'pending')
 
 
     # private data
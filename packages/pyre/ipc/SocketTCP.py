@@ -70,6 +70,55 @@ class SocketTCP(Socket):
         return len(bstr)
 
 
+    def readinto(self, buffer):
+        """
+        Fill {buffer} with bytes from my input channel, without any intermediate copies
+        """
+        # get a byte view of the buffer
+        view = memoryview(buffer).cast("B")
+        # get its size
+        size = len(view)
+        # reset the byte count
+        total = 0
+        # for as long as it takes
+        while total < size:
+            # carefully
+            try:
+                # receive straight into the remainder of the buffer
+                got = self.recv_into(view[total:])
+            # if the peer closed the connection
+            except ConnectionResetError:
+                # bail
+                break
+            # if we got nothing, the channel is closed; bail
+            if got == 0: break
+            # otherwise, update the total
+            total += got
+        # return the number of bytes read
+        return total
+
+
+    def writev(self, buffers):
+        """
+        Write the contents of each of the {buffers} to my output channel using a single system
+        call, if possible
+        """
+        # build the byte views
+        views = self._views(buffers)
+        # reset the byte count
+        total = 0
+        # for as long as there is something to write
+        while views:
+            # hand the kernel as many views as it can take
+            sent = self.sendmsg(views[:self.iovmax])
+            # update the total
+            total += sent
+            # and skip over what was written
+            self._advance(views, sent)
+        # return the number of bytes written
+        return total
+
+
     # meta-methods
     def __str__(self):
         return "tcp socket to {.peer}".format(self)
@@ -98,6 +98,17 @@ def selector():
     # and return it
     return selector
 
+@foundry
+def poller():
+    """
+    A scheduler that uses the most efficient event notification mechanism of the platform to
+    listen to file objects
+    """
+    # grab the component class record
+    from .Poller import Poller as poller
+    # and return it
+    return poller
+
 
 # my component factories; use to build an actual instance
 def newPickler(**kwds):
@@ -127,5 +138,15 @@ def newSelector(**kwds):
     # and return it
     return selector(**kwds)
 
+def newPoller(**kwds):
+    """
+    A scheduler that uses the most efficient event notification mechanism of the platform to
+    listen to file objects
+    """
+    # grab the component class record
+    from .Poller import Poller as poller
+    # and return it
+    return poller(**kwds)
+
 
 # end of file
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# support
+import pyre
+# my protocol
+from .Workplan import Workplan
+
+
+# declaration
+class Bag(pyre.component, family='pyre.nexus.workplans.bag', implements=Workplan):
+    """
+    A workplan that hands out its tasks in no particular order, and never lets idle crew
+    members take over the work of their busier peers
+    """
+
+
+    # interface
+    @pyre.export
+    def add(self, task):
+        """
+        Add {task} to the pile
+        """
+        # easy enough
+        self.tasks.add(task)
+        # all done
+        return self
+
+
+    @pyre.export
+    def update(self, tasks):
+        """
+        Add all the {tasks} to the pile
+        """
+        # easy enough
+        self.tasks.update(tasks)
+        # all done
+        return self
+
+
+    @pyre.export
+    def pop(self):
+        """
+        Remove and return one of my tasks
+        """
+        # any one will do
+        return self.tasks.pop()
+
+
+    @pyre.export
+    def steal(self, crews):
+        """
+        Select the member among {crews} whose queued tasks should be handed to an idle crew
+        member
+        """
+        # i don't rebalance
+        return None
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the pile of tasks
+        self.tasks = set()
+        # all done
+        return
+
+
+    def __len__(self):
+        # easy enough
+        return len(self.tasks)
+
+
+    def __iter__(self):
+        # easy enough
+        return iter(self.tasks)
+
+
+# end of file
@@ -7,7 +7,11 @@
 
 
 # externals
+import select
+import resource
 import functools
+import itertools
+import collections
 # my base class
 from .Peer import Peer
 
@@ -27,9 +31,14 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
     pair of crew instances are responsible only for the babysitting of the task execution.
 
     The team side crew member acts as a proxy for the worker side. The host application
-    schedules the execution of a {task} by invoking the team side interface. The crew instance
-    serializes the task and sends it off to its remote twin for execution, monitors progress,
-    and reports the task result back to the host application.
+    schedules the execution of a batch of {tasks} by invoking the team side interface. The crew
+    instance serializes the batch and sends it off to its remote twin for execution, monitors
+    progress, and reports the task results back to the host application. The team may send
+    more batches before the results of the earlier ones have come back; the worker side
+    executes them in order, and responds to each one with its sequence number and a batch of
+    reports. The team may also ask for a batch back, by sending its sequence number, so that it
+    can be handed to an idle crew member; if the worker side hasn't started on the batch yet,
+    it responds right away with an empty batch of reports.
     """
 
     # types
@@ -38,6 +47,25 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
     from .TaskStatus import TaskStatus as taskcodes
 
 
+    # public data
+    @property
+    def tasks(self):
+        """
+        The number of tasks executed by my twin
+        """
+        # get it from my table
+        return self.usage["tasks"]
+
+
+    @property
+    def rss(self):
+        """
+        The memory footprint of my twin, as reported by {getrusage}
+        """
+        # get it from my table
+        return self.usage["rss"]
+
+
     # interface - team side
     def join(self, team):
         """
@@ -55,6 +83,19 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         return self
 
 
+    def recall(self, team):
+        """
+        Rejoin a team after a period on standby
+
+        This is invoked by recruiters that keep crew members around after they are dismissed,
+        when they reassign them to a team
+        """
+        # ask my twin to report in
+        self.post(item=self.crewcodes.healthy)
+        # and join the team when it does
+        return self.join(team=team)
+
+
     def activate(self, channel, team):
         """
         My worker twin is reporting ready to work
@@ -63,9 +104,19 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         """
         # check it's me we are talking about
         assert channel is self.channel
-        # get the status of my twin
-        status = self.marshaler.recv(channel=channel)
-        # and if all is good
+        # attempt to
+        try:
+            # get the status of my twin
+            status = self.marshaler.recv(channel=channel)
+        # if my twin is gone
+        except EOFError:
+            # mark me
+            self.status = self.crewcodes.damaged
+            # and let the team know i'm not coming
+            team.dismiss(crew=self)
+            # do not reschedule this handler
+            return False
+        # if all is good
         if status is self.crewcodes.healthy:
             # let the team know
             team.activate(crew=self)
@@ -75,50 +126,123 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         return False
 
 
-    def execute(self, team, task):
+    def execute(self, team, tasks):
         """
-        Send my twin the {task} to be executed
+        Send my twin the batch of {tasks} to be executed
         """
-        # send the task
-        self.marshaler.send(channel=self.channel, item=task)
-        # schedule the harvesting of the result
-        self.dispatcher.whenReadReady(
-            channel = self.channel,
-            call = functools.partial(self.assess, team=team, task=task))
+        # send the batch
+        self.post(item=tasks)
+        # add it to the pile of batches in flight, indexed by its sequence number
+        self.pending[next(self.sequence)] = tasks
+        # if it's the only one
+        if len(self.pending) == 1:
+            # schedule the harvesting of the results
+            self.dispatcher.whenReadReady(
+                channel = self.channel,
+                call = functools.partial(self.assess, team=team))
         # all done
         return self
 
 
-    def assess(self, channel, team, task, **kwds):
+    def backlog(self):
         """
-        Harvest the task completion status
+        Build a sequence of the batches in flight that are eligible for rebalancing, as pairs of
+        batch sequence numbers and tasks
         """
-        # grab the report
-        memberstatus, taskstatus, result = self.marshaler.recv(channel=channel)
-        # show me on the debug channel
-        self.debug.log(f"{self.pid}: {memberstatus}, {taskstatus}, {result}")
-
-        # first, let's figure out what to do with the task; if it failed due to some temporary
-        # condition
-        if taskstatus is self.taskcodes.failed:
-            # tell me
-            self.reportRecoverableError(team=team, task=task, error=result)
-            # put the task back in the workplan
-            team.workplan.add(task)
+        # my twin is presumably working on the oldest batch, so skip it, along with the ones that
+        # have been revoked already
+        return [
+            (seqno, tasks) for seqno, tasks in itertools.islice(self.pending.items(), 1, None)
+            if seqno not in self.revoked
+            ]
 
-        # now, let's figure out what to do with me; if i'm healthy
-        if memberstatus is self.crewcodes.healthy:
-            # put me back in the work queue
-            team.schedule(crew=self)
-        # otherwise
-        else:
-            # tell me
-            self.reportUnrecoverableError(team=team, task=task, error=result)
-            # dismiss me
-            team.dismiss(crew=self)
 
+    def revoke(self, seqno):
+        """
+        Ask my twin to give back the batch with the given sequence number
+        """
+        # send the request; if my twin gets it before it starts on the batch, it will send back
+        # an empty report right away and the team will put the tasks back in the workplan
+        self.post(item=seqno)
+        # remember
+        self.revoked.add(seqno)
         # all done
-        return False
+        return self
+
+
+    def assess(self, channel, team, **kwds):
+        """
+        Harvest the completion status of a batch of tasks in flight
+        """
+        # attempt to
+        try:
+            # grab the sequence number of the batch, the reports, and the memory footprint of my
+            # twin
+            seqno, reports, rss = self.marshaler.recv(channel=channel)
+        # if my twin is gone
+        except EOFError:
+            # mark me
+            self.status = self.crewcodes.damaged
+            # and treat the oldest batch as if my twin had given it back without attempting any
+            # of its tasks; the rest are handled below, along with all other forms of damage
+            seqno, reports, rss = next(iter(self.pending)), [], self.rss
+            # make sure it doesn't look like the response to a revocation
+            self.revoked.discard(seqno)
+        # update my statistics
+        usage = self.usage
+        usage["tasks"] += len(reports)
+        usage["rss"] = rss
+        # get the matching batch
+        tasks = self.pending.pop(seqno)
+        # check whether it was given back
+        revoked = not reports and seqno in self.revoked
+        # either way, it's no longer eligible for rebalancing
+        self.revoked.discard(seqno)
+        # the tasks that have to go back in the workplan are the ones that weren't attempted,
+        # either because the batch was revoked or because one of its tasks damaged my twin
+        requeue = tasks[len(reports):]
+
+        # go through the reports
+        for task, (memberstatus, taskstatus, result) in zip(tasks, reports):
+            # show me on the debug channel
+            self.debug.log(f"{self.pid}: {memberstatus}, {taskstatus}, {result}")
+
+            # first, let's figure out what to do with the task; if it failed due to some
+            # temporary condition
+            if taskstatus is self.taskcodes.failed:
+                # tell me
+                self.reportRecoverableError(team=team, task=task, error=result)
+                # put the task back in the workplan
+                requeue.append(task)
+
+            # now, let's figure out what to do with me; if i'm not healthy
+            if memberstatus is not self.crewcodes.healthy:
+                # tell me
+                self.reportUnrecoverableError(team=team, task=task, error=result)
+                # and mark me
+                self.status = memberstatus
+
+        # if i'm damaged
+        if self.status is not self.crewcodes.healthy:
+            # my twin won't look at any of the batches still in flight; put them all back in
+            # the workplan
+            for batch in self.pending.values():
+                requeue.extend(batch)
+            # and clear the piles
+            self.pending.clear()
+            self.revoked.clear()
+
+        # return the tasks to the workplan
+        team.requeue(tasks=requeue)
+        # give the team a chance to find work for its idle members
+        team.rebalance()
+        # if the batch was given back, i'm still busy with the ones that were sent before it and
+        # the team doesn't need to hear from me; otherwise
+        if not revoked:
+            # put me back in the work queue; if i'm damaged, the team will dismiss me
+            team.schedule(crew=self)
+        # keep harvesting as long as there are batches in flight
+        return bool(self.pending)
 
 
     def dismissed(self):
@@ -126,7 +250,7 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         My team manager has dismissed me
         """
         # send the end-of-tasks marker
-        self.marshaler.send(channel=self.channel, item=None)
+        self.post(item=None)
         # clean up
         self.resign()
         # leave a note
@@ -182,20 +306,110 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
 
     def perform(self, channel, **kwds):
         """
-        A notification has arrived that indicates there is a task waiting to be executed
+        A notification has arrived that indicates there are messages from my team waiting
         """
-        # extract the task from the channel
-        task = self.marshaler.recv(channel=channel)
-        # leave a note
-        self.debug.log(f"{self.pid}: got {task}")
-        # if it's a quit marker
-        if task is None:
-            # we are all done
+        # get my inbox
+        inbox = self.inbox
+        # if it's empty, there is no pending request to work on it
+        idle = not inbox
+        # pull all the available messages off the channel, so that revocations get a chance to
+        # catch up with the batches they refer to
+        while True:
+            # attempt to
+            try:
+                # extract a message from the channel
+                message = self.marshaler.recv(channel=channel)
+            # if the team has gone away
+            except EOFError:
+                # mark me; my recruiter may want to find out why i stopped
+                self.status = self.crewcodes.damaged
+                # and treat it as a quit marker
+                message = None
+            # leave a note
+            self.debug.log(f"{self.pid}: got {message}")
+            # if it's a quit marker
+            if message is None:
+                # we are all done
+                self.stop()
+                # don't reschedule this handler
+                return False
+            # if it's a request from a team that wants to put me back to work
+            if isinstance(message, self.crewcodes):
+                # report in
+                self.marshaler.send(channel=channel, item=self.crewcodes.healthy)
+            # if it's the sequence number of a batch my team wants back
+            elif isinstance(message, int):
+                # go through the batches i haven't started on
+                for batch in inbox:
+                    # if this is the one
+                    if batch[0] == message:
+                        # remove it from my inbox
+                        inbox.remove(batch)
+                        # and give it back without attempting any of its tasks
+                        self.report(channel=channel, seqno=message, reports=[])
+                        # all done
+                        break
+            # otherwise, it's a batch of tasks
+            else:
+                # add it to the inbox, along with its sequence number
+                inbox.append((next(self.sequence), message))
+            # if there are no more messages waiting
+            if not select.select([channel.inbound], [], [], 0)[0]:
+                # stop reading
+                break
+
+        # if my inbox was empty and there is work to do now
+        if idle and inbox:
+            # schedule the execution of the batches when i can report back
+            self.dispatcher.whenWriteReady(channel=channel, call=self.work)
+        # and go back to waiting for more
+        return True
+
+
+    def work(self, channel, **kwds):
+        """
+        Execute the tasks in the oldest batch in my inbox and send the reports to my team
+        """
+        # if my team took back all my work
+        if not self.inbox:
+            # there is nothing to do
+            return False
+        # otherwise, get the oldest batch
+        seqno, tasks = self.inbox[0]
+        # make a pile for the reports
+        reports = []
+        # i start out healthy
+        crewstatus = self.crewcodes.healthy
+        # go through the tasks
+        for task in tasks:
+            # execute each one
+            crewstatus, taskstatus, result = self.attempt(task=task, **kwds)
+            # save the report
+            reports.append((crewstatus, taskstatus, result))
+            # if the task damaged me
+            if crewstatus is not self.crewcodes.healthy:
+                # don't attempt any more
+                break
+        # done with this batch
+        self.inbox.popleft()
+        # send the reports
+        self.report(channel=channel, seqno=seqno, reports=reports)
+
+        # if i'm damaged, or my team is gone
+        if crewstatus is not self.crewcodes.healthy or self.status is not self.crewcodes.healthy:
+            # stop accepting work
             self.stop()
-            # don't reschedule this handler
+            # and don't reschedule
             return False
+        # otherwise, keep going as long as there is more work to do
+        return bool(self.inbox)
 
-        # otherwise, try to
+
+    def attempt(self, task, **kwds):
+        """
+        Execute {task} and build the report of its completion status
+        """
+        # try to
         try:
             # execute the task and collect its result
             result = self.engage(task=task, **kwds)
@@ -222,16 +436,8 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
             # and a clean bill of health for me
             crewstatus = self.crewcodes.healthy
 
-        # schedule the reporting of the execution of this task
-        self.dispatcher.whenWriteReady(
-            channel = channel,
-            call = functools.partial(self.report,
-                                     result = result,
-                                     crewstatus = crewstatus,
-                                     taskstatus = taskstatus))
-
-        # and go back to waiting for more
-        return True
+        # all done
+        return crewstatus, taskstatus, result
 
 
     def engage(self, task, **kwds):
@@ -242,18 +448,44 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         return task(**kwds)
 
 
-    def report(self, channel, crewstatus, taskstatus, result, **kwds):
+    def report(self, channel, seqno, reports, **kwds):
         """
-        Post the task completion {report}
+        Post the task completion {reports} of the batch with the given sequence number
         """
-        # make a report
-        report = (crewstatus, taskstatus, result)
         # tell me
-        self.debug.log(f"{self.pid}: sending report {report}")
-        # serialize and send
-        self.marshaler.send(channel=channel, item=report)
-        # all done; don't reschedule
-        return False
+        self.debug.log(f"{self.pid}: sending report {seqno}: {reports}")
+        # measure my memory footprint; the units are platform dependent, as documented by
+        # {getrusage}
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # attempt to
+        try:
+            # serialize and send
+            self.marshaler.send(channel=channel, item=(seqno, reports, rss))
+        # if my team is gone
+        except OSError:
+            # mark me
+            self.status = self.crewcodes.damaged
+            # and stop processing events
+            self.stop()
+        # all done
+        return
+
+
+    def post(self, item):
+        """
+        Send {item} to my twin
+        """
+        # attempt to
+        try:
+            # serialize and send
+            self.marshaler.send(channel=self.channel, item=item)
+        # if my twin is gone
+        except OSError:
+            # there is no point in complaining here; {assess} finds out as soon as it tries to
+            # hear back, and {dismissed} doesn't care
+            pass
+        # all done
+        return
 
 
     def resign(self):
@@ -273,6 +505,20 @@ class Crew(Peer, family="pyre.nexus.peers.crew"):
         self.pid = pid
         # save the communication channel to my twin
         self.channel = channel
+        # my health
+        self.status = self.crewcodes.healthy
+        # on the team side, the number of tasks executed by my twin, and its memory footprint;
+        # kept in a table since they are updated with every report
+        self.usage = {"tasks": 0, "rss": 0}
+        # the source of batch sequence numbers; both sides count the batches, so they can refer
+        # to them by number
+        self.sequence = itertools.count()
+        # on the team side, the batches of tasks in flight, in the order they were sent
+        self.pending = {}
+        # and the sequence numbers of the ones that were revoked
+        self.revoked = set()
+        # on the worker side, the batches of tasks waiting to be executed
+        self.inbox = collections.deque()
         # all done
         return
 
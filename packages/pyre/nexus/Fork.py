@@ -76,10 +76,21 @@ class Fork(pyre.component, family='pyre.nexus.recruiters.fork', implements=Recru
         """
         The {team} manager has dismissed the given {member}
         """
+        # notify the crew member
+        crew.dismissed()
         # harvest the status
         status = os.waitpid(crew.pid, 0)
         # all done
         return
 
 
+    @pyre.provides
+    def exhausted(self, team, crew, **kwds):
+        """
+        Decide whether the {crew} member has done enough work and should be replaced
+        """
+        # my crew members work until there is nothing left to do
+        return False
+
+
 # end of file
@@ -16,12 +16,23 @@ from .Peer import Peer
 from .Team import Team
 # my user configurable state
 from .Recruiter import Recruiter
+from .Workplan import Workplan
 
 
 # declaration
 class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
     """
     A process collective that coöperate to carry out a work plan
+
+    Tasks are shipped to crew members in batches of up to {batch} tasks per message, and each
+    crew member may have up to {prefetch} batches in flight, so that it can start working on
+    the next batch while the results of the previous one are making their way back. The
+    defaults send one task at a time and wait for its result before sending the next one;
+    workplans with many small tasks benefit from larger values of both
+
+    The order in which tasks are handed out is decided by the {workplan}. Crew members that run
+    out of work stay on the team for as long as their {workplan} can find tasks for them to
+    take over from their busier peers
     """
 
 
@@ -36,6 +47,15 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
     recruiter = Recruiter()
     recruiter.doc = 'the strategy for recruiting crew members'
 
+    batch = pyre.properties.int(default=1)
+    batch.doc = 'the maximum number of tasks to send to a crew member in each message'
+
+    prefetch = pyre.properties.int(default=1)
+    prefetch.doc = 'the maximum number of batches each crew member may have in flight'
+
+    workplan = Workplan()
+    workplan.doc = 'the pile of tasks that are waiting to be executed'
+
 
     # interface
     @pyre.export
@@ -54,7 +74,7 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         channel.line('  active crew members: {}'.format(len(self.active)))
 
         # add the new tasks to the workplan
-        self.workplan |= workplan
+        self.workplan.update(workplan)
         # tell me
         channel.line('extending the workplan')
         channel.line('  current outstanding tasks: {}'.format(len(self.workplan)))
@@ -103,9 +123,10 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         self.registered = set()
         self.active = set()
         self.retired = set()
-
-        # my workplan is the set of tasks that are pending
-        self.workplan = set()
+        # the crew members that are waiting to be sent more work
+        self.scheduled = set()
+        # the crew members that have run out of work
+        self.idle = set()
 
         # all done
         return
@@ -130,7 +151,8 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         """
         # upgrade its status from registered
         self.registered.remove(crew)
-        # to active
+        # to active; recruiters may reassign crew members that worked for me before
+        self.retired.discard(crew)
         self.active.add(crew)
         # all done
         return self
@@ -140,7 +162,13 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         """
         Add the given {crew} member to the execution schedule
         """
-        # start sending tasks when the worker is ready to listen
+        # if it's already there
+        if crew in self.scheduled:
+            # nothing to do
+            return self
+        # otherwise, add it
+        self.scheduled.add(crew)
+        # and start sending tasks when the worker is ready to listen
         self.dispatcher.whenWriteReady(
             channel = crew.channel,
             call = functools.partial(self.submit, crew=crew))
@@ -154,37 +182,156 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
         """
         # N.B.: {channel} is ready to write, because that's how we got here; so write away...
 
-        # tell me
-        self.debug.log('sending a task to {.pid}'.format(crew))
         # get my workplan
         workplan = self.workplan
-        # and my marshaler
-        marshaler = self.marshaler
 
-        # if there is nothing left to do
-        if not workplan:
-            # notify this worker we are done
+        # if the crew member is damaged
+        if crew.status is not crew.crewcodes.healthy:
+            # take it off the schedule
+            self.scheduled.discard(crew)
+            # notify it we are done
             self.dismiss(crew=crew)
             # and don't send it any further work
             return False
 
-        # otherwise, grab a task
-        task = workplan.pop()
-        # and send it to the worker
-        crew.execute(team=self, task=task)
+        # if my recruiter thinks the crew member has done enough work
+        if self.recruiter.exhausted(team=self, crew=crew):
+            # take it off the schedule
+            self.scheduled.discard(crew)
+            # if it has no work in progress
+            if not crew.pending:
+                # dismiss it
+                self.dismiss(crew=crew)
+                # and look for a replacement
+                self.recruit()
+            # either way, don't send it any further work
+            return False
 
-        # don't reschedule me; let the handler that harvests the task status decide the fate of
-        # this worker
+        # if there is work left to do
+        if workplan:
+            # grab a batch of tasks
+            tasks = [ workplan.pop() for _ in range(min(max(1, self.batch), len(workplan))) ]
+            # tell me
+            self.debug.log(f"sending {len(tasks)} tasks to {crew.pid}")
+            # and send them to the worker
+            crew.execute(team=self, tasks=tasks)
+
+        # if there is more work and the crew member has room for it
+        if workplan and len(crew.pending) < max(1, self.prefetch):
+            # send it another batch as soon as it's ready to listen
+            return True
+
+        # otherwise, take it off the schedule
+        self.scheduled.discard(crew)
+        # if it has run out of work
+        if not crew.pending:
+            # mark it as idle
+            self.idle.add(crew)
+            # and look for something else for it to do
+            self.rebalance()
+        # either way, let the handler that harvests the task status decide the fate of this
+        # worker; don't reschedule me
         return False
 
 
+    def requeue(self, tasks):
+        """
+        Put {tasks} back in the workplan
+        """
+        # if there aren't any
+        if not tasks:
+            # nothing to do
+            return self
+        # tell me
+        self.debug.log(f"putting {len(tasks)} tasks back in the workplan")
+        # add them to the workplan
+        self.workplan.update(tasks)
+        # all done
+        return self
+
+
+    def rebalance(self):
+        """
+        Find work for the idle crew members, or dismiss them if there is none
+        """
+        # get the idle crew members
+        idle = self.idle
+        # if there aren't any
+        if not idle:
+            # nothing to do
+            return self
+
+        # if there is work left in the workplan
+        if self.workplan:
+            # go through the idle crew members
+            while idle:
+                # and put each one back on the schedule
+                self.schedule(crew=idle.pop())
+            # all done
+            return self
+
+        # otherwise, count the batches that are on their way back from busy crew members; each
+        # one will make work for an idle crew member
+        incoming = sum(len(crew.revoked) for crew in self.active)
+        # the busy crew members are the candidates for rebalancing
+        busy = self.active - idle
+        # for each idle crew member that isn't waiting for work to come back
+        for _ in range(len(idle) - incoming):
+            # ask my workplan to pick a batch from the backlog of one of the busy crew members
+            choice = self.workplan.steal(crews=busy)
+            # if there isn't one
+            if choice is None:
+                # no point in looking any further
+                break
+            # otherwise, unpack
+            victim, seqno = choice
+            # tell me
+            self.debug.log(f"rebalancing the backlog of {victim.pid}")
+            # ask for the batch back
+            victim.revoke(seqno=seqno)
+            # and update the count
+            incoming += 1
+
+        # the crew members that won't get any of this work
+        for _ in range(len(idle) - incoming):
+            # are no longer needed
+            self.dismiss(crew=idle.pop())
+
+        # all done
+        return self
+
+
+    def survey(self):
+        """
+        Build a table with the number of tasks executed by each of my crew members and their
+        memory footprint
+        """
+        # go through my crew members, in order of their ids
+        table = [
+            (crew.pid, crew.tasks, crew.rss)
+            for crew in sorted(self.active | self.retired, key=lambda crew: crew.pid)
+            ]
+        # if my channel is active
+        if self.debug:
+            # go through the table
+            for pid, tasks, rss in table:
+                # show me
+                self.debug.line(f"{pid}: {tasks} tasks, max rss: {rss}")
+            # flush
+            self.debug.log()
+        # all done
+        return table
+
+
     def dismiss(self, crew):
         """
         Dismiss the {crew} member from the team
         """
-        # notify this crew member it is dismissed
-        crew.dismissed()
-        # let the recruiter know
+        # make sure it's no longer considered for work; crew members that never made it past
+        # registration may be dismissed as well
+        self.registered.discard(crew)
+        self.idle.discard(crew)
+        # let the recruiter know; it's responsible for notifying the crew member
         self.recruiter.dismiss(team=self, crew=crew)
         # remove it from the roster
         self.active.discard(crew)
@@ -197,6 +344,7 @@ class Pool(Peer, family='pyre.nexus.teams.pool', implements=Team):
     # private data
     active = None   # the set of currently deployed crew members
     retired = None  # the set of retired crew members
+    idle = None     # the set of crew members that have run out of work
 
 
 # end of file
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import heapq
+import itertools
+# support
+import pyre
+# my protocol
+from .Workplan import Workplan
+
+
+# declaration
+class Priority(pyre.component, family='pyre.nexus.workplans.priority', implements=Workplan):
+    """
+    A workplan that hands out its tasks in order of decreasing {priority}; tasks with the same
+    priority are handed out in order of decreasing {cost}, so that the longest ones are started
+    first and don't end up holding back the completion of the workplan. Tasks that don't
+    provide these hints are treated as having priority 0 and cost 1; ties are broken in favor
+    of the tasks that were added first.
+
+    If {rebalance} is on, crew members that run out of work take over the costliest batch that
+    was sent to the busy crew member with the costliest backlog, as long as it hasn't started
+    working on it yet. This is possible only when teams send more than one batch to each crew
+    member at a time
+    """
+
+
+    # user configurable state
+    rebalance = pyre.properties.bool(default=True)
+    rebalance.doc = "let idle crew members take over the queued tasks of their busier peers"
+
+
+    # interface
+    @pyre.export
+    def add(self, task):
+        """
+        Add {task} to the pile
+        """
+        # build the ordering key and add the task to the heap
+        heapq.heappush(self.tasks, self.key(task=task))
+        # all done
+        return self
+
+
+    @pyre.export
+    def update(self, tasks):
+        """
+        Add all the {tasks} to the pile
+        """
+        # add the new tasks to the heap
+        self.tasks.extend(self.key(task=task) for task in tasks)
+        # and restore the heap order
+        heapq.heapify(self.tasks)
+        # all done
+        return self
+
+
+    @pyre.export
+    def pop(self):
+        """
+        Remove and return the task that should be executed next
+        """
+        # the task is the last entry in the key
+        return heapq.heappop(self.tasks)[-1]
+
+
+    @pyre.export
+    def steal(self, crews):
+        """
+        Select the member among {crews} with the costliest backlog, and the costliest of its
+        queued batches
+        """
+        # if i'm not supposed to rebalance
+        if not self.rebalance:
+            # bail
+            return None
+        # initialize the search
+        victim = None
+        heaviest = 0
+        # go through the crew members
+        for crew in crews:
+            # estimate the cost of each batch they have queued up
+            batches = [
+                (sum(self.cost(task=task) for task in tasks), seqno)
+                for seqno, tasks in crew.backlog()
+                ]
+            # and the cost of their backlog
+            backlog = sum(cost for cost, _ in batches)
+            # if this is the costliest so far
+            if backlog > heaviest:
+                # remember the crew member and its costliest batch
+                victim = crew, max(batches)[1]
+                heaviest = backlog
+        # all done
+        return victim
+
+
+    # implementation details
+    def key(self, task):
+        """
+        Build the heap entry for {task}
+        """
+        # higher priority and higher cost come first, followed by the order of arrival
+        return (-getattr(task, "priority", 0), -self.cost(task=task), next(self.sequence), task)
+
+
+    def cost(self, task):
+        """
+        Retrieve the cost hint of {task}
+        """
+        # easy enough
+        return getattr(task, "cost", 1)
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the heap of tasks
+        self.tasks = []
+        # the source of the sequence numbers that break ties among equivalent tasks
+        self.sequence = itertools.count()
+        # all done
+        return
+
+
+    def __len__(self):
+        # easy enough
+        return len(self.tasks)
+
+
+    def __iter__(self):
+        # go through the heap entries and return the tasks
+        return (entry[-1] for entry in self.tasks)
+
+
+# end of file
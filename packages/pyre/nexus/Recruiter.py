@@ -35,6 +35,12 @@ class Recruiter(pyre.protocol, family='pyre.nexus.recruiters'):
         The {team} manager has dismissed the given {member}
         """
 
+    @pyre.provides
+    def exhausted(self, team, crew, **kwds):
+        """
+        Decide whether the {crew} member has done enough work and should be replaced
+        """
+
 
     # default implementation
     @classmethod
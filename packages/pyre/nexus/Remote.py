@@ -0,0 +1,841 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import os
+import hmac
+import time
+import select
+import socket
+import hashlib
+import secrets
+import weakref
+import functools
+import itertools
+import threading
+# support
+import pyre
+# my protocol
+from .Recruiter import Recruiter
+# the default crew member factory
+from .Crew import Crew
+
+
+# the units of time
+from pyre.units.SI import second
+
+
+# declaration
+class Remote(pyre.component, family='pyre.nexus.recruiters.remote', implements=Recruiter):
+    """
+    Recruit team members among worker processes that connect to the team over TCP
+
+    The team listens for connections at {address}, on the loopback interface by default; set
+    {address} explicitly to accept workers from other hosts. Worker processes, typically
+    launched by pyre nodes, offer their services by invoking {volunteer}, which connects to the
+    team and waits for work. Each worker opens two connections: one carries the conversation
+    between the worker and its twin on the team side, and the other carries the heartbeats of
+    the worker. Heartbeats are sent every {heartbeat} by a separate thread, so they keep coming
+    while the worker is busy with a long task.
+
+    Messages are pickled, so the team and its workers must trust each other: before anything
+    is exchanged, each side proves to the other that it knows {authkey} by signing a random
+    challenge. Workers that fail to do so are turned away without ever being heard. The team
+    carries out its side of the handshake without blocking, so slow or stray connections
+    don't hold up the rest of the crew.
+
+    Crew members whose connection drops, or whose heartbeats stop for {patience} intervals, are
+    declared lost, and the tasks they were working on are put back in the workplan for the rest
+    of the team. Workers that lose their connection to the team attempt to reconnect, and give
+    up after {retries} failed attempts.
+
+    Healthy crew members that are dismissed stay connected and are reassigned to later
+    workplans, until they are let go by {release}.
+    """
+
+
+    # user configurable state
+    address = pyre.properties.inet(default="ip4:localhost:0")
+    address.doc = "the address where the team listens for workers"
+
+    authkey = pyre.properties.str(default=None)
+    authkey.doc = (
+        "the secret shared by the team and its workers; "
+        "a random one is generated if not set, which suits workers cloned by {deploy}")
+
+    heartbeat = pyre.properties.dimensional(default=1*second)
+    heartbeat.doc = "the interval between heartbeats"
+
+    patience = pyre.properties.int(default=3)
+    patience.doc = "the number of missed heartbeats before a crew member is declared lost"
+
+    retries = pyre.properties.int(default=5)
+    retries.doc = "the number of attempts a worker makes to reconnect to its team"
+
+
+    # protocol obligations
+    @pyre.provides
+    def recruit(self, team, **kwds):
+        """
+        Recruit members for the {team}
+        """
+        # make sure i'm listening for workers on behalf of the {team}
+        self.enlist(team=team)
+        # compute the number of vacancies in the team
+        vacancies = team.vacancies()
+        # get the workers that are waiting for an assignment
+        lobby = self.lobby
+        # fill as many vacancies as possible from among them
+        while vacancies > 0 and lobby:
+            # get one
+            crew = lobby.pop()
+            # attach it to the support for asynchrony of its new team
+            crew.dispatcher = team.dispatcher
+            # and to its message serializer
+            crew.marshaler = team.marshaler
+            # ask it to report in
+            yield crew.recall(team=team)
+            # one less to go
+            vacancies -= 1
+        # the rest of the vacancies are filled as workers volunteer
+        return
+
+
+    @pyre.provides
+    def deploy(self, team, **kwds):
+        """
+        Clone the current process to create a worker that volunteers for the {team} from the
+        local host
+        """
+        # make sure i'm listening for workers
+        self.listen()
+        # clone the current process
+        pid = os.fork()
+        # in the worker process
+        if pid == 0:
+            # offer my services to the team until i'm let go
+            status = self.volunteer(factory=team.crew, **kwds)
+            # at which point, this process must terminate
+            raise SystemExit(status)
+        # the new worker shows up when it connects to my port; all done
+        return pid
+
+
+    @pyre.provides
+    def dismiss(self, team, crew, **kwds):
+        """
+        The {team} manager has dismissed the given {member}
+        """
+        # if the crew member is healthy and still on my roster
+        if crew.status is crew.crewcodes.healthy and crew.pid in self.crews:
+            # keep it around for later workplans
+            self.lobby.append(crew)
+        # otherwise
+        else:
+            # forget it
+            self.forget(identity=crew.pid)
+            # notify it, in case it's still listening, and hang up
+            crew.dismissed()
+        # the team updates its roster after i'm done; take a look after that
+        team.dispatcher.alarm(interval=0*second, call=self.review)
+        # all done
+        return
+
+
+    @pyre.provides
+    def exhausted(self, team, crew, **kwds):
+        """
+        Decide whether the {crew} member has done enough work and should be replaced
+        """
+        # my crew members work until they are let go
+        return False
+
+
+    # interface - team side
+    def listen(self):
+        """
+        Start listening for workers; returns the address of my port
+        """
+        # if i don't have a port yet
+        if self.port is None:
+            # make sure there is a secret before any workers are cloned
+            self.secret()
+            # get a port
+            self.port = pyre.ipc.port(address=self.address)
+            # and adjust my address, in case the kernel picked the port number
+            self.address = self.port.address
+        # all done
+        return self.address
+
+
+    def enlist(self, team):
+        """
+        Start acknowledging workers on behalf of {team}
+        """
+        # if i'm already on duty
+        if self.team is not None:
+            # nothing to do
+            return self
+        # make sure i'm listening
+        self.listen()
+        # save the team
+        self.team = team
+        # get its dispatcher
+        dispatcher = team.dispatcher
+        # if i'm not watching my port for connection attempts already
+        if not self.watching:
+            # start now
+            dispatcher.whenReadReady(channel=self.port, call=self.acknowledge)
+            # and remember
+            self.watching = True
+        # and start checking the heartbeats of my workers
+        self.alarm = dispatcher.alarm(interval=self.heartbeat, call=self.monitor)
+        # all done
+        return self
+
+
+    def standDown(self):
+        """
+        Stop acknowledging workers on behalf of my current team
+        """
+        # get the team
+        team = self.team
+        # and go off duty
+        self.team = None
+        # stop monitoring the heartbeats
+        team.dispatcher.cancel(self.alarm)
+        # abandon the introductions in progress
+        self.expire(deadline=float("inf"))
+        # the handler that watches my port retires the next time it is invoked; make a
+        # connection so it gets a chance to do so
+        try:
+            pyre.ipc.tcp(address=self.address).close()
+        # if this fails, the handler retires when the next worker volunteers
+        except OSError:
+            pass
+        # all done
+        return self
+
+
+    def release(self):
+        """
+        Let go of the workers that are waiting for an assignment, and stop listening
+        """
+        # stop watching the heartbeat channels
+        while self.listening:
+            # one at a time
+            self.stethoscope.unregister(self.listening.popitem()[0])
+        # let the workers go
+        self.retire(owner=self.owner, lobby=self.lobby, pulses=self.pulses)
+        # and forget them
+        self.crews.clear()
+        self.beats.clear()
+        # hang up on the workers that were being introduced
+        while self.introductions:
+            # one at a time
+            self.introductions.popitem()[0].close()
+        # if i have a port
+        if self.port is not None:
+            # close it
+            self.port.close()
+            # and forget it
+            self.port = None
+        # all done
+        return self
+
+
+    # interface - worker side
+    def volunteer(self, factory=Crew, **kwds):
+        """
+        Offer the services of this process to the team listening at {address}; returns when the
+        team lets it go, or when the team is unreachable after {retries} attempts
+        """
+        # the crew members identify themselves by host, process id and session
+        host = socket.gethostname()
+        pid = os.getpid()
+        # count the failed connection attempts
+        failures = 0
+        # start a new session every time the worker connects to the team
+        for session in itertools.count():
+            # attempt to
+            try:
+                # connect to the team
+                channel = self.connect()
+            # if this fails
+            except OSError:
+                # count it
+                failures += 1
+                # if we have run out of patience
+                if failures > self.retries:
+                    # give up
+                    return 1
+                # otherwise, wait a bit
+                time.sleep(self.heartbeat / second)
+                # and try again
+                continue
+            # if all went well, reset the count
+            failures = 0
+
+            # build my identity
+            identity = (host, pid, session)
+            # make a crew member
+            crew = factory(pid=identity, channel=channel, **kwds)
+            # introduce it to the team
+            crew.marshaler.send(channel=channel, item=("crew", identity))
+            # start sending heartbeats
+            done = threading.Event()
+            pulse = threading.Thread(
+                target=self.pulse, daemon=True,
+                kwargs={"identity": identity, "marshaler": crew.marshaler, "done": done})
+            pulse.start()
+            # ask the crew member to register with the team
+            crew.register()
+            # spin up and carry out tasks until there is nothing more to do
+            crew.run()
+            # stop the heartbeats
+            done.set()
+            pulse.join()
+            # hang up
+            channel.close()
+
+            # if the crew member is healthy, it was let go
+            if crew.status is crew.crewcodes.healthy:
+                # so we are all done
+                return 0
+            # otherwise, it lost its connection to the team; try to reconnect
+
+        # unreachable
+        return 1
+
+
+    def pulse(self, identity, marshaler, done):
+        """
+        Send heartbeats to the team on behalf of the crew member with the given {identity} until
+        {done} is set
+        """
+        # compute the interval between heartbeats
+        interval = self.heartbeat / second
+        # attempt to
+        try:
+            # connect to the team
+            channel = self.connect()
+        # if this fails
+        except OSError:
+            # the team will notice
+            return
+        # carefully
+        try:
+            # introduce the connection
+            marshaler.send(channel=channel, item=("pulse", identity))
+            # until the crew member is done
+            while not done.wait(interval):
+                # beat
+                channel.write(b".")
+        # if the team is gone
+        except OSError:
+            # the crew member will notice
+            pass
+        # no matter what happens
+        finally:
+            # hang up
+            channel.close()
+        # all done
+        return
+
+
+    def connect(self):
+        """
+        Connect to the team and authenticate; returns the channel to the team
+        """
+        # connect
+        channel = pyre.ipc.tcp(address=self.address)
+        # carefully
+        try:
+            # prove to the team that i know the secret, and make sure it does too
+            self.authenticate(channel=channel)
+        # if anything goes wrong
+        except BaseException:
+            # hang up
+            channel.close()
+            # and complain
+            raise
+        # all done
+        return channel
+
+
+    def authenticate(self, channel):
+        """
+        Carry out the worker side of the handshake over {channel}; raises {ConnectionError} if the
+        team doesn't know the secret
+        """
+        # get the secret
+        key = self.secret()
+        # don't wait forever for the team
+        channel.settimeout(self.patience * self.heartbeat / second)
+        # get the challenge
+        challenge = channel.read(minlen=self.nonce, maxlen=self.nonce)
+        # if the team hung up
+        if len(challenge) != self.nonce:
+            # complain
+            raise ConnectionError("the team hung up during the handshake")
+        # make a challenge for the team
+        counter = os.urandom(self.nonce)
+        # answer and challenge back
+        channel.write(bstr=self.sign(key=key, message=challenge) + counter)
+        # get the answer
+        answer = channel.read(minlen=self.digest, maxlen=self.digest)
+        # if it's wrong
+        if not hmac.compare_digest(answer, self.sign(key=key, message=counter)):
+            # complain
+            raise ConnectionError("the team failed to authenticate")
+        # go back to blocking mode
+        channel.settimeout(None)
+        # all done
+        return
+
+
+    # event handlers
+    def acknowledge(self, channel, **kwds):
+        """
+        A worker is attempting to connect to the team
+        """
+        # get the team
+        team = self.team
+        # if i'm off duty
+        if team is None:
+            # leave the connection for later and stop watching the port
+            self.watching = False
+            # by not rescheduling this handler
+            return False
+
+        # accept the connection
+        connection, address = channel.accept()
+        # make a challenge
+        challenge = os.urandom(self.nonce)
+        # attempt to
+        try:
+            # send it; it fits comfortably in the buffers of a fresh connection
+            connection.write(bstr=challenge)
+        # if this fails
+        except OSError:
+            # hang up
+            connection.close()
+            # and wait for more workers
+            return True
+        # start keeping track of the introduction
+        self.introductions[connection] = {
+            "address": address,
+            "challenge": challenge,
+            "received": b"",
+            "identity": None,
+            "deadline": time.time() + self.patience * self.heartbeat / second,
+            }
+        # and finish it when the worker responds
+        team.dispatcher.whenReadReady(channel=connection, call=self.introduce)
+        # wait for more workers
+        return True
+
+
+    def introduce(self, channel, **kwds):
+        """
+        A worker that is being introduced to the team has something to say
+        """
+        # get the state of the introduction
+        introduction = self.introductions.get(channel)
+        # get the team
+        team = self.team
+        # if the introduction was abandoned, or i'm off duty
+        if introduction is None or team is None or introduction["deadline"] < time.time():
+            # hang up
+            return self.turnAway(connection=channel)
+
+        # if the worker hasn't authenticated yet
+        if introduction["challenge"] is not None:
+            # attempt to
+            try:
+                # get whatever is there, without waiting for the rest
+                news = channel.recv(2 * self.digest)
+            # if this fails
+            except OSError:
+                # treat it like a closed connection
+                news = b""
+            # if the worker hung up
+            if not news:
+                # so do i
+                return self.turnAway(connection=channel)
+            # accumulate
+            received = introduction["received"] + news
+            # the answer is followed by a challenge; if it's not all here yet
+            if len(received) < self.digest + self.nonce:
+                # save what we have
+                introduction["received"] = received
+                # and wait for more
+                return True
+            # workers wait for my answer before they say anything else; if this one didn't
+            if len(received) > self.digest + self.nonce:
+                # it's not one of mine
+                return self.turnAway(connection=channel)
+            # get the secret
+            key = self.secret()
+            # split the answer from the challenge
+            answer, counter = received[:self.digest], received[self.digest:]
+            # if the answer is wrong
+            if not hmac.compare_digest(
+                    answer, self.sign(key=key, message=introduction["challenge"])):
+                # turn the worker away
+                return self.turnAway(connection=channel)
+            # attempt to
+            try:
+                # answer the challenge
+                channel.write(bstr=self.sign(key=key, message=counter))
+            # if this fails
+            except OSError:
+                # hang up
+                return self.turnAway(connection=channel)
+            # the worker is authenticated
+            introduction["challenge"] = None
+            # wait for it to introduce itself
+            return True
+
+        # the worker is trusted now, and it has started sending a message; don't let it hold up
+        # the team if the rest of it never arrives
+        channel.settimeout(self.patience * self.heartbeat / second)
+        # attempt to
+        try:
+            # receive it
+            message = team.marshaler.recv(channel=channel)
+        # if anything goes wrong
+        except Exception:
+            # hang up
+            return self.turnAway(connection=channel)
+        # go back to blocking mode
+        channel.settimeout(None)
+
+        # if the worker hasn't introduced itself yet
+        if introduction["identity"] is None:
+            # this is its introduction
+            role, identity = message
+            # if this is the heartbeat channel
+            if role == "pulse":
+                # the introduction is over
+                del self.introductions[channel]
+                # i have heard from this worker
+                self.beats[identity] = time.time()
+                # save the channel
+                self.pulses[identity] = channel
+                # {monitor} watches it from now on
+                self.stethoscope.register(channel.fileno(), select.POLLIN)
+                self.listening[channel.fileno()] = identity
+                # so stop watching it here
+                return False
+            # crew members register right after that
+            introduction["identity"] = identity
+            # so wait for it
+            return True
+
+        # otherwise, the message is the status of a crew member; the introduction is over
+        del self.introductions[channel]
+        # if the crew member isn't properly registered
+        if message is not Crew.crewcodes.healthy:
+            # hang up
+            channel.close()
+            # and stop watching the connection
+            return False
+        # otherwise, enroll it; the crew member watches its own channel, so do it after i stop
+        # watching it
+        team.dispatcher.alarm(
+            interval=0*second,
+            call=functools.partial(
+                self.enroll, identity=introduction["identity"], connection=channel,
+                address=introduction["address"]))
+        # all done
+        return False
+
+
+    def enroll(self, identity, connection, address, **kwds):
+        """
+        Add the worker with the given {identity} to my roster
+        """
+        # get the team
+        team = self.team
+        # if i'm off duty
+        if team is None:
+            # hang up
+            connection.close()
+            # and don't reschedule this alarm
+            return None
+        # i have heard from this worker
+        self.beats[identity] = time.time()
+        # make a crew member
+        crew = team.crew(pid=identity, channel=connection, timer=team.timer)
+        # add it to my roster
+        self.crews[identity] = crew
+        # and to the pile of workers waiting for an assignment
+        self.lobby.append(crew)
+        # tell me
+        team.debug.log(f"{identity}: volunteered from {address}")
+        # give the team a chance to put it to work
+        team.recruit()
+        # and don't reschedule this alarm
+        return None
+
+
+    def monitor(self, timestamp, **kwds):
+        """
+        Check the heartbeats of my workers
+        """
+        # get the heartbeat channels
+        pulses = self.pulses
+        # and the time each worker was last heard from
+        beats = self.beats
+        # go through the heartbeat channels with news; {poll} has no limit on descriptor values
+        # and reports only the ready ones, so idle workers cost nothing here
+        for fd, _ in self.stethoscope.poll(0):
+            # find the worker
+            identity = self.listening.get(fd)
+            # if it's gone already
+            if identity is None:
+                # move on
+                continue
+            # get its channel
+            pulse = pulses[identity]
+            # attempt to
+            try:
+                # drain the channel
+                news = pulse.recv(4*1024)
+            # if this fails
+            except OSError:
+                # treat it like a closed channel
+                news = b""
+            # if there was something there
+            if news:
+                # record the time
+                beats[identity] = timestamp
+            # otherwise
+            else:
+                # the worker is gone
+                self.lose(identity=identity)
+
+        # abandon the introductions that are taking too long
+        self.expire(deadline=timestamp)
+
+        # compute the time of the last acceptable heartbeat
+        deadline = timestamp - self.patience * self.heartbeat / second
+        # go through the workers
+        for identity, beat in list(beats.items()):
+            # if they haven't been heard from in a while
+            if beat < deadline:
+                # they are lost
+                self.lose(identity=identity)
+
+        # take a look at the team
+        self.review()
+        # if i'm still on duty, check again after another heartbeat
+        return self.heartbeat if self.team is not None else None
+
+
+    def review(self, **kwds):
+        """
+        Put volunteers to work, or stand down if the team has no more use for them
+        """
+        # get the team
+        team = self.team
+        # if i'm off duty
+        if team is None:
+            # nothing to do
+            return None
+        # if the team has work and there are workers waiting for an assignment
+        if team.workplan and self.lobby:
+            # give the team a chance to put them to work
+            team.recruit()
+        # if the team is done
+        elif not team.workplan and not team.active and not team.registered:
+            # stand down
+            self.standDown()
+        # don't reschedule this alarm
+        return None
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the port where i listen for workers
+        self.port = None
+        # the team i'm acknowledging workers for
+        self.team = None
+        # the marker that tells whether my port is being watched
+        self.watching = False
+        # the handle of the alarm that checks the heartbeats
+        self.alarm = None
+        # the workers that have volunteered, indexed by their identity
+        self.crews = {}
+        # the ones that are waiting for an assignment
+        self.lobby = []
+        # the heartbeat channels
+        self.pulses = {}
+        # the watch over them
+        self.stethoscope = select.poll()
+        # and the workers they belong to, indexed by their descriptor
+        self.listening = {}
+        # and the time each worker was last heard from
+        self.beats = {}
+        # the state of the introductions in progress, indexed by their connection
+        self.introductions = {}
+        # the process that owns the port
+        self.owner = os.getpid()
+        # the workers must be let go when the owning process exits, even if the client forgets
+        # to {release} them; local workers are clones of this process, so make sure they don't
+        # try to let go of their peers
+        weakref.finalize(self, self.retire, owner=self.owner, lobby=self.lobby, pulses=self.pulses)
+        # all done
+        return
+
+
+    # implementation details
+    nonce = 32 # the size of the handshake challenges, in bytes
+    digest = hashlib.sha256().digest_size # the size of their answers
+
+
+    def secret(self):
+        """
+        Retrieve the secret shared with the workers, making one up if necessary
+        """
+        # if i don't have one
+        if self.authkey is None:
+            # make one up
+            self.authkey = secrets.token_hex(self.nonce)
+        # all done
+        return self.authkey.encode("utf-8")
+
+
+    @staticmethod
+    def sign(key, message):
+        """
+        Build the answer to the challenge {message}, given the secret {key}
+        """
+        # easy enough
+        return hmac.new(key, message, hashlib.sha256).digest()
+
+
+    def turnAway(self, connection):
+        """
+        Hang up on a worker that failed its introduction; returns {False} so read handlers can
+        use it to stop watching {connection}
+        """
+        # forget the introduction
+        self.introductions.pop(connection, None)
+        # hang up
+        connection.close()
+        # and stop watching the connection
+        return False
+
+
+    def expire(self, deadline):
+        """
+        Abandon the introductions that were supposed to be over before {deadline}
+        """
+        # go through the introductions in progress
+        for connection, introduction in self.introductions.items():
+            # if this one has run out of time
+            if introduction["deadline"] < deadline:
+                # mark it
+                introduction["deadline"] = float("-inf")
+                # and wake up its handler, which hangs up; the connection can't be closed
+                # here, since the dispatcher is still watching it
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                # if the connection is already gone
+                except OSError:
+                    # no problem
+                    pass
+        # all done
+        return
+
+
+    def lose(self, identity):
+        """
+        The worker with the given {identity} has stopped responding
+        """
+        # forget about it
+        crew = self.forget(identity=identity)
+        # if it wasn't a crew member
+        if crew is None:
+            # nothing else to do
+            return
+        # tell me
+        crew.debug.log(f"{identity}: lost")
+        # mark it
+        crew.status = crew.crewcodes.damaged
+        # if it was waiting for an assignment
+        if crew in self.lobby:
+            # remove it from the pile
+            self.lobby.remove(crew)
+            # hang up
+            crew.channel.close()
+            # and move on
+            return
+        # otherwise, cut the connection; the team finds out the next time it hears from it
+        try:
+            crew.channel.shutdown(socket.SHUT_RDWR)
+        # if the connection is already gone
+        except OSError:
+            # no problem
+            pass
+        # unless it's idle, in which case the team isn't expecting to hear from it
+        team = self.team
+        # so
+        if team is not None and crew in team.idle:
+            # dismiss it
+            team.dismiss(crew=crew)
+        # all done
+        return
+
+
+    def forget(self, identity):
+        """
+        Remove the worker with the given {identity} from my roster and hang up its heartbeat
+        channel; returns its crew member, if any
+        """
+        # forget when i last heard from it
+        self.beats.pop(identity, None)
+        # get its heartbeat channel
+        pulse = self.pulses.pop(identity, None)
+        # if it has one
+        if pulse is not None:
+            # stop watching it
+            self.stethoscope.unregister(pulse.fileno())
+            del self.listening[pulse.fileno()]
+            # and hang up
+            pulse.close()
+        # remove it from my roster
+        return self.crews.pop(identity, None)
+
+
+    @staticmethod
+    def retire(owner, lobby, pulses):
+        """
+        Let go of the workers in the {lobby} and hang up their heartbeat channels
+        """
+        # if this is not the process that recruited them
+        if os.getpid() != owner:
+            # leave them alone
+            return
+        # go through the workers
+        while lobby:
+            # and let each one go
+            lobby.pop().dismissed()
+        # go through the heartbeat channels
+        while pulses:
+            # and hang up
+            pulses.popitem()[1].close()
+        # all done
+        return
+
+
+# end of file
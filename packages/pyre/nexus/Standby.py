@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import os
+import weakref
+import importlib
+# support
+import pyre
+# my base class
+from .Fork import Fork
+
+
+# declaration
+class Standby(Fork, family='pyre.nexus.recruiters.standby'):
+    """
+    Create worker processes by cloning the current one, and keep them on standby after they
+    are dismissed so they can be reassigned to later workplans
+
+    Forking a process and importing the modules its tasks need is expensive compared to the
+    cost of short tasks. {Standby} imports the modules in {preload} once, before the first
+    worker is cloned, so that all workers share them, and parks dismissed crew members instead
+    of terminating them. Workers are retired after they have executed {recycle} tasks, which
+    keeps memory leaks in long running applications in check; their replacements are cloned
+    from the current process.
+    """
+
+
+    # user configurable state
+    recycle = pyre.properties.int(default=0)
+    recycle.doc = "the number of tasks a worker executes before it is replaced; 0 means never"
+
+    preload = pyre.properties.list(schema=pyre.properties.str())
+    preload.doc = "the modules to import before cloning the first worker"
+
+
+    # protocol obligations
+    @pyre.provides
+    def recruit(self, team, **kwds):
+        """
+        Recruit members for the {team}
+        """
+        # compute the number of vacancies in the team
+        vacancies = team.vacancies()
+        # get the crew members on standby
+        standby = self.standby
+        # fill as many vacancies as possible from among them
+        while vacancies > 0 and standby:
+            # get one
+            crew = standby.pop()
+            # attach it to the support for asynchrony of its new team
+            crew.dispatcher = team.dispatcher
+            # and to its message serializer
+            crew.marshaler = team.marshaler
+            # ask it to report in
+            yield crew.recall(team=team)
+            # one less to go
+            vacancies -= 1
+        # deploy new ones for the rest
+        for _ in range(vacancies):
+            # and add them to the team
+            yield self.deploy(team=team, **kwds)
+        # all done
+        return
+
+
+    @pyre.provides
+    def deploy(self, team, **kwds):
+        """
+        Create a new {team} member using the {fork} system call
+        """
+        # if this is my first worker
+        if not self.loaded:
+            # go through the modules my workers need
+            for module in self.preload:
+                # and import them, so that all my workers share them
+                importlib.import_module(module)
+            # mark
+            self.loaded = True
+        # chain up
+        return super().deploy(team=team, **kwds)
+
+
+    @pyre.provides
+    def dismiss(self, team, crew, **kwds):
+        """
+        The {team} manager has dismissed the given {member}
+        """
+        # if the crew member is healthy and has work left in it
+        if crew.status is crew.crewcodes.healthy and not self.exhausted(team=team, crew=crew):
+            # put it on standby
+            self.standby.append(crew)
+            # all done
+            return
+        # otherwise, let it go
+        return super().dismiss(team=team, crew=crew, **kwds)
+
+
+    @pyre.provides
+    def exhausted(self, team, crew, **kwds):
+        """
+        Decide whether the {crew} member has done enough work and should be replaced
+        """
+        # get the number of tasks a crew member is allowed to execute
+        recycle = self.recycle
+        # check whether the crew member has reached its limit
+        return recycle > 0 and crew.tasks >= recycle
+
+
+    # interface
+    def release(self):
+        """
+        Terminate the crew members on standby
+        """
+        # terminate them
+        self.retire(owner=self.owner, crew=self.standby)
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the crew members on standby
+        self.standby = []
+        # a marker that gets set after the modules in {preload} are imported
+        self.loaded = False
+        # the process that recruited my workers
+        self.owner = os.getpid()
+        # workers must be terminated when the owning process exits, even if the client forgets
+        # to {release} them; the workers are clones of this process, so make sure they don't
+        # try to terminate their siblings
+        weakref.finalize(self, self.retire, owner=self.owner, crew=self.standby)
+        # all done
+        return
+
+
+    # implementation details
+    @staticmethod
+    def retire(owner, crew):
+        """
+        Notify the {crew} members on standby that they are dismissed and harvest their status
+        """
+        # if this is not the process that recruited them
+        if os.getpid() != owner:
+            # leave them alone
+            return
+        # go through them
+        while crew:
+            # get one
+            member = crew.pop()
+            # notify it
+            member.dismissed()
+            # and harvest its status
+            os.waitpid(member.pid, 0)
+        # all done
+        return
+
+
+# end of file
@@ -20,6 +20,12 @@ class Task:
     from .TaskStatus import TaskStatus as taskcodes
 
 
+    # scheduling hints; workplans that care about them use them to decide the order in which
+    # tasks are handed to crew members
+    priority = 0 # tasks with higher priority are executed first
+    cost = 1 # an estimate of the relative cost of executing the task
+
+
     # interface
     def execute(self, **kwds):
         """
@@ -10,6 +10,7 @@
 import pyre
 # my user configurable state
 from .Recruiter import Recruiter
+from .Workplan import Workplan
 
 
 # declaration
@@ -26,6 +27,9 @@ class Team(pyre.protocol, family='pyre.nexus.teams'):
     recruiter = Recruiter()
     recruiter.doc = 'the strategy for recruiting team members'
 
+    workplan = Workplan()
+    workplan.doc = 'the pile of tasks that are waiting to be executed'
+
 
     # interface
     @pyre.provides
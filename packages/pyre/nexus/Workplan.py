@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# support
+import pyre
+
+
+# declaration
+class Workplan(pyre.protocol, family='pyre.nexus.workplans'):
+    """
+    The specification of the containers of the tasks that are waiting to be executed by a team
+
+    A workplan decides the order in which its tasks are handed to the crew members, and whether
+    a crew member that has run out of work is allowed to take over tasks that have been sent
+    to a busier crew member but haven't been started yet. Workplans also support {len} so that
+    teams can tell how much work is left
+    """
+
+
+    # interface
+    @pyre.provides
+    def add(self, task):
+        """
+        Add {task} to the pile
+        """
+
+    @pyre.provides
+    def update(self, tasks):
+        """
+        Add all the {tasks} to the pile
+        """
+
+    @pyre.provides
+    def pop(self):
+        """
+        Remove and return the task that should be executed next
+        """
+
+    @pyre.provides
+    def steal(self, crews):
+        """
+        Select the member among {crews} whose queued tasks should be handed to an idle crew
+        member, and the sequence number of the batch to take from it; returns {None} if there
+        is nothing worth taking
+        """
+
+
+    # default implementation
+    @classmethod
+    def pyre_default(cls, **kwds):
+        """
+        The default {Workplan} implementation
+        """
+        # the default is an unordered pile of tasks
+        from .Bag import Bag
+        # return the component factory
+        return Bag
+
+
+# end of file
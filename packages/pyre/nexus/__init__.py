@@ -24,6 +24,7 @@ from .CrewStatus import CrewStatus as crewcodes
 from .Team import Team as team
 from .Recruiter import Recruiter as recruiter
 from .Asynchronous import Asynchronous as asynchronous
+from .Workplan import Workplan as workplan
 
 
 # task distribution implementations
@@ -38,6 +39,29 @@ def fork():
     return fork
 
 
+@pyre.foundry(implements=recruiter, tip="keep forked team members on standby")
+def standby():
+    """
+    The recruiter that clones the current process and keeps dismissed team members around for
+    later workplans
+    """
+    # get the implementation
+    from .Standby import Standby as standby
+    # and return it
+    return standby
+
+
+@pyre.foundry(implements=recruiter, tip="recruit team members among workers that connect over tcp")
+def remote():
+    """
+    The recruiter that listens for worker processes on other hosts that volunteer for the team
+    """
+    # get the implementation
+    from .Remote import Remote as remote
+    # and return it
+    return remote
+
+
 @pyre.foundry(implements=asynchronous, tip="a component that endows a process with an event loop")
 def peer():
     """
@@ -60,4 +84,27 @@ def pool():
     return pool
 
 
+@pyre.foundry(implements=workplan, tip="an unordered pile of tasks")
+def bag():
+    """
+    A workplan that hands out its tasks in no particular order
+    """
+    # get the implementation
+    from .Bag import Bag as bag
+    # and return it
+    return bag
+
+
+@pyre.foundry(implements=workplan, tip="a priority queue of tasks that supports rebalancing")
+def priority():
+    """
+    A workplan that hands out its tasks in order of priority and cost, and lets idle crew
+    members take over the queued tasks of their busier peers
+    """
+    # get the implementation
+    from .Priority import Priority as priority
+    # and return it
+    return priority
+
+
 # end of file
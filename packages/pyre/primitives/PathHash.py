@@ -6,7 +6,7 @@
 #
 
 
-import collections
+import bisect
 
 
 class PathHash:
@@ -51,10 +51,37 @@ class PathHash:
         return original
 
 
+    def children(self, prefix=''):
+        """
+        Generate the (name, key) pairs of my immediate children whose names start with
+        {prefix}, in sorted order
+        """
+        # get the sorted names of my children
+        names = self.names
+        # if they have fallen out of sync with my nodes
+        if len(names) != len(self.nodes):
+            # rebuild them
+            names = self.names = sorted(self.nodes)
+        # find the first name that starts with {prefix}
+        start = bisect.bisect_left(names, prefix)
+        # go through the names from there on
+        for name in names[start:]:
+            # if this name is past the {prefix} range
+            if not name.startswith(prefix):
+                # we are done
+                break
+            # otherwise, hand it to the caller along with its key
+            yield name, self.nodes[name]
+        # all done
+        return
+
+
     # metamethods
     def __init__(self):
         # initialize the table of nodes
-        self.nodes = collections.defaultdict(PathHash)
+        self.nodes = {}
+        # and the sorted names of my children
+        self.names = []
         # all done
         return
 
@@ -71,15 +98,29 @@ class PathHash:
         """
         Hash {name}
         """
-        # easy enough
-        return self.nodes[name]
+        # attempt to
+        try:
+            # look up the key of {name}
+            return self.nodes[name]
+        # if this is the first time we encounter {name}
+        except KeyError:
+            # make a new key
+            key = self.nodes[name] = PathHash()
+            # record the new name
+            bisect.insort(self.names, name)
+        # and return the key
+        return key
 
 
     def __setitem__(self, name, key):
         """
         Make {name} hash to {key}
         """
-        # easy enough
+        # if {name} is new
+        if name not in self.nodes:
+            # record it
+            bisect.insort(self.names, name)
+        # make {name} hash to {key}
         self.nodes[name] = key
         # all done
         return
@@ -102,7 +143,7 @@ class PathHash:
 
     # implementation details
     # narrow down the footprint
-    __slots__ = ["nodes"]
+    __slots__ = ["nodes", "names"]
 
 
 # end of file
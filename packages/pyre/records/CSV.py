@@ -6,6 +6,7 @@
 #
 
 
+# declaration
 class CSV:
     """
     A reader and writer of records in csv format
@@ -13,9 +14,17 @@ class CSV:
     This class enhances the support provided by the csv package from the python standard
     library by reading and writing records that have a variety of metadata attached to their
     fields, which enables much smarter processing of the information content.
+
+    Large sources can be ingested in batches by {batches}, which reads the source in chunks of
+    whole lines, so that memory consumption is bounded by the size of the chunks rather than the
+    size of the source, and can parse and convert the chunks in a pool of worker processes.
     """
 
 
+    # public data
+    chunk = 1 << 24 # the default size of the chunks, in bytes
+
+
     # record factories
     def immutable(self, layout, uri=None, stream=None, **kwds):
         """
@@ -41,6 +50,93 @@ class CSV:
         return
 
 
+    def batches(self, layout, uri=None, stream=None, chunk=None, workers=0, backlog=None,
+                convert=False, encoding="utf-8", **kwds):
+        """
+        Read a csv formatted input source in batches of rows
+
+        The source is split into chunks of roughly {chunk} bytes on line boundaries, and each
+        chunk is parsed into a list of rows; this is only correct for sources whose fields do
+        not contain quoted line breaks. The arguments {layout}, {uri} and {stream} are
+        interpreted as in {read}.
+
+        If {workers} is positive, the chunks of the file named by {uri} are read and parsed by a
+        pool of as many worker processes, and the batches are yielded in the order of the
+        chunks. At most {backlog} chunks, twice the number of {workers} by default, are in
+        flight at any time, so the workers stall when the client falls behind. If {convert} is
+        true, the values in each row are also converted by {layout}, which must be importable
+        by the workers in this case; the batches can be added to a sheet by its
+        {pyre_extend}. Otherwise, the rows contain the raw strings from the source and are
+        suitable for {pyre_immutable} and {pyre_mutable}.
+        """
+        # use the default chunk size, if necessary
+        chunk = self.chunk if chunk is None else chunk
+
+        # if we are parsing in parallel
+        if workers > 0:
+            # we need a file name, so the workers can access the source on their own
+            if not uri:
+                raise self.SourceSpecificationError()
+            # open the file
+            with open(uri, "rb") as stream:
+                # read the headers
+                columns = self.columns(
+                    layout=layout, headers=stream.readline().decode(encoding), **kwds)
+                # and split the rest into chunks
+                chunks = tuple(self.chunks(stream=stream, chunk=chunk))
+            # if we are not converting
+            if not convert:
+                # don't ship the layout to the workers
+                layout = None
+            # in-flight chunks
+            backlog = 2 * workers if backlog is None else max(1, backlog)
+            # access the packages
+            import collections
+            import concurrent.futures
+            # make a pool of workers
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                # make a queue for the pending chunks
+                pending = collections.deque()
+                # go through the chunks
+                for start, end in chunks:
+                    # if the queue is full
+                    if len(pending) >= backlog:
+                        # wait for the oldest chunk and hand it to the client
+                        yield pending.popleft().result()
+                    # schedule the parsing of this one
+                    pending.append(pool.submit(
+                        self.parse, uri, start, end, encoding, columns, layout, kwds))
+                # drain the queue
+                while pending:
+                    # hand the chunks to the client, in order
+                    yield pending.popleft().result()
+            # all done
+            return
+
+        # otherwise, parse the chunks here; check whether {uri} was provided
+        if uri:
+            # build the associated stream
+            stream = open(uri, newline='', encoding=encoding)
+        # look for a valid stream
+        if not stream:
+            raise self.SourceSpecificationError()
+        # read the headers
+        columns = self.columns(layout=layout, headers=stream.readline(), **kwds)
+        # as long as there is data
+        while True:
+            # read a chunk of whole lines
+            text = stream.read(chunk) + stream.readline()
+            # if there was nothing there
+            if not text:
+                # we are done
+                break
+            # parse the chunk
+            yield self.select(
+                text=text, columns=columns, layout=layout if convert else None, **kwds)
+        # all done
+        return
+
+
     # support
     def read(self, layout, uri=None, stream=None, **kwds):
         """
@@ -78,6 +174,84 @@ class CSV:
         return
 
 
+    def columns(self, layout, headers, **kwds):
+        """
+        Parse the first line of a source and build the offsets of the columns requested by
+        {layout}
+        """
+        # access the package
+        import csv
+        # parse the line
+        headers = next(csv.reader([headers], **kwds))
+        # build the name map
+        index = { name: offset for offset, name in enumerate(headers) }
+        # adjust the column specification
+        return tuple(layout.pyre_selectColumns(headers=index))
+
+
+    def chunks(self, stream, chunk):
+        """
+        Split the rest of the binary {stream} into ranges of roughly {chunk} bytes that end on
+        line boundaries
+        """
+        # start at the current position
+        start = stream.tell()
+        # find the end of the stream
+        size = stream.seek(0, 2)
+        # as long as there is data
+        while start < size:
+            # skip ahead
+            stream.seek(start + chunk)
+            # finish the line; seeking past the end of the stream is allowed, so clip
+            end = min(size, start + chunk + len(stream.readline()))
+            # hand the range to the caller
+            yield start, end
+            # move on
+            start = end
+        # all done
+        return
+
+
+    @classmethod
+    def parse(cls, uri, start, end, encoding, columns, layout, kwds):
+        """
+        Read the bytes from {start} to {end} in {uri} and parse them into rows; this runs in the
+        worker processes
+        """
+        # open the file
+        with open(uri, "rb") as stream:
+            # go to the beginning of the chunk
+            stream.seek(start)
+            # and read it
+            text = stream.read(end - start).decode(encoding)
+        # parse it
+        return cls.select(text=text, columns=columns, layout=layout, **kwds)
+
+
+    @staticmethod
+    def select(text, columns, layout=None, **kwds):
+        """
+        Parse the lines in {text} and extract the requested {columns}; if {layout} is given, the
+        values are also converted
+        """
+        # access the packages
+        import csv
+        import io
+        # build a reader
+        reader = csv.reader(io.StringIO(text, newline=''), **kwds)
+        # extract the columns
+        rows = ( tuple(row[column] for column in columns) for row in reader )
+        # if there is no conversion to do
+        if layout is None:
+            # hand the raw values to the caller
+            return list(rows)
+        # otherwise, get the record constructor; sheets override {pyre_immutable}, so go
+        # directly to the source
+        build = layout.pyre_immutableTuple
+        # convert and strip the record type, so the rows can travel across processes
+        return [ tuple(build(record=layout, data=row)) for row in rows ]
+
+
     def write(self, sheet, uri=None, stream=None, **kwds):
         """
         Read lines from a csv formatted input source
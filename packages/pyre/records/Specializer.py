@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import itertools
+# the value processing steps that can be inlined
+from ..schemata.Schema import Schema
+from ..descriptors.Typed import Typed
+
+
+# declaration
+class Specializer:
+    """
+    A strategy for pulling data from a stream and building immutable tuples that generates an
+    extraction function tailored to the layout of a record
+
+    The generic strategies walk the record layout for every instance they build, dispatch to
+    each field to discover its type, and keep a cache of the field values so that derivations
+    can get at their operands. {Specializer} does this walk once, the first time it is asked
+    to build an instance, and generates the source of a function that pulls all the raw values
+    from the stream at once, walks each one through the conversion steps of its field, and
+    evaluates the derivation expressions directly. The function is compiled and installed in
+    the place of the {Specializer}, so subsequent instances are built by it directly.
+
+    Layouts that can't be handled, and data streams that run out before all the values are
+    extracted, are delegated to the {fallback} strategy, so the results are always the same as
+    those of the generic path.
+    """
+
+
+    # meta-methods
+    def __init__(self, fallback, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the generic strategy
+        self.fallback = fallback
+        # the generated function; built on first use
+        self.extract = None
+        # all done
+        return
+
+
+    def __call__(self, record, source, **kwds):
+        """
+        Build the extraction function for {record} if necessary, and use it to extract the
+        values from {source}
+        """
+        # get the function
+        extract = self.extract
+        # if this is the first time i'm asked to build an instance
+        if extract is None:
+            # build it
+            extract = self.extract = self.specialize(record=record)
+            # and install it, so that subsequent instances are built by it directly
+            record.pyre_immutableTuple.pyre_extract = extract
+        # and use it
+        return extract(record=record, source=source, **kwds)
+
+
+    # interface
+    def specialize(self, record):
+        """
+        Generate, compile and return an extraction function for the fields of {record}; returns
+        my {fallback} if the layout of {record} is not supported
+        """
+        # the symbols of the generated code
+        namespace = {
+            "islice": itertools.islice,
+            "fallback": self.fallback,
+            }
+        # the statements in the body of the function
+        body = []
+        # the names of the variables that hold the field values
+        values = []
+        # the names of the variables that hold the values of the fields computed so far, indexed
+        # by the {id} of the field; the descriptors overload the comparison operators, so they
+        # can't be trusted as keys
+        computed = {}
+        # fields that appear more than once in records with derivations get their value from
+        # the cache of the generic strategy, rather than pulling a new one from the stream
+        reuse = bool(record.pyre_derivations)
+        # the number of raw values to pull from the stream
+        count = 0
+
+        # go through the fields
+        for field in record.pyre_fields:
+            # if we have seen this field before and its value is to be reused
+            if reuse and id(field) in computed:
+                # just use it
+                values.append(computed[id(field)])
+                # and move on
+                continue
+            # if it's a measure
+            if field.category == "descriptor":
+                # its value comes from the stream
+                value = self.convert(
+                    field=field, expression=f"raw{count}", body=body, namespace=namespace)
+                # update the count
+                count += 1
+            # if it's a derivation
+            elif field.category == "operator":
+                # build the code that evaluates it
+                value = self.derive(
+                    operator=field, computed=computed, body=body, namespace=namespace)
+                # if this failed
+                if value is None:
+                    # the generic strategy will have to do
+                    return self.fallback
+            # anything else
+            else:
+                # is handled by the generic strategy
+                return self.fallback
+            # record the value
+            computed[id(field)] = value
+            # and add it to the pile
+            values.append(value)
+
+        # assemble the function
+        code = [
+            "def extract(record, source, **kwds):",
+            # pull all the raw values at once
+            f"    raw = tuple(islice(source, {count}))",
+            # if there aren't enough of them, let the generic strategy decide what to do
+            f"    if len(raw) < {count}:",
+            "        return tuple(fallback(record=record, source=iter(raw), **kwds))",
+            ]
+        # if there are raw values
+        if count:
+            # unpack them
+            code.append(f"    {''.join(f'raw{index}, ' for index in range(count))}= raw")
+        # add the conversions and the evaluations
+        code.extend(body)
+        # and the assembly of the tuple
+        code.append(f"    return ({''.join(f'{value}, ' for value in values)})")
+
+        # compile the function
+        exec(compile("\n".join(code), f"<pyre.records: {record.pyre_name}>", "exec"), namespace)
+        # and return it
+        return namespace["extract"]
+
+
+    # implementation details
+    def convert(self, field, expression, body, namespace):
+        """
+        Generate the statements that walk the value of {expression} through the processing
+        steps of {field}; returns the name of the variable that holds the result
+        """
+        # make a name for the variable that holds the value; binding the field below grows the
+        # namespace, so the name is unique
+        value = f"value{len(namespace)}"
+        # and one for the field
+        name = self.bind(value=field, namespace=namespace)
+        # compute the raw value
+        body.append(f"    {value} = {expression}")
+
+        # if the field has its own notion of processing
+        if type(field).process is not Typed.process:
+            # let it do its thing
+            body.append(f"    {value} = {name}.process({value})")
+            # and return the name of the variable
+            return value
+
+        # otherwise, inline the steps in {Typed.process}; {None} and its string representations
+        # are left alone
+        body.append(
+            f"    if {value} is None or "
+            f"(isinstance({value}, str) and {value}.strip().lower() == 'none'):")
+        body.append(f"        {value} = None")
+        body.append(f"    else:")
+        # the converters
+        for converter in field.converters:
+            # get bound
+            converter = self.bind(value=converter, namespace=namespace)
+            # and invoked
+            body.append(f"        {value} = {converter}(descriptor={name}, value={value})")
+        # the schema coercion, unless it's trivial
+        if type(field).coerce is not Schema.coerce:
+            # get bound
+            coerce = self.bind(value=field.coerce, namespace=namespace)
+            # and invoked
+            body.append(f"        {value} = {coerce}(value={value})")
+        # the normalizers and the validators
+        for processor in itertools.chain(field.normalizers, field.validators):
+            # get bound
+            processor = self.bind(value=processor, namespace=namespace)
+            # and invoked
+            body.append(f"        {value} = {processor}(descriptor={name}, value={value})")
+        # make sure the {else} clause is never empty
+        body.append(f"        pass")
+
+        # return the name of the variable
+        return value
+
+
+    def derive(self, operator, computed, body, namespace):
+        """
+        Generate the statements that evaluate {operator}; returns the name of the variable that
+        holds the result, or {None} if {operator} can't be handled
+        """
+        # make a pile for the names of the operands
+        operands = []
+        # go through the operands
+        for operand in operator.operands:
+            # if it's a field whose value is known
+            if id(operand) in computed:
+                # use it
+                operands.append(computed[id(operand)])
+            # if it's a literal
+            elif operand.category == "literal":
+                # bind its value
+                operands.append(self.bind(value=operand._value, namespace=namespace))
+            # if it's an expression
+            elif operand.category == "operator":
+                # evaluate it
+                value = self.derive(
+                    operator=operand, computed=computed, body=body, namespace=namespace)
+                # if this failed
+                if value is None:
+                    # bail
+                    return None
+                # otherwise, add it to the pile
+                operands.append(value)
+            # anything else, e.g. measures that are not fields of the record
+            else:
+                # is handled by the generic strategy
+                return None
+        # bind the evaluator
+        evaluator = self.bind(value=operator.evaluator, namespace=namespace)
+        # and walk its result through the processing steps of {operator}
+        return self.convert(
+            field=operator, expression=f"{evaluator}({', '.join(operands)})",
+            body=body, namespace=namespace)
+
+
+    def bind(self, value, namespace):
+        """
+        Add {value} to the symbols of the generated code; returns its name
+        """
+        # make a name
+        name = f"symbol{len(namespace)}"
+        # bind it
+        namespace[name] = value
+        # and return it
+        return name
+
+
+# end of file
@@ -38,6 +38,8 @@ class Templater(AttributeClassifier):
     from .Evaluator import Evaluator as pyre_evaluator # complex immutable tuples
     from .Calculator import Calculator as pyre_calculator # simple mutable tuples
     from .Compiler import Compiler as pyre_compiler # complex mutable tuples
+    # the generator of extraction functions tailored to each record
+    from .Specializer import Specializer as pyre_specializer
 
 
     # meta-methods
@@ -171,6 +173,9 @@ class Templater(AttributeClassifier):
             # attach the fast value extraction strategies
             mutable.pyre_extract = self.pyre_calculator()
             immutable.pyre_extract = self.pyre_extractor()
+        # immutable tuples are built by a function generated for my layout the first time one is
+        # needed; the generic strategy is kept around for the cases it can't handle
+        immutable.pyre_extract = self.pyre_specializer(fallback=immutable.pyre_extract)
 
         # mark them as mine
         mutable.pyre_layout = self
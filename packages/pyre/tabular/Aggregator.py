@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# superclass
+from ..patterns.AttributeClassifier import AttributeClassifier
+
+
+# declaration
+class Aggregator(AttributeClassifier):
+    """
+    Inspect pivots and harvest their reductions
+    """
+
+
+    # types
+    from .Reduction import Reduction as pyre_reduction
+
+
+    # meta-methods
+    def __new__(cls, name, bases, attributes, **kwds):
+        """
+        Build a new pivot class record
+        """
+        # build the record
+        pivot = super().__new__(cls, name, bases, attributes, **kwds)
+
+        # make a pile for the locally declared reductions
+        local = []
+        # harvest them
+        for alias, reduction in cls.pyre_harvest(attributes, cls.pyre_reduction):
+            # and add them to the pile
+            local.append(reduction)
+        # attach them
+        pivot.pyre_localReductions = tuple(local)
+
+        # now scan ancestors and accumulate the entire set of reductions
+        reductions = []
+        # for each base class
+        for base in reversed(pivot.__mro__):
+            # skip the bases that are not pivots
+            if not isinstance(base, cls): continue
+            # add the reductions declared locally in this base to the pile
+            reductions.extend(base.pyre_localReductions)
+        # attach them
+        pivot.pyre_reductions = tuple(reductions)
+
+        # all done; return the pivot
+        return pivot
+
+
+# end of file
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# superclass
+from .Reduction import Reduction
+
+
+# declaration
+class Average(Reduction):
+    """
+    The mean of the values of a measure
+    """
+
+
+    # interface
+    def partial(self, values):
+        """
+        Summarize {values} as their total and their count
+        """
+        # easy enough
+        return (sum(values), len(values))
+
+
+    def combine(self, left, right):
+        """
+        Combine the partial aggregates {left} and {right}
+        """
+        # unpack
+        leftTotal, leftCount = left
+        rightTotal, rightCount = right
+        # add up the totals and the counts
+        return (leftTotal + rightTotal, leftCount + rightCount)
+
+
+    def value(self, partial):
+        """
+        Compute the mean from a {partial} aggregate
+        """
+        # unpack
+        total, count = partial
+        # and divide
+        return total / count
+
+
+# end of file
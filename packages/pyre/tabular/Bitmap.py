@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import array
+import bisect
+import operator
+import itertools
+
+
+# declaration
+class Bitmap:
+    """
+    A compressed set of row numbers
+
+    The row numbers are split in chunks of {span} consecutive rows. Chunks with few members
+    store the offsets of their rows in a sorted {array.array}, two bytes per row; the rest are
+    stored as python integers with one bit per row. Intersections, unions and counts work on
+    entire chunks at once, so bitmaps can be combined and counted without ever building the
+    set of their rows.
+
+    Bitmaps support the set operators {&} and {|}, {len}, membership tests, and iteration over
+    their rows in increasing order. They compare equal to sets with the same rows.
+    """
+
+
+    # constants
+    span = 1 << 16 # the number of rows in a chunk
+    threshold = 4096 # the largest number of members of a chunk stored as an array
+    # translation tables between one byte per row flags and binary digits
+    digits = bytes.maketrans(b"\x00\x01", b"01")
+    flags = bytes.maketrans(b"01", b"\x00\x01")
+
+
+    # public data
+    chunks = None # a map from the chunk number to the storage of its members
+
+
+    # interface
+    def add(self, row):
+        """
+        Add {row} to my pile
+        """
+        # locate the row
+        key, offset = divmod(row, self.span)
+        # get the chunk
+        chunk = self.chunks.get(key)
+        # if there isn't one
+        if chunk is None:
+            # make one
+            self.chunks[key] = array.array("H", [offset])
+        # if it's a bitmap
+        elif isinstance(chunk, int):
+            # set the bit
+            self.chunks[key] = chunk | (1 << offset)
+        # if it's an array, and rows are being added in order
+        elif chunk[-1] < offset:
+            # add the offset at the end
+            chunk.append(offset)
+        # otherwise, if the offset is not already there
+        elif offset not in chunk:
+            # insert it in its place
+            chunk.insert(bisect.bisect(chunk, offset), offset)
+        # make sure the chunk is stored efficiently
+        self.chunks[key] = self.compact(self.chunks[key])
+        # all done
+        return self
+
+
+    def copy(self):
+        """
+        Make a copy of me
+        """
+        # make a new bitmap
+        clone = type(self)()
+        # and give it copies of my chunks; bitmaps are immutable, arrays are not
+        clone.chunks = {
+            key: chunk if isinstance(chunk, int) else array.array("H", chunk)
+            for key, chunk in self.chunks.items() }
+        # all done
+        return clone
+
+
+    # meta-methods
+    def __init__(self, rows=(), **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize my chunks
+        self.chunks = {}
+        # sort the rows
+        rows = sorted(rows)
+        # go through them one chunk at a time
+        start = 0
+        while start < len(rows):
+            # get the chunk of the first row
+            key = rows[start] // self.span
+            # the offset of this chunk
+            base = key * self.span
+            # find the first row past the end of the chunk
+            end = bisect.bisect_left(rows, base + self.span, start)
+            # compute the offsets of the rows in this chunk
+            offsets = array.array(
+                "H", map(operator.sub, rows[start:end], itertools.repeat(base)))
+            # store them
+            self.chunks[key] = self.compact(offsets)
+            # and move on
+            start = end
+        # all done
+        return
+
+
+    def __len__(self):
+        # add up the counts of all my chunks
+        return sum(map(self.count, self.chunks.values()))
+
+
+    def __bool__(self):
+        # empty chunks are never stored
+        return bool(self.chunks)
+
+
+    def __contains__(self, row):
+        # locate the row
+        key, offset = divmod(row, self.span)
+        # get the chunk
+        chunk = self.chunks.get(key)
+        # if there isn't one
+        if chunk is None:
+            # the row is not here
+            return False
+        # if it's a bitmap
+        if isinstance(chunk, int):
+            # check the bit
+            return bool(chunk >> offset & 1)
+        # otherwise, look for the offset
+        index = bisect.bisect_left(chunk, offset)
+        # and check
+        return index < len(chunk) and chunk[index] == offset
+
+
+    def __iter__(self):
+        # go through my chunks in order
+        for key in sorted(self.chunks):
+            # the offset of this chunk
+            base = key * self.span
+            # get the offsets of its members and convert them to rows
+            yield from map(operator.add, self.offsets(self.chunks[key]), itertools.repeat(base))
+        # all done
+        return
+
+
+    def __and__(self, other):
+        # make a new bitmap
+        result = type(self)()
+        # get my chunks
+        chunks = self.chunks
+        # go through the chunks of {other}
+        for key, chunk in other.chunks.items():
+            # if i don't have this one
+            if key not in chunks:
+                # skip it
+                continue
+            # otherwise, intersect
+            chunk = self.intersect(chunks[key], chunk)
+            # and if anything is left
+            if self.count(chunk):
+                # store it
+                result.chunks[key] = chunk
+        # all done
+        return result
+
+
+    def __or__(self, other):
+        # make a copy of me
+        result = self.copy()
+        # add {other} to it
+        result |= other
+        # and return it
+        return result
+
+
+    def __iand__(self, other):
+        # compute the intersection
+        result = self & other
+        # and keep its chunks
+        self.chunks = result.chunks
+        # all done
+        return self
+
+
+    def __ior__(self, other):
+        # get my chunks
+        chunks = self.chunks
+        # go through the chunks of {other}
+        for key, chunk in other.chunks.items():
+            # if i have this one
+            if key in chunks:
+                # combine the two
+                chunks[key] = self.unite(chunks[key], chunk)
+            # otherwise
+            else:
+                # make a copy
+                chunks[key] = chunk if isinstance(chunk, int) else array.array("H", chunk)
+        # all done
+        return self
+
+
+    def __eq__(self, other):
+        # if {other} is a bitmap
+        if isinstance(other, Bitmap):
+            # compare the rows
+            return list(self) == list(other)
+        # if it's a set
+        if isinstance(other, (set, frozenset)):
+            # compare the rows
+            return set(self) == other
+        # otherwise, let python decide
+        return NotImplemented
+
+
+    def __repr__(self):
+        # show the rows
+        return f"{type(self).__name__}({list(self)})"
+
+
+    # implementation details
+    @classmethod
+    def compact(cls, chunk):
+        """
+        Store {chunk} as an array if it has few members, or as a bitmap otherwise
+        """
+        # if it's a bitmap
+        if isinstance(chunk, int):
+            # leave it alone; bitmaps only get this way because they are dense
+            return chunk
+        # if the array is small enough
+        if len(chunk) <= cls.threshold:
+            # leave it alone
+            return chunk
+        # otherwise, convert it to a bitmap
+        return cls.bitmap(chunk)
+
+
+    @classmethod
+    def intersect(cls, left, right):
+        """
+        Compute the intersection of two chunks
+        """
+        # if both are arrays
+        if not isinstance(left, int) and not isinstance(right, int):
+            # intersect the offsets
+            return array.array("H", sorted(set(left).intersection(right)))
+        # if both are bitmaps
+        if isinstance(left, int) and isinstance(right, int):
+            # easy enough
+            return left & right
+        # otherwise, arrange for {left} to be the array
+        if isinstance(left, int):
+            # by swapping
+            left, right = right, left
+        # render the bitmap as a byte per row
+        flags = cls.unpack(right)
+        # and keep the offsets whose flag is set
+        return array.array("H", itertools.compress(left, map(flags.__getitem__, left)))
+
+
+    @classmethod
+    def unite(cls, left, right):
+        """
+        Compute the union of two chunks
+        """
+        # if both are arrays
+        if not isinstance(left, int) and not isinstance(right, int):
+            # if the offsets in {right} all come after the ones in {left}
+            if right[0] > left[-1]:
+                # extend a copy of {left}
+                union = array.array("H", left)
+                union.extend(right)
+            # otherwise
+            else:
+                # merge them
+                union = array.array("H", sorted(set(left).union(right)))
+            # store the result efficiently
+            return cls.compact(union)
+        # otherwise, work with bitmaps
+        return cls.bitmap(left) | cls.bitmap(right)
+
+
+    @classmethod
+    def count(cls, chunk):
+        """
+        Compute the number of members of {chunk}
+        """
+        # if it's a bitmap
+        if isinstance(chunk, int):
+            # count the set bits
+            return bin(chunk).count("1")
+        # otherwise, count the offsets
+        return len(chunk)
+
+
+    @classmethod
+    def bitmap(cls, chunk):
+        """
+        Convert {chunk} into a bitmap
+        """
+        # if it's already a bitmap
+        if isinstance(chunk, int):
+            # nothing to do
+            return chunk
+        # otherwise, make a byte per row
+        flags = bytearray(cls.span)
+        # mark the members
+        any(map(flags.__setitem__, chunk, itertools.repeat(1)))
+        # render the flags as binary digits, most significant first, and convert
+        return int(flags.translate(cls.digits)[::-1], 2)
+
+
+    @classmethod
+    def offsets(cls, chunk):
+        """
+        Build an iterable over the offsets of the members of {chunk}
+        """
+        # if it's an array
+        if not isinstance(chunk, int):
+            # it already has what we need
+            return iter(chunk)
+        # otherwise, render the bitmap as one byte per bit
+        flags = cls.unpack(chunk)
+        # and pick the offsets of the bits that are set
+        return itertools.compress(range(cls.span), flags)
+
+
+    @classmethod
+    def unpack(cls, chunk):
+        """
+        Render the bitmap {chunk} as one byte per row, set to one for the rows that are members
+        """
+        # render the bits as binary digits, least significant first, convert them to flags, and
+        # pad with the rows past the most significant set bit
+        return bin(chunk)[:1:-1].encode().translate(cls.flags).ljust(cls.span, b"\x00")
+
+
+# end of file
@@ -6,6 +6,9 @@
 #
 
 
+# externals
+import operator
+import functools
 # metaclass
 from .Surveyor import Surveyor
 
@@ -24,6 +27,11 @@ class Chart(metaclass=Surveyor):
     Charts are used by pivot tables as a means of imposing structure on the data and
     precomputing data slices. See {pyre.tabular.Pivot} and the {pyre.tabular.Dimension}
     subclasses for more details.
+
+    The bins of each dimension are bitmaps of row numbers. They are built the first time the
+    dimension is accessed through a chart instance, and they are brought up to date with the
+    rows that were appended to the sheet since on every subsequent access. Changes to existing
+    rows are not tracked; call {pyre_refresh} to have the bins rebuilt.
     """
 
 
@@ -32,6 +40,8 @@ class Chart(metaclass=Surveyor):
     pyre_sheets = None # map of local aliases to sheets
     pyre_dimensions = None # the complete list of my dimensions
     pyre_localDimensions = None # the locally declared ones
+    # instance attributes
+    pyre_axes = None # a map from my dimensions to their bins
 
 
     # interface
@@ -42,9 +52,41 @@ class Chart(metaclass=Surveyor):
         restrict the data set
         """
         # identify the relevant bins
-        bins = (getattr(self, name)[value] for name, value in kwds.items())
-        # build and return the restriction
-        return set.intersection(*bins)
+        first, *rest = ( getattr(self, name)[value] for name, value in kwds.items() )
+        # if there is only one
+        if not rest:
+            # hand out a copy, so my bins are not affected
+            return first.copy()
+        # otherwise, build and return the restriction
+        return functools.reduce(operator.and_, rest, first)
+
+
+    def pyre_axis(self, dimension):
+        """
+        Retrieve the bins of {dimension}, building them if necessary
+        """
+        # look through my axes
+        axis = self.pyre_axes.get(dimension)
+        # if this is the first time {dimension} is accessed
+        if axis is None:
+            # bin my sheet
+            axis = self.pyre_axes[dimension] = dimension.axis(chart=self, dimension=dimension)
+        # otherwise
+        else:
+            # bin any rows that were added since the last time
+            axis.sync()
+        # all done
+        return axis
+
+
+    def pyre_refresh(self):
+        """
+        Discard the bins of my dimensions, so they are rebuilt the next time they are accessed
+        """
+        # clear my axes
+        self.pyre_axes.clear()
+        # all done
+        return self
 
 
     # meta-methods
@@ -53,6 +95,8 @@ class Chart(metaclass=Surveyor):
         super().__init__(**kwds)
         # save the sheet i am bound to
         self.sheet = sheet
+        # initialize the map of the bins of my dimensions
+        self.pyre_axes = {}
         # all done
         return
 
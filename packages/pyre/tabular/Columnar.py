@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import array
+import functools
+# superclass
+from .Sheet import Sheet
+
+
+# declaration
+class Columnar(Sheet):
+    """
+    A sheet that stores the values of each one of its fields in a separate column
+
+    Regular sheets store their data as a list of record instances, which is convenient but
+    expensive for large data sets, since every value is a separate python object and every row
+    is a tuple. Columnar sheets store numeric measures in typed arrays, and replace strings and
+    other measures with few distinct values by codes into a table of their distinct values. The
+    record instances are built on demand, whenever a row is accessed, and charts work on the
+    columns directly.
+
+    Columns whose values don't fit in their typed storage, e.g. integer columns with missing
+    values, are transferred to plain lists the first time such a value is encountered. The rows
+    of columnar sheets are immutable.
+    """
+
+
+    # types
+    from .Vector import Vector as pyre_vector
+    from .Dictionary import Dictionary as pyre_dictionary
+
+    # public data
+    pyre_stores = None # the storage for my columns
+    # the measures that are stored in typed arrays, and their typecodes
+    pyre_typecodes = {"int": "q", "float": "d"}
+    # the measures that are dictionary encoded
+    pyre_encoded = {"str", "bool", "date"}
+
+
+    # interface
+    def pyre_append(self, row):
+        """
+        Add the given {row} to my data set
+        """
+        # get my columns
+        stores = self.pyre_stores
+        # go through the values in the row
+        for column, value in enumerate(row):
+            # carefully
+            try:
+                # add the value to its column
+                stores[column].append(value)
+            # if it doesn't fit
+            except (TypeError, OverflowError):
+                # move the column to storage that can hold anything
+                store = stores[column] = stores[column].demote()
+                # and try again
+                store.append(value)
+        # all done
+        return self
+
+
+    def pyre_extend(self, rows):
+        """
+        Populate my data set with {rows} whose values have already been converted
+        """
+        # my columns don't need record instances
+        for row in rows:
+            # so add the values directly
+            self.pyre_append(row=row)
+        # all done
+        return self
+
+
+    def pyre_mutable(self, data):
+        """
+        Columnar sheets don't store mutable records
+        """
+        # get the journal
+        import journal
+        # complain
+        raise journal.firewall('pyre.tabular').log("columnar sheets can't hold mutable records")
+
+
+    def pyre_new(self):
+        """
+        Columnar sheets don't store mutable records
+        """
+        # get the journal
+        import journal
+        # complain
+        raise journal.firewall('pyre.tabular').log("columnar sheets can't hold mutable records")
+
+
+    def pyre_values(self, column, start=0):
+        """
+        Build an iterable over the values in the given {column}, starting with row {start}
+        """
+        # delegate to the storage
+        return self.pyre_stores[column].values(start=start)
+
+
+    def pyre_categorize(self, column, start=0):
+        """
+        Build a map from the distinct values in {column} to the bitmap of the rows that contain
+        them, starting with row {start}
+        """
+        # get the storage
+        store = self.pyre_stores[column]
+        # if it is dictionary encoded
+        if isinstance(store, self.pyre_dictionary):
+            # it can work with the codes
+            return store.categorize(start=start)
+        # otherwise, go through the values
+        return super().pyre_categorize(column=column, start=start)
+
+
+    @classmethod
+    def pyre_allocate(cls, field):
+        """
+        Build the storage for the values of {field}
+        """
+        # get the type of the field
+        typename = field.typename
+        # if it's one of the encoded types
+        if typename in cls.pyre_encoded:
+            # make a dictionary
+            return cls.pyre_dictionary()
+        # if it's one of the numeric types
+        if typename in cls.pyre_typecodes:
+            # make a typed array
+            return cls.pyre_vector(data=array.array(cls.pyre_typecodes[typename]))
+        # otherwise, make a plain list
+        return cls.pyre_vector()
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # make storage for my columns
+        self.pyre_stores = [ self.pyre_allocate(field=field) for field in self.pyre_fields ]
+        # and replace the list of records with a view over them
+        self.pyre_data = self.rows(stores=self.pyre_stores, record=self.pyre_immutableTuple)
+        # all done
+        return
+
+
+    # implementation details
+    class rows:
+        """
+        Access to the columns of a sheet as a sequence of immutable record instances
+        """
+
+        # meta-methods
+        def __init__(self, stores, record, **kwds):
+            # chain up
+            super().__init__(**kwds)
+            # save the columns
+            self.stores = stores
+            # the values in the columns have already been converted, so build the instances by
+            # invoking the tuple constructor directly
+            self.build = functools.partial(tuple.__new__, record)
+            # all done
+            return
+
+        def __len__(self):
+            # get the columns
+            stores = self.stores
+            # all of them have the same length
+            return len(stores[0]) if stores else 0
+
+        def __iter__(self):
+            # walk the columns in parallel and assemble the rows
+            return map(self.build, zip(*self.stores))
+
+        def __getitem__(self, row):
+            # if the request is for a range of rows
+            if isinstance(row, slice):
+                # assemble the rows in it, just like lists of records do; not all stores can be
+                # sliced, so go through the indices
+                return [ self[index] for index in range(len(self))[row] ]
+            # otherwise, assemble the requested row
+            return self.build(store[row] for store in self.stores)
+
+
+# end of file
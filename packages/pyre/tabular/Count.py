@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# superclass
+from .Reduction import Reduction
+
+
+# declaration
+class Count(Reduction):
+    """
+    The number of rows; no measure is necessary
+    """
+
+
+    # interface
+    def partial(self, values):
+        """
+        Summarize {values}
+        """
+        # count them
+        return len(values)
+
+
+    def combine(self, left, right):
+        """
+        Combine the partial aggregates {left} and {right}
+        """
+        # add them
+        return left + right
+
+
+# end of file
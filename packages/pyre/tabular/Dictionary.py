@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# externals
+import array
+# support
+from .Bitmap import Bitmap
+from .Vector import Vector
+
+
+# declaration
+class Dictionary:
+    """
+    Storage for the values of a column of a columnar sheet that replaces each value with its
+    rank in a table of the distinct values in the column
+
+    This is a good fit for strings and other measures with few distinct values, such as
+    product codes or dates: each distinct value is stored once, and the rows hold small
+    integers. Categorizing the rows by value works directly on the codes
+    """
+
+
+    # public data
+    codes = None # the rank of the value of each row in my {table}
+    table = None # the distinct values, in the order they were encountered
+    index = None # a map from the distinct values to their rank
+
+
+    # interface
+    def append(self, value):
+        """
+        Add {value} to my pile
+        """
+        # get my index
+        index = self.index
+        # look up the code of this value; unhashable values raise a {TypeError}, which tells my
+        # client to {demote} me
+        code = index.get(value)
+        # if this is the first time i've seen it
+        if code is None:
+            # assign it the next available code
+            code = index[value] = len(self.table)
+            # and add it to the table
+            self.table.append(value)
+        # record the code
+        self.codes.append(code)
+        # all done
+        return
+
+
+    def values(self, start=0):
+        """
+        Build an iterable over my values, starting with row {start}
+        """
+        # translate the codes
+        return map(self.table.__getitem__, self.codes[start:] if start else self.codes)
+
+
+    def categorize(self, start=0):
+        """
+        Build a map from each of my distinct values to the bitmap of the rows that contain it,
+        starting with row {start}
+        """
+        # make a pile of rows for each code
+        bins = [ [] for _ in self.table ]
+        # grab their {append}
+        appenders = [ bin.append for bin in bins ]
+        # go through the codes
+        for row, code in enumerate(self.codes[start:] if start else self.codes, start):
+            # and place each row in its pile
+            appenders[code](row)
+        # assemble the map
+        return { value: Bitmap(rows) for value, rows in zip(self.table, bins) if rows }
+
+
+    def demote(self):
+        """
+        Build a copy of me that can hold values of any type
+        """
+        # transfer my values to a list
+        return Vector(data=list(self))
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # initialize my containers
+        self.codes = array.array("I")
+        self.table = []
+        self.index = {}
+        # all done
+        return
+
+
+    def __len__(self):
+        # easy enough
+        return len(self.codes)
+
+
+    def __iter__(self):
+        # translate the codes
+        return self.values()
+
+
+    def __getitem__(self, row):
+        # look up the code of the value in {row} and translate it
+        return self.table[self.codes[row]]
+
+
+# end of file
@@ -19,6 +19,17 @@ class Dimension:
 
     # public data
     measure = None # the sheet descriptor to bin
+    rejected = object() # the label of the rows that don't belong in any bin
+
+
+    # interface
+    def classify(self, sheet, start=0):
+        """
+        Build an iterable over the labels of the bins of the rows of {sheet}, starting with row
+        {start}
+        """
+        # must be overridden
+        raise NotImplementedError(f"class '{type(self).__name__}' must implement 'classify'")
 
 
     # meta-methods
@@ -17,12 +17,22 @@ class Inferred(Dimension):
     """
 
 
+    # interface
+    def classify(self, sheet, start=0):
+        """
+        Build an iterable over the labels of the bins of the rows of {sheet}, starting with row
+        {start}
+        """
+        # the bins are labeled by the values of my measure
+        return sheet.pyre_values(column=sheet.pyre_columns[self.measure], start=start)
+
+
     # meta-methods
     def __get__(self, chart, cls):
         # if I am being accessed through an instance
         if chart:
-            # bin my measure over the chart and return it
-            return self.axis(chart=chart, dimension=self)
+            # ask it for the bins of my measure
+            return chart.pyre_axis(dimension=self)
         # otherwise, just return myself
         return self
 
@@ -30,6 +40,36 @@ class Inferred(Dimension):
     # implementation details
     class axis(dict):
 
+        # interface
+        def sync(self):
+            """
+            Bin the rows that were added to the sheet since the last time
+            """
+            # get the sheet
+            sheet = self.sheet
+            # the first row that hasn't been binned
+            start = self.count
+            # if there is nothing to do
+            if start == len(sheet):
+                # bail
+                return self
+            # mark the rows that are about to be binned
+            self.count = len(sheet)
+            # ask the sheet to classify the new rows by the value of my column
+            for value, rows in sheet.pyre_categorize(column=self.column, start=start).items():
+                # get the bin of this value
+                bin = self.get(value)
+                # if there isn't one
+                if bin is None:
+                    # use the new rows
+                    self[value] = rows
+                # otherwise
+                else:
+                    # add the new rows to it
+                    bin |= rows
+            # all done
+            return self
+
         # meta-methods
         def __init__(self, chart, dimension, **kwds):
             # chain up
@@ -39,17 +79,15 @@ class Inferred(Dimension):
             sheet = chart.sheet
             # the measure
             measure = dimension.measure
+            # save the sheet
+            self.sheet = sheet
             # and my column number
-            column = sheet.pyre_columns[measure]
-
-            # get the records
-            for row, record in enumerate(sheet.pyre_data):
-                # get the value of my column
-                value = record[column]
-                # get the set of rows that have the same value
-                rows = self.setdefault(value, set())
-                # add this one to the set
-                rows.add(row)
+            self.column = sheet.pyre_columns[measure]
+            # no rows have been binned yet
+            self.count = 0
+
+            # bin the rows
+            self.sync()
 
             # all done
             return
@@ -18,12 +18,36 @@ class Interval(Dimension):
     """
 
 
+    # interface
+    def classify(self, sheet, start=0):
+        """
+        Build an iterable over the labels of the bins of the rows of {sheet}, starting with row
+        {start}
+        """
+        # the geometry of my bins
+        low, high = self.interval
+        subdivisions = self.subdivisions
+        width = (high - low) / subdivisions
+        # the label of the values that fall outside my interval
+        rejected = self.rejected
+
+        # go through the values of my measure
+        for value in sheet.pyre_values(column=sheet.pyre_columns[self.measure], start=start):
+            # bin it
+            rank = int((value - low)/width)
+            # the bins are labeled by their rank; check whether it falls within my bounds
+            yield rank if 0 <= rank < subdivisions else rejected
+
+        # all done
+        return
+
+
     # meta-methods
     def __get__(self, chart, cls):
         # if I am being accessed through an instance
         if chart:
-            # bin my measure over the chart and return it
-            return self.axis(chart=chart, dimension=self)
+            # ask it for the bins of my measure
+            return chart.pyre_axis(dimension=self)
         # otherwise, just return myself
         return self
 
@@ -42,6 +66,47 @@ class Interval(Dimension):
     # implementation details
     class axis:
 
+        # interface
+        def sync(self):
+            """
+            Bin the rows that were added to the sheet since the last time
+            """
+            # get the sheet
+            sheet = self.sheet
+            # the first row that hasn't been binned
+            first = self.count
+            # if there is nothing to do
+            if first == len(sheet):
+                # bail
+                return self
+            # mark the rows that are about to be binned
+            self.count = len(sheet)
+            # get my dimension
+            dimension = self.dimension
+            # and the label of the rows that fall outside its interval
+            rejected = dimension.rejected
+
+            # make a pile for the rows that go in each bin
+            piles = tuple([] for bin in range(dimension.subdivisions))
+            # go through the ranks of the bins of the new rows
+            for row, rank in enumerate(dimension.classify(sheet=sheet, start=first), first):
+                # if the row falls outside my bounds
+                if rank is rejected:
+                    # reject it
+                    self.rejects.append(row)
+                # otherwise
+                else:
+                    # place it in its pile
+                    piles[rank].append(row)
+
+            # go through my bins
+            for bin, pile in zip(self.bins, piles):
+                # and add the new rows to them
+                bin |= sheet.pyre_bitmap(pile)
+
+            # all done
+            return self
+
         # meta-methods
         def __init__(self, chart, dimension, **kwds):
             # chain up
@@ -49,35 +114,20 @@ class Interval(Dimension):
 
             # get the sheet
             sheet = chart.sheet
-            # the measure
-            measure = dimension.measure
-            # and my column number
-            column = sheet.pyre_columns[measure]
-
-            # the geometry of my bins
-            start, end = dimension.interval
-            subdivisions = dimension.subdivisions
-            width = (end - start) / subdivisions
+            # save it
+            self.sheet = sheet
+            # and my dimension
+            self.dimension = dimension
+            # no rows have been binned yet
+            self.count = 0
 
             # build my bins
-            self.bins = tuple(set() for bin in range(subdivisions))
+            self.bins = tuple(sheet.pyre_bitmap() for bin in range(dimension.subdivisions))
             # and a list of records that were rejected because they are outside my interval
             self.rejects = []
 
-            # get the records
-            for row, record in enumerate(sheet.pyre_data):
-                # get the value of my measure
-                value = record[column]
-                # bin it
-                rank = int((value - start)/width)
-                # check whether it falls within my bounds
-                if 0 <= rank < subdivisions:
-                    # place it in its bin
-                    self.bins[rank].add(row)
-                # otherwise
-                else:
-                    # reject it
-                    self.rejects.append(row)
+            # bin the rows
+            self.sync()
 
             # all done
             return
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# superclass
+from .Reduction import Reduction
+
+
+# declaration
+class Minimum(Reduction):
+    """
+    The smallest of the values of a measure
+    """
+
+
+    # interface
+    def partial(self, values):
+        """
+        Summarize {values}
+        """
+        # find the smallest
+        return min(values)
+
+
+    def combine(self, left, right):
+        """
+        Combine the partial aggregates {left} and {right}
+        """
+        # pick the smaller one
+        return min(left, right)
+
+
+# end of file
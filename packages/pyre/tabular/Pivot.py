@@ -6,10 +6,198 @@
 #
 
 
-class Pivot:
+# externals
+import itertools
+# metaclass
+from .Aggregator import Aggregator
+
+
+# declaration
+class Pivot(metaclass=Aggregator):
     """
     The base class for reorganizing the information content of tables
+
+    A pivot summarizes the facts in a sheet using the coördinate system imposed on it by a
+    chart. Each combination of the bins of the dimensions of the chart is a cell of the cube;
+    the reductions declared by the pivot are evaluated over the rows in each cell. For
+    example, given a chart of sales transactions with {date} and {sku} dimensions, the pivot
+
+        class totals(pyre.tabular.pivot):
+            revenue = pyre.tabular.sum(sales.sale)
+            transactions = pyre.tabular.count()
+
+    computes the revenue and the number of transactions of each sku on each date.
+
+    The cube is computed in a single pass over the sheet, when the pivot is instantiated. The
+    cells store partial aggregates, so rows that were appended to the sheet since are folded
+    into the cube the next time it is accessed without revisiting the rest, and cells can be
+    rolled up along any subset of the dimensions. Changes to existing rows are not tracked.
     """
 
 
+    # public data
+    # class attributes, common to all instances of a given pivot
+    pyre_reductions = None # the complete list of my reductions
+    pyre_localReductions = None # the locally declared ones
+    # instance attributes
+    chart = None # the chart whose coördinate system i use
+    pyre_cells = None # a map from the coördinates of the cells to their partial aggregates
+    pyre_count = 0 # the number of rows that are already in the cube
+
+
+    # interface
+    def pyre_results(self, reduction):
+        """
+        Build a map from the coördinates of each cell to the value of {reduction}
+        """
+        # fold in any rows that were added since the last time
+        self.pyre_sync()
+        # find the partial aggregates of the reduction
+        index = self.pyre_reductions.index(reduction)
+        # compute its value in each cell
+        return {
+            cell: reduction.value(partials[index]) for cell, partials in self.pyre_cells.items() }
+
+
+    def pyre_rollup(self, **kwds):
+        """
+        Combine the cells whose coördinates match the bin labels in {kwds}, a specification of
+        the bin for each dimension that is to be used to restrict the cube; returns a map from
+        the names of my reductions to their values, or {None} for all of them if no cell matches
+        """
+        # fold in any rows that were added since the last time
+        self.pyre_sync()
+        # get my chart
+        chart = type(self.chart)
+        # and its dimensions
+        dimensions = chart.pyre_dimensions
+        # convert the restrictions into pairs of positions and bin labels
+        restrictions = tuple(
+            (dimensions.index(getattr(chart, name)), label) for name, label in kwds.items())
+        # get my reductions
+        reductions = self.pyre_reductions
+
+        # initialize the totals
+        totals = None
+        # go through the cells
+        for cell, partials in self.pyre_cells.items():
+            # skip the ones that don't match
+            if any(cell[position] != label for position, label in restrictions): continue
+            # if this is the first match
+            if totals is None:
+                # start with it
+                totals = partials
+            # otherwise
+            else:
+                # fold it in
+                totals = [
+                    reduction.combine(total, partial)
+                    for reduction, total, partial in zip(reductions, totals, partials) ]
+
+        # if nothing matched
+        if totals is None:
+            # there are no values
+            return dict.fromkeys(reduction.name for reduction in reductions)
+        # otherwise, compute the values
+        return {
+            reduction.name: reduction.value(total)
+            for reduction, total in zip(reductions, totals) }
+
+
+    def pyre_sync(self):
+        """
+        Fold the rows that were added to the sheet since the last time into the cube
+        """
+        # get my chart
+        chart = self.chart
+        # and its sheet
+        sheet = chart.sheet
+        # the first row that isn't in the cube
+        first = self.pyre_count
+        # if there is nothing to do
+        if first == len(sheet):
+            # bail
+            return self
+        # mark the rows that are about to be aggregated
+        self.pyre_count = len(sheet)
+
+        # get the dimensions of the chart
+        dimensions = chart.pyre_dimensions
+        # and my reductions
+        reductions = self.pyre_reductions
+        # the label of the rows that fall outside of the bins of a dimension
+        rejected = dimensions[0].rejected if dimensions else None
+
+        # build an iterable over the coördinates of the new rows
+        coordinates = zip(
+            *(dimension.classify(sheet=sheet, start=first) for dimension in dimensions)
+            ) if dimensions else itertools.repeat((), len(sheet) - first)
+        # sort the new rows into cells
+        cells = {}
+        # by going through their coördinates
+        for row, cell in enumerate(coordinates):
+            # and adding each row to the pile of its cell
+            cells.setdefault(cell, []).append(row)
+
+        # pull the values of the measures of the new rows, once per measure; the descriptors
+        # overload the comparison operators, so they can't be trusted as keys
+        columns = {}
+        # go through my reductions
+        for reduction in reductions:
+            # get the measure
+            measure = reduction.measure
+            # if there is one and we haven't seen it before
+            if measure is not None and id(measure) not in columns:
+                # get its values
+                columns[id(measure)] = list(sheet.pyre_values(
+                    column=sheet.pyre_columns[measure], start=first))
+
+        # get the cube
+        cube = self.pyre_cells
+        # go through the new cells
+        for cell, rows in cells.items():
+            # skip the ones with rows that fall outside the bins of some dimension
+            if any(label is rejected for label in cell): continue
+            # make a pile for the partial aggregates
+            partials = []
+            # go through my reductions
+            for reduction in reductions:
+                # get the measure
+                measure = reduction.measure
+                # reductions without a measure work with the rows; the rest with their values
+                values = rows if measure is None else list(
+                    map(columns[id(measure)].__getitem__, rows))
+                # summarize
+                partials.append(reduction.partial(values=values))
+            # look for the cell in the cube
+            current = cube.get(cell)
+            # if it's not there
+            if current is None:
+                # add it
+                cube[cell] = partials
+            # otherwise
+            else:
+                # fold in the new rows
+                cube[cell] = [
+                    reduction.combine(old, new)
+                    for reduction, old, new in zip(reductions, current, partials) ]
+
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, chart, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the chart i am bound to
+        self.chart = chart
+        # initialize the cube
+        self.pyre_cells = {}
+        # and compute it
+        self.pyre_sync()
+        # all done
+        return
+
+
 # end of file
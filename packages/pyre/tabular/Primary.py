@@ -6,6 +6,8 @@
 #
 
 
+# externals
+import itertools
 # super class
 from .Column import Column
 
@@ -54,16 +56,8 @@ class Primary(Column):
         """
         Build my value index
         """
-        # initialize the index
-        index = {}
-        # go through all the rows in my sheet
-        for row, record in enumerate(self.sheet.pyre_data):
-            # get the value of my field
-            value = record[self.index]
-            # map the value to the row number
-            index[value] = row
-        # all done
-        return index
+        # map the values in my column to their row numbers
+        return dict(zip(self.sheet.pyre_values(self.index), itertools.count()))
 
 
 # end of file
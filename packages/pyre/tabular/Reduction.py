@@ -10,7 +10,70 @@ class Reduction:
     """
     The base class for all record aggregators that compute a single value from a set of records
     from a given sheet
+
+    Reductions are declared as attributes of pivots. They don't work on the records directly;
+    instead, the pivot hands them the values of their {measure} in each cell of the cube, they
+    summarize them in a partial aggregate, and {combine} partial aggregates when rows are added
+    to a cell, or when cells are rolled up. The value of the reduction is computed from the
+    partial aggregate on demand. Accessing a reduction through a pivot instance returns a map
+    from the cells of the cube to the value of the reduction.
     """
 
 
+    # public data
+    name = None # my name in the pivot that declares me
+    measure = None # the sheet descriptor to reduce
+
+
+    # interface
+    def partial(self, values):
+        """
+        Summarize {values}, a non-empty list with the values of my measure in a cell
+        """
+        # must be overridden
+        raise NotImplementedError(f"class '{type(self).__name__}' must implement 'partial'")
+
+
+    def combine(self, left, right):
+        """
+        Combine the partial aggregates {left} and {right}
+        """
+        # must be overridden
+        raise NotImplementedError(f"class '{type(self).__name__}' must implement 'combine'")
+
+
+    def value(self, partial):
+        """
+        Compute my value from a {partial} aggregate
+        """
+        # by default, they are the same
+        return partial
+
+
+    # meta-methods
+    def __init__(self, measure=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my measure
+        self.measure = measure
+        # all done
+        return
+
+
+    def __set_name__(self, pivot, name):
+        # record my name
+        self.name = name
+        # all done
+        return
+
+
+    def __get__(self, pivot, cls):
+        # if i am being accessed through an instance
+        if pivot:
+            # ask it for my values
+            return pivot.pyre_results(reduction=self)
+        # otherwise
+        return self
+
+
 # end of file
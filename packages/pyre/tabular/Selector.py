@@ -30,8 +30,8 @@ class Selector(records.selector):
         if sheet is None: return self.field
 
         # otherwise, this is access to a sheet instance
-        # if I manage a primary field
-        if self.field._primary:
+        # if I manage a primary field; derivations are never primary
+        if getattr(self.field, "_primary", False):
             # make an indexed column and return it
             return self.primary(sheet=sheet, field=self.field, index=self.index)
         # otherwise, bind a regular column selector to this instance and return it
@@ -6,6 +6,10 @@
 #
 
 
+# externals
+import functools
+import operator
+import itertools
 # superclass
 from .. import records
 # metaclass
@@ -19,6 +23,9 @@ class Sheet(records.record, metaclass=Tabulator):
     """
 
 
+    # types
+    from .Bitmap import Bitmap as pyre_bitmap
+
     # public data
     pyre_name = None
     pyre_data = None # the list of records
@@ -55,6 +62,22 @@ class Sheet(records.record, metaclass=Tabulator):
         return self
 
 
+    def pyre_extend(self, rows):
+        """
+        Populate my data set with {rows} whose values have already been converted, e.g. by a
+        csv reader that parsed them in parallel
+        """
+        # the values are already converted, so build the records by invoking the tuple
+        # constructor directly
+        build = functools.partial(tuple.__new__, self.pyre_immutableTuple)
+        # go through the rows
+        for row in rows:
+            # make a record and add it to my data set
+            self.pyre_append(row=build(row))
+        # all done
+        return self
+
+
     def pyre_append(self, row):
         """
         Add the given {row} to my data set
@@ -79,6 +102,29 @@ class Sheet(records.record, metaclass=Tabulator):
         return record
 
 
+    def pyre_values(self, column, start=0):
+        """
+        Build an iterable over the values in the given {column}, starting with row {start}
+        """
+        # pull the values out of my records
+        return map(operator.itemgetter(column), itertools.islice(self.pyre_data, start, None))
+
+
+    def pyre_categorize(self, column, start=0):
+        """
+        Build a map from the distinct values in {column} to the bitmap of the rows that contain
+        them, starting with row {start}
+        """
+        # initialize the map
+        bins = {}
+        # go through the values in the column
+        for row, value in enumerate(self.pyre_values(column=column, start=start), start):
+            # get the pile of rows that have the same value and add this one to it
+            bins.setdefault(value, []).append(row)
+        # convert the piles to bitmaps
+        return { value: self.pyre_bitmap(rows) for value, rows in bins.items() }
+
+
     @classmethod
     def pyre_offset(cls, measure):
         """
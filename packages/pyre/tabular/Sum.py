@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# superclass
+from .Reduction import Reduction
+
+
+# declaration
+class Sum(Reduction):
+    """
+    The total of the values of a measure
+    """
+
+
+    # interface
+    def partial(self, values):
+        """
+        Summarize {values}
+        """
+        # add them up
+        return sum(values)
+
+
+    def combine(self, left, right):
+        """
+        Combine the partial aggregates {left} and {right}
+        """
+        # add them
+        return left + right
+
+
+# end of file
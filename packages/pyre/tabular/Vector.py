@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+# declaration
+class Vector:
+    """
+    Storage for the values of a column of a columnar sheet
+
+    The values are kept in {data}, a mutable sequence: a typed {array.array} for numeric
+    measures, or a plain {list} for everything else. Typed arrays store their values unboxed
+    and expose them through the buffer protocol, so they can be shared with extensions without
+    copying
+    """
+
+
+    # public data
+    data = None # the container with my values
+
+
+    # interface
+    def values(self, start=0):
+        """
+        Build an iterable over my values, starting with row {start}
+        """
+        # easy enough
+        return iter(self.data[start:] if start else self.data)
+
+
+    def demote(self):
+        """
+        Build a copy of me that can hold values of any type
+        """
+        # transfer my values to a list
+        return Vector(data=list(self.data))
+
+
+    # meta-methods
+    def __init__(self, data=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my container
+        self.data = [] if data is None else data
+        # and grab its {append}; this is called once per row, so avoid the extra call
+        self.append = self.data.append
+        # all done
+        return
+
+
+    def __len__(self):
+        # easy enough
+        return len(self.data)
+
+
+    def __iter__(self):
+        # also easy
+        return iter(self.data)
+
+
+    def __getitem__(self, row):
+        # also easy
+        return self.data[row]
+
+
+# end of file
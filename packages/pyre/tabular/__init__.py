@@ -39,6 +39,8 @@ tuple = measure.tuple
 
 # access to the basic objects in this package
 from .Sheet import Sheet as sheet
+from .Columnar import Columnar as columnar
+from .Bitmap import Bitmap as bitmap
 
 # dimensions
 from .Inferred import Inferred as inferred
@@ -46,6 +48,15 @@ from .Interval import Interval as interval
 # support for charts
 from .Chart import Chart as chart
 
+# reductions
+from .Sum import Sum as sum
+from .Count import Count as count
+from .Average import Average as average
+from .Minimum import Minimum as min
+from .Maximum import Maximum as max
+# support for pivots
+from .Pivot import Pivot as pivot
+
 # reading and writing
 # the records class
 record = records.record
@@ -56,6 +67,7 @@ csv = records.csv
 # the metaclasses
 from .Tabulator import Tabulator as tabulator
 from .Surveyor import Surveyor as surveyor
+from .Aggregator import Aggregator as aggregator
 
 
 # end of file
@@ -29,6 +29,8 @@ pyrepg:
 components:
 	${PYTHON} ./postgres_database.py
 	${PYTHON} ./postgres_attach.py
+	${PYTHON} ./postgres_stream.py
+	${PYTHON} ./postgres_load.py
 	${PYTHON} ./postgres_database_create.py
 	${PYTHON} ./postgres_table.py
 	${PYTHON} ./postgres_reserved.py
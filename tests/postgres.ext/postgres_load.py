@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that the batches of a load are shipped within a single transaction, using a stand-in for
+the extension so that no server is required
+"""
+
+
+import pyre.db
+
+
+class Event(pyre.db.table, id="events"):
+    """
+    Simple event table
+    """
+    # the data fields
+    id = pyre.db.int().primary()
+    source = pyre.db.int().notNull()
+    label = pyre.db.str()
+
+
+class Extension:
+    """
+    A stand-in for the postgres extension that keeps track of transactions and bulk copies
+    """
+
+    def connect(self, spec):
+        # nothing to connect to
+        return "connection"
+
+    def disconnect(self, connection):
+        # nothing to do
+        return
+
+    def execute(self, connection, sql):
+        # record the command
+        self.commands.append(sql)
+        # and return an empty result
+        return ()
+
+    def copy(self, connection, command, data):
+        # if this is the batch that is supposed to fail
+        if "event {}".format(self.failure) in data:
+            # complain, like the server does
+            raise pyre.db.exceptions.IntegrityError(description="duplicate key value")
+        # record the command
+        self.commands.append(command)
+        # and the rows
+        self.rows.extend(data.splitlines())
+        # all done
+        return
+
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the commands i executed
+        self.commands = []
+        # the rows i received
+        self.rows = []
+        # the id of the event whose batch fails
+        self.failure = None
+        # all done
+        return
+
+
+def events(count):
+    """
+    Generate {count} events
+    """
+    # easy enough
+    return (
+        Event.pyre_immutable(id=id, source=id % 3, label="event {}".format(id))
+        for id in range(count))
+
+
+def transactions(commands):
+    """
+    Extract the transaction control commands from {commands}
+    """
+    # easy enough
+    return [ command for command in commands if command.startswith(("START", "COMMIT", "ROLL")) ]
+
+
+def test():
+    # install the stand-in
+    pyre.db.postgres.postgres = extension = Extension()
+    # build a database component
+    db = pyre.db.postgres(name="load").attach()
+
+    # load some events
+    assert db.load(events(10), batch=3) == 10
+    # verify they were shipped in batches
+    assert sum(command.startswith("COPY") for command in extension.commands) == 4
+    assert len(extension.rows) == 10
+    # within a single transaction
+    assert transactions(extension.commands) == ["START TRANSACTION;", "COMMIT;"]
+    # which is over
+    assert db.transaction is False
+
+    # start over
+    extension.commands.clear()
+    # arrange for the third batch to fail
+    extension.failure = 7
+    # load again
+    try:
+        # this should fail
+        db.load(events(10), batch=3)
+        # so we shouldn't get here
+        assert False, "unreachable"
+    # if it did
+    except pyre.db.exceptions.IntegrityError:
+        # no problem
+        pass
+    # verify the batches that made it were rolled back
+    assert transactions(extension.commands) == ["START TRANSACTION;", "ROLLBACK;"]
+    assert db.transaction is False
+
+    # start over
+    extension.commands.clear()
+    extension.failure = None
+    # loads join transactions in progress
+    with db:
+        # so the client decides when to commit
+        db.load(events(10), batch=3)
+    # verify
+    assert transactions(extension.commands) == ["START TRANSACTION;", "COMMIT;"]
+
+    # detach
+    db.detach()
+    # all done
+    return db
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
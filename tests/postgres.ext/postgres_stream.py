@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that work done while a result set is being streamed joins the transaction that holds its
+cursor, using a stand-in for the extension so that no server is required
+"""
+
+
+import re
+import pyre.db
+
+
+class Event(pyre.db.table, id="events"):
+    """
+    Simple event table
+    """
+    # the data fields
+    id = pyre.db.int().primary()
+    source = pyre.db.int().notNull()
+    label = pyre.db.str()
+
+
+class Extension:
+    """
+    A stand-in for the postgres extension that keeps track of transactions and cursors
+    """
+
+    # the rows of the event table
+    rows = [ (id, id % 3, "event {}".format(id)) for id in range(10) ]
+
+    def connect(self, spec):
+        # nothing to connect to
+        return "connection"
+
+    def disconnect(self, connection):
+        # nothing to do
+        return
+
+    def execute(self, connection, sql):
+        # record the command
+        self.commands.append(sql)
+        # transaction control
+        if sql.startswith("START TRANSACTION"):
+            # mark the beginning of the transaction
+            self.transaction = True
+            # and bail
+            return ()
+        if sql.startswith("COMMIT") or sql.startswith("ROLLBACK"):
+            # the transaction is over, and so are its cursors
+            self.transaction = False
+            self.cursors.clear()
+            # and bail
+            return ()
+        # cursors
+        if sql.startswith("DECLARE"):
+            # cursors only live within transactions
+            assert self.transaction
+            # make one
+            self.cursors[sql.split()[1]] = list(self.rows)
+            # and bail
+            return ()
+        if sql.startswith("FETCH"):
+            # parse the command
+            count, name = re.match(r"FETCH FORWARD (\d+) FROM (\w+);", sql).groups()
+            # look up the cursor
+            cursor = self.cursors.get(name)
+            # if it's not there
+            if cursor is None:
+                # complain, like the server does
+                raise pyre.db.exceptions.ProgrammingError(
+                    command=sql, diagnostic="cursor {!r} does not exist".format(name))
+            # grab a batch
+            rows, cursor[:] = cursor[:int(count)], cursor[int(count):]
+            # and return it, along with the headers
+            return (("id", "source", "label"),) + tuple(rows)
+        # everything else succeeds trivially
+        return ()
+
+    def prepare(self, connection, name, template):
+        # nothing to do
+        return
+
+    def executePrepared(self, connection, name, parameters):
+        # record the parameters
+        self.parameters.append(parameters)
+        # and return an empty result
+        return ()
+
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the commands i executed
+        self.commands = []
+        # the parameters of the prepared statements
+        self.parameters = []
+        # whether there is a transaction in progress
+        self.transaction = False
+        # the open cursors
+        self.cursors = {}
+        # all done
+        return
+
+
+def test():
+    # install the stand-in
+    pyre.db.postgres.postgres = extension = Extension()
+    # build a database component
+    db = pyre.db.postgres(name="stream").attach()
+
+    # stream the events
+    events = []
+    for event in db.stream(Event, fetch=4):
+        # record it
+        events.append(event.id)
+        # after the first one
+        if event.id == 0:
+            # insert records that need more than one statement
+            db.insert(
+                Event.pyre_immutable(id=10, source=0, label="event 10"),
+                Event.pyre_immutable(id=11, source=1, label=Event.null),
+                )
+            # and do more work in a block
+            with db:
+                db.insert(Event.pyre_immutable(id=12, source=2, label="event 12"))
+    # verify all events were retrieved
+    assert events == list(range(10))
+    # the inserts went through
+    assert len(extension.parameters) == 3
+    # as part of the transaction that held the cursor
+    assert [ command for command in extension.commands
+             if command.startswith(("START", "COMMIT", "ROLLBACK")) ] == [
+                 "START TRANSACTION;", "COMMIT;" ]
+    # which is over
+    assert db.transaction is False
+    assert extension.transaction is False
+
+    # detach
+    db.detach()
+    # all done
+    return db
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
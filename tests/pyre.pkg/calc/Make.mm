@@ -46,6 +46,7 @@ expressions:
 	${PYTHON} ./expression_circular.py
 	${PYTHON} ./expression_syntaxerror.py
 	${PYTHON} ./expression_typeerror.py
+	${PYTHON} ./expression_cache.py
 
 interpolations:
 	${PYTHON} ./interpolation.py
@@ -57,6 +58,8 @@ memo:
 	${PYTHON} ./memo_model.py
 	${PYTHON} ./memo_expression.py
 	${PYTHON} ./memo_interpolation.py
+	${PYTHON} ./memo_batch.py
+	${PYTHON} ./memo_engine.py
 
 hierarchical:
 	${PYTHON} ./hierarchical.py
@@ -64,6 +67,7 @@ hierarchical:
 	${PYTHON} ./hierarchical_alias.py
 	${PYTHON} ./hierarchical_group.py
 	${PYTHON} ./hierarchical_contains.py
+	${PYTHON} ./hierarchical_find.py
 
 model:
 	${PYTHON} ./model.py
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that formulas are compiled once and shared among the nodes that use them
+"""
+
+
+def test():
+    import pyre.calc
+
+    # get the formula cache
+    compiler = pyre.calc.compiler()
+
+    # build a couple of models
+    one = pyre.calc.model()
+    two = pyre.calc.model()
+    # with a couple of nodes
+    for model, home in [(one, "/opt/pyre"), (two, "/usr/local")]:
+        model["pyre.home"] = home
+        model["cost"] = 80.
+    # clear the cache
+    compiler.clear()
+    # and build some nodes that use the same formulas
+    for model in (one, two):
+        model["pyre.bin"] = model.interpolation("{pyre.home}/bin")
+        model["price"] = model.expression("{cost} + 20")
+    # the formulas were compiled once
+    assert compiler.misses == 2
+    # and reused for the second model
+    assert compiler.hits == 2
+
+    # check that each model resolved the names on its own
+    assert one["pyre.bin"] == "/opt/pyre/bin"
+    assert two["pyre.bin"] == "/usr/local/bin"
+    assert one["price"] == 100
+    # and that changes still propagate
+    two["cost"] = 100.
+    assert two["price"] == 120
+
+    # formulas without references are remembered as well
+    node = one.interpolation("{{pyre.home}}")
+    assert node.value == "{pyre.home}"
+    node = two.interpolation("{{pyre.home}}")
+    assert node.value == "{pyre.home}"
+    assert compiler.misses == 3
+    assert compiler.hits == 3
+
+    # the same text means different things as an expression and as an interpolation
+    one["label"] = "cost"
+    one["tag"] = one.interpolation("{label}+1")
+    one["sum"] = one.expression("{label}+1")
+    assert one["tag"] == "cost+1"
+    try:
+        one["sum"]
+        assert False
+    except one.EvaluationError:
+        pass
+
+    # errors are not cached
+    size = compiler.size
+    misses = compiler.misses
+    for model in (one, two):
+        try:
+            model.expression("{cost")
+            assert False
+        except model.ExpressionSyntaxError:
+            pass
+    assert compiler.size == size
+    assert compiler.misses == misses + 2
+
+    # check that the cache evicts the least recently used entries
+    compiler.clear()
+    compiler.capacity, capacity = 2, compiler.capacity
+    one.expression("{cost} + 1")
+    one.expression("{cost} + 2")
+    one.expression("{cost} + 1")
+    one.expression("{cost} + 3")
+    assert compiler.size == 2
+    one.expression("{cost} + 1")
+    assert compiler.hits == 2
+    one.expression("{cost} + 2")
+    assert compiler.misses == 4
+    # restore the capacity
+    compiler.capacity = capacity
+
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # run the test
+    test()
+
+
+# end of file
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that node searches by name visit only the relevant portion of the model
+"""
+
+
+def test():
+    import pyre.calc
+
+    # create a model
+    model = pyre.calc.model()
+
+    # register the nodes
+    model["pyre.user.name"] = "Michael Aïvázis"
+    model["pyre.user.email"] = "michael.aivazis@orthologue.com"
+    model["pyre.user.affiliation"] = "orthologue"
+    model["pyre.hostmap.cloud"] = "cloud.*"
+    model["pyre.hostmap.box"] = "box.*"
+    model["pyre.home"] = "/opt/pyre"
+    model["pyrex.home"] = "/opt/pyrex"
+    model["merlin.home"] = "/opt/merlin"
+    # and an alias
+    model.alias(alias="χρήστης", target="pyre.user")
+
+    # look for everything
+    names = [ info.name for info, _ in model.find() ]
+    # check we got all the nodes, sorted
+    assert names == [
+        "merlin.home",
+        "pyre.home",
+        "pyre.hostmap.box", "pyre.hostmap.cloud",
+        "pyre.user.affiliation", "pyre.user.email", "pyre.user.name",
+        "pyrex.home",
+        ]
+
+    # look for the nodes in a namespace
+    names = [ info.name for info, _ in model.find(pattern=r"pyre\.hostmap\.") ]
+    assert names == [ "pyre.hostmap.box", "pyre.hostmap.cloud" ]
+    # partial level names are fine
+    names = [ info.name for info, _ in model.find(pattern="pyre") ]
+    assert len(names) == 7
+    # and so are patterns with wildcards
+    names = [ info.name for info, _ in model.find(pattern=r"pyre.*\.home") ]
+    assert names == [ "pyre.home", "pyrex.home" ]
+    # as well as alternatives
+    names = [ info.name for info, _ in model.find(pattern=r"(merlin|pyrex)\.home") ]
+    assert names == [ "merlin.home", "pyrex.home" ]
+    # nodes are reported under their canonical names only
+    names = [ info.name for info, _ in model.find(pattern="χρήστης") ]
+    assert names == []
+    # non-existent namespaces have no nodes
+    names = [ info.name for info, _ in model.find(pattern=r"journal\.") ]
+    assert names == []
+
+    # the caller can specify a different order
+    names = [
+        info.name for info, _ in model.find(pattern=r"pyre\.user\.", key=lambda info: info.name[::-1])
+        ]
+    assert names == [ "pyre.user.name", "pyre.user.email", "pyre.user.affiliation" ]
+
+    # new nodes show up in the right spot
+    model["pyre.hostmap.attic"] = "attic.*"
+    names = [ info.name for info, _ in model.find(pattern=r"pyre\.hostmap\.") ]
+    assert names == [ "pyre.hostmap.attic", "pyre.hostmap.box", "pyre.hostmap.cloud" ]
+
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # run the test
+    test()
+
+
+# end of file
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that batched notifications invalidate the dependents of modified nodes
+"""
+
+
+def test():
+    # access the package
+    import pyre.calc
+    # set up the model
+    model = pyre.calc.model()
+
+    # build a long chain of nodes
+    depth = 5000
+    model["n0"] = 0
+    for idx in range(1, depth):
+        model[f"n{idx}"] = model.expression(f"{{n{idx-1}}} + 1")
+    # and a couple of nodes that fan in
+    model["a"] = 1
+    model["b"] = 2
+    model["s"] = model.expression("{a} + {b}")
+    model["p"] = model.expression("{a} * {s}")
+
+    # compute the values, going up the chain one link at a time so we stay clear of the
+    # recursion limit
+    for idx in range(depth):
+        assert model[f"n{idx}"] == idx
+    assert model["s"] == 3
+    assert model["p"] == 3
+
+    # get the nodes
+    s = model.retrieve("s")
+    p = model.retrieve("p")
+    tail = model.retrieve(f"n{depth-1}")
+    # verify they are clean
+    assert s.dirty is False
+    assert p.dirty is False
+    assert tail.dirty is False
+
+    # make a batch of changes
+    with model.batch():
+        # modify the head of the chain
+        model.retrieve("n0").value = 1
+        # and both fan in nodes
+        model.retrieve("a").value = 2
+        model.retrieve("b").value = 3
+        # the notifications have not been delivered yet
+        assert tail.dirty is False
+        # but reading a value in the middle of the block forces them through
+        assert model["s"] == 5
+        # so everybody that depends on the changes is now dirty
+        assert tail.dirty is True
+        assert p.dirty is True
+        # make another change
+        model.retrieve("a").value = 3
+
+    # verify the dependents of the last change were invalidated
+    assert s.dirty is True
+    assert p.dirty is True
+    # and check the values
+    assert model["s"] == 6
+    assert model["p"] == 18
+    for idx in range(depth):
+        assert model[f"n{idx}"] == idx + 1
+
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that deep reference chains can be evaluated without exhausting the python stack
+"""
+
+# externals
+import sys
+
+
+def test():
+    # access the package
+    import pyre.calc
+    # get the evaluation engine and clear its counters
+    engine = pyre.calc.engine().reset()
+    # set up the model
+    model = pyre.calc.model()
+
+    # build a chain that is much deeper than the recursion limit
+    depth = 4 * sys.getrecursionlimit()
+    model["n0"] = 0
+    for idx in range(1, depth):
+        model[f"n{idx}"] = model.expression(f"{{n{idx-1}}} + 1")
+
+    # evaluate the tail of the chain
+    assert model[f"n{depth-1}"] == depth - 1
+    # every node was evaluated exactly once
+    assert engine.evaluations == depth
+    # and the engine kept track of the time it took
+    assert engine.elapsed > 0
+
+    # make a change at the head of the chain; batch the notifications, since delivering them
+    # one observer at a time would also recurse through the entire chain
+    with model.batch():
+        model["n0"] = 1
+    # and evaluate again
+    assert model[f"n{depth-1}"] == depth
+
+    # errors deep in the graph are still reported by the nodes that encounter them
+    model["production"] = 80.
+    model["shipping"] = "twenty"
+    model["cost"] = model.expression("{production} + {shipping}")
+    model["price"] = model.expression("2 * {cost}")
+    # evaluate
+    try:
+        model["price"]
+        assert False
+    except model.EvaluationError as error:
+        pass
+
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
@@ -30,6 +30,8 @@ configurator:
 	${PYTHON} ./configurator_load_pml.py
 	${PYTHON} ./configurator_load_cfg.py
 	${PYTHON} ./configurator_load_pfg.py
+	${PYTHON} ./configurator_deferred.py
+	${PYTHON} ./configurator_cache.py
 
 commandline:
 	${PYTHON} ./command.py
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that configuration events are replayed from the cache of precompiled sources
+"""
+
+
+def test():
+    # externals
+    import os
+    import sys
+    import tempfile
+    # access the framework
+    import pyre
+
+    # get the pyre executive
+    executive = pyre.executive
+    # gain access to the configurator
+    configurator = executive.configurator
+    # its cache
+    cache = configurator.cache
+    # the nameserver
+    ns = executive.nameserver
+    # and the codec
+    pfg = configurator.codec(encoding="pfg")
+
+    # cache files are not written if the interpreter is not allowed to write bytecode, so save
+    # the current policy
+    policy = sys.dont_write_bytecode
+    # and override it
+    sys.dont_write_bytecode = False
+
+    # make a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # the name of the configuration file
+        uri = os.path.join(scratch, "cache.pfg")
+        # make it
+        with open(uri, "w") as stream:
+            # and populate it
+            print("cache.user:", file=stream)
+            print("  name = alec", file=stream)
+            print("  email = alec@orthologue.com", file=stream)
+
+        # save the counters
+        hits = cache.hits
+        misses = cache.misses
+        # load the configuration
+        pyre.loadConfiguration(uri)
+        # verify it had to be decoded
+        assert cache.misses == misses + 1
+        # and that the values made it to the store
+        assert ns["cache.user.name"] == "alec"
+        assert ns["cache.user.email"] == "alec@orthologue.com"
+        # verify the cache file is there
+        assert os.path.isfile(cache.path(source=uri))
+
+        # make a locator
+        locator = pyre.tracking.simple(source="while testing the cache")
+        # decode the file again
+        with open(uri) as source:
+            # through the cache
+            events = cache.decode(codec=pfg, uri=uri, source=source, locator=locator)
+        # verify this time it was retrieved from the cache
+        assert cache.hits == hits + 1
+        # check the events
+        assert [event.key for event in events] == [
+            ["cache", "user", "name"], ["cache", "user", "email"]]
+        assert [event.value for event in events] == ["alec", "alec@orthologue.com"]
+        # and their locators
+        assert [str(event.locator.source) for event in events] == [uri, uri]
+        assert [event.locator.line for event in events] == [2, 3]
+
+        # events may also refer to the locator supplied by the client; make one
+        assignment = configurator.events.Assignment(
+            key=["cache", "user", "tag"], value="client", locator=locator)
+        # identify the source
+        with open(uri) as source:
+            stamp = cache.stamp(codec=pfg, source=source)
+        # save the event
+        cache.save(path=cache.path(source=uri), stamp=stamp, locator=locator, events=[assignment])
+        # make a different locator
+        other = pyre.tracking.simple(source="while testing the cache again")
+        # retrieve the events
+        replay, = cache.load(path=cache.path(source=uri), stamp=stamp, locator=other)
+        # verify the client locator was replaced
+        assert replay.locator is other
+        assert replay.value == "client"
+
+        # modify the file
+        with open(uri, "w") as stream:
+            # change the settings
+            print("cache.user:", file=stream)
+            print("  name = alec aïvázis", file=stream)
+        # load the configuration
+        pyre.loadConfiguration(uri)
+        # verify it had to be decoded again
+        assert cache.misses == misses + 2
+        # and that the store was updated
+        assert ns["cache.user.name"] == "alec aïvázis"
+
+        # make another configuration file
+        uri = os.path.join(scratch, "nocache.pfg")
+        with open(uri, "w") as stream:
+            print("nocache.user:", file=stream)
+            print("  name = alec", file=stream)
+        # ask the configurator not to write cache files
+        ns[configurator.cachekey] = "no"
+        # load the configuration
+        pyre.loadConfiguration(uri)
+        # verify it was decoded
+        assert ns["nocache.user.name"] == "alec"
+        # but not saved
+        assert not os.path.exists(cache.path(source=uri))
+        # allow it again, but ask the interpreter not to write bytecode
+        ns[configurator.cachekey] = "yes"
+        sys.dont_write_bytecode = True
+        # load the configuration
+        pyre.loadConfiguration(uri)
+        # verify it wasn't saved either
+        assert not os.path.exists(cache.path(source=uri))
+        # restore the interpreter setting
+        sys.dont_write_bytecode = False
+        # load the configuration once more
+        pyre.loadConfiguration(uri)
+        # verify it was saved this time
+        assert os.path.isfile(cache.path(source=uri))
+
+    # restore the interpreter policy
+    sys.dont_write_bytecode = policy
+
+    # all done
+    return executive
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
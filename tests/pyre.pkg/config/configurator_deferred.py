@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Measure the cost of configuring many component instances against a large number of conditional
+assignments
+"""
+
+
+def test():
+    # externals
+    import os
+    import tempfile
+    # access the framework
+    import pyre
+    # and the journal
+    import journal
+
+    # the number of instances
+    instances = 10000
+    # the families of the decoy conditional assignments
+    decoys = ["bench.widget", "bench.gizmo", "bench.doohickey"]
+
+    # declare a component
+    class gadget(pyre.component, family="bench.gadget"):
+        """a component with a couple of traits"""
+        size = pyre.properties.int(default=0)
+        tag = pyre.properties.str(default="none")
+
+    # make a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # build the name of the configuration file
+        uri = os.path.join(scratch, "bench.cfg")
+        # open it
+        with open(uri, "w") as stream:
+            # go through the instances
+            for idx in range(instances):
+                # write a conditional assignment that applies to it
+                print(f"[ bench.gadget # bench.g{idx} ]", file=stream)
+                print(f"size = {idx}", file=stream)
+                print(f"tag = g{idx}", file=stream)
+                # and a few that don't
+                for family in decoys:
+                    print(f"[ {family} # bench.g{idx} ]", file=stream)
+                    print(f"size = -1", file=stream)
+                    print(f"tag = {family}", file=stream)
+        # load the configuration
+        pyre.loadConfiguration(uri)
+
+    # make a timer
+    timer = pyre.timers.wall(name="tests.config.deferred")
+    # start it
+    timer.start()
+    # instantiate the components
+    gadgets = [ gadget(name=f"bench.g{idx}") for idx in range(instances) ]
+    # stop the timer
+    timer.stop()
+
+    # verify the assignments landed where they should
+    for idx, instance in enumerate(gadgets):
+        assert instance.size == idx
+        assert instance.tag == f"g{idx}"
+
+    # make a channel
+    channel = journal.debug("pyre.config.deferred")
+    # activate it
+    # channel.activate()
+    # report
+    channel.log(f"configured {instances} instances in {timer.ms()}ms")
+
+    # all done
+    return gadgets
+
+
+# main
+if __name__ == "__main__":
+    # do...
+    test()
+
+
+# end of file
@@ -28,6 +28,7 @@ tables:
 	${PYTHON} ./table_instantiation.py
 	${PYTHON} ./table_insert.py
 	${PYTHON} ./table_update.py
+	${PYTHON} ./table_templates.py
 
 queries:
 	${PYTHON} ./query_star.py
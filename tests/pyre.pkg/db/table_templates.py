@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Exercise building statement templates with parameters instead of literal values
+"""
+
+
+def test():
+    # access the package
+    import pyre.db
+
+    # declare the customer table
+    class Customer(pyre.db.table, id='customers'):
+        """
+        Simple customer table
+        """
+        # the data fields
+        cid = pyre.db.int().primary()
+        name = pyre.db.str().notNull()
+        balance = pyre.db.decimal(precision=7, scale=2).setDefault(0)
+
+    # and a query
+    class debtors(pyre.db.query, customer=Customer):
+        # the fields
+        name = customer.name
+        # the restriction
+        where = (customer.balance < 0)
+
+    # get a server
+    server = pyre.db.server(name="test")
+    # and its mill
+    sql = server.sql
+
+    # build an insertion template
+    template, parameters = sql.template(statement=sql.insertRecords(
+        Customer.pyre_immutable(cid=1023, name="Bit Twiddle", balance=1000)))
+    # print(template)
+    assert template == "\n".join((
+        "INSERT INTO customers",
+        "    (cid, name, balance)",
+        "  VALUES",
+        "    (?, ?, ?);",
+        ))
+    assert parameters == (1023, "Bit Twiddle", "1000")
+    # the special values are rendered literally
+    template, parameters = sql.template(statement=sql.insertRecords(
+        Customer.pyre_immutable(cid=1024, name="Eva Lu Ator", balance=Customer.default)),
+        placeholder="${}")
+    # print(template)
+    assert template.endswith("($1, $2, DEFAULT);")
+    assert parameters == (1024, "Eva Lu Ator")
+
+    # build the template for bulk insertions
+    template, parameters = sql.template(
+        statement=sql.insertParameters(table=Customer), placeholder="${}")
+    # print(template)
+    assert template == "\n".join((
+        "INSERT INTO customers",
+        "    (cid, name, balance)",
+        "  VALUES",
+        "    ($1, $2, $3);",
+        ))
+    assert parameters == ()
+
+    # build an update template
+    eva = pyre.db.template(Customer)
+    eva.balance = Customer.null
+    eva.name = "Eva Lu Ator"
+    template, parameters = sql.template(
+        statement=sql.updateRecords(template=eva, condition=(Customer.cid == 1024)),
+        placeholder="${}")
+    # print(template)
+    assert template == "\n".join((
+        "UPDATE customers",
+        "  SET",
+        "    (name, balance) = ($1, NULL)",
+        "  WHERE ((cid) = ($2));",
+        ))
+    assert parameters == ("Eva Lu Ator", 1024)
+
+    # build a query template
+    template, parameters = sql.template(statement=sql.select(debtors))
+    # print(template)
+    assert template == "\n".join((
+        "SELECT",
+        "    customer.name AS name",
+        "  FROM",
+        "    customers AS customer",
+        "  WHERE",
+        "    ((customer.balance) < (?));",
+        ))
+    assert parameters == (0,)
+
+    # verify that the mill is back to rendering literals
+    assert tuple(sql.select(debtors))[-1] == "    ((customer.balance) < (0));"
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
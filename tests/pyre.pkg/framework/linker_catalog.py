@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that the linker remembers the outcome of attempts to load shelves
+"""
+
+
+def test():
+    # externals
+    import os
+    import tempfile
+    # framework
+    import pyre
+    # and its parts
+    executive = pyre.executive
+    linker = executive.linker
+    # get the catalog
+    catalog = linker.catalog
+
+    # make a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # save the current working directory
+        cwd = os.getcwd()
+        # and move to the scratch area
+        os.chdir(scratch)
+        # make a folder for the persistent store, so that saving the catalog doesn't modify
+        # the folder with the shelves
+        os.mkdir("cache")
+        # carefully
+        try:
+            # resolve a module that doesn't exist
+            assert tuple(executive.resolve(uri="import:nomodule.nosymbol")) == ()
+            # save the counters
+            probes = catalog.probes
+            hits = catalog.hits
+            # verify the misses were recorded
+            assert catalog.known("import:nomodule.nosymbol") is False
+            assert catalog.known("import:nomodule") is False
+            # try again
+            assert tuple(executive.resolve(uri="import:nomodule.nosymbol")) == ()
+            # verify that nothing was probed
+            assert catalog.probes == probes
+            # because the catalog knew about the missing candidates
+            assert catalog.hits > hits
+
+            # now, a file that doesn't exist yet
+            assert tuple(executive.resolve(uri="file:catalog_sample.py/factory")) == ()
+            # verify the miss was recorded
+            assert catalog.known("file:catalog_sample.py") is False
+            # make the file
+            with open("catalog_sample.py", "w") as stream:
+                # with a component in it
+                print("import pyre", file=stream)
+                print("class factory(pyre.component): pass", file=stream)
+            # save the counters
+            invalidations = catalog.invalidations
+            # try again
+            factory, *_ = executive.resolve(uri="file:catalog_sample.py/factory")
+            # verify we got what we asked for
+            assert issubclass(factory, pyre.component)
+            # and that the stale entry was discarded
+            assert catalog.invalidations > invalidations
+            # and replaced
+            assert catalog.known("file:catalog_sample.py") is True
+
+            # persist the catalog
+            catalog.save(path="cache/catalog.json")
+            # make a new one
+            clone = linker.newCatalog(path="cache/catalog.json")
+            # and load it
+            clone.load()
+            # verify it knows what the original knows
+            assert clone.size == catalog.size
+            assert clone.known("import:nomodule") is False
+            assert clone.known("file:catalog_sample.py") is True
+            # remove the file
+            os.remove("catalog_sample.py")
+            # start a new round of lookups
+            clone.refresh()
+            # and verify the entry is no longer valid
+            assert clone.known("file:catalog_sample.py") is None
+
+            # forget the persistent store
+            catalog.path = None
+        # no matter what
+        finally:
+            # go back to where we started
+            os.chdir(cwd)
+
+    # all done
+    return executive
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+# (c) 1998-2023 all rights reserved
+
+
+"""
+Verify that rasters can be traversed in tiles that cover their extent, recycle their buffers,
+stop reading when abandoned, and report the errors of the reader
+"""
+
+
+# support
+import itertools
+import math
+import threading
+
+
+# stand-ins for the parts of a dataset that rasters interact with
+class Space:
+    """
+    The shape of the dataset
+    """
+
+    def __init__(self, shape, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save the shape
+        self.shape = shape
+        self.rank = len(shape)
+        # all done
+        return
+
+
+class Handle:
+    """
+    The dataset handle; each cell holds its offset from the beginning of the dataset
+    """
+
+    def read(self, data, memtype, shape, origin):
+        # if this is the tile that is supposed to fail
+        if list(origin) == self.failure:
+            # complain
+            raise ValueError(f"could not read the tile @{origin}")
+        # count the reads
+        self.reads += 1
+        # get the extent
+        extent = self.space.shape
+        # go through the cells of the tile, in row major order
+        for cell, index in enumerate(
+            itertools.product(*(range(start, start + span) for start, span in zip(origin, shape)))
+        ):
+            # compute the offset of the cell from the beginning of the dataset
+            offset = 0
+            for span, position in zip(extent, index):
+                offset = offset * span + position
+            # and store it
+            data[cell] = offset
+        # all done
+        return
+
+    def __init__(self, shape, chunks=(), failure=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my layout
+        self.space = Space(shape=shape)
+        self.chunks = chunks
+        # the origin of the tile that can't be read
+        self.failure = failure
+        # the number of successful reads
+        self.reads = 0
+        # all done
+        return
+
+
+class Type:
+    """
+    The in-memory type of the dataset
+    """
+
+    # the hdf5 type
+    htype = "double"
+
+    def heap(self, cells):
+        # count the allocations
+        self.allocations += 1
+        # make a buffer
+        return [None] * cells
+
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the number of buffers i have allocated
+        self.allocations = 0
+        # all done
+        return
+
+
+class Layout:
+    """
+    The schema of the dataset
+    """
+
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # my in-memory type
+        self.memtype = Type()
+        # all done
+        return
+
+
+class Dataset:
+    """
+    A dataset with the given {shape} and {chunks}
+    """
+
+    def __init__(self, shape, chunks=(), failure=None, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # make a handle
+        self._pyre_id = Handle(shape=shape, chunks=chunks, failure=failure)
+        # and a layout
+        self._pyre_layout = Layout()
+        # all done
+        return
+
+
+# the driver
+def test():
+    # support
+    from pyre.h5.typed.Raster import Raster
+
+    # make a chunked dataset whose extent is not a multiple of its chunks
+    dataset = Dataset(shape=(10, 7), chunks=(4, 3))
+    # and a raster
+    raster = Raster(dataset=dataset)
+    # make a pile for the values, indexed by their offset
+    cells = [None] * 70
+    # go through the tiles, which follow the chunks by default
+    for tile in raster.tiles():
+        # go through the cells
+        for offset, value in enumerate(tile.data[:math.prod(tile.shape)]):
+            # convert the offset into an index into the dataset
+            row, col = divmod(offset, tile.shape[1])
+            row, col = tile.origin[0] + row, tile.origin[1] + col
+            # verify this cell hasn't been seen before
+            assert cells[row * 7 + col] is None
+            # and record its value
+            cells[row * 7 + col] = value
+    # verify the tiles cover the dataset exactly
+    assert cells == list(range(70))
+    # with one read per tile
+    assert dataset._pyre_id.reads == 3 * 3
+
+    # make a larger dataset with uniform tiles
+    dataset = Dataset(shape=(64, 8))
+    # and a raster
+    raster = Raster(dataset=dataset)
+    # the number of tiles to read ahead
+    prefetch = 2
+    # the buffers we have seen
+    buffers = set()
+    # go through the tiles
+    for count, tile in enumerate(raster.tiles(shape=(4, 8), prefetch=prefetch), start=1):
+        # the offset of the first cell of the tile
+        start = 8 * tile.origin[0]
+        # verify the contents
+        assert tile.data == list(range(start, start + 32))
+        # and record the buffer
+        buffers.add(id(tile.data))
+    # verify we saw all the tiles
+    assert count == 16
+    # but the buffers were recycled: besides the ones waiting in the queue, there is one being
+    # read and one in the hands of the client
+    assert dataset._pyre_layout.memtype.allocations <= prefetch + 2
+    assert len(buffers) <= prefetch + 2
+
+    # abandon an iteration after the first tile
+    dataset = Dataset(shape=(64, 8))
+    raster = Raster(dataset=dataset)
+    tiles = raster.tiles(shape=(1, 8), prefetch=prefetch)
+    # get the first tile
+    next(tiles)
+    # and lose interest
+    tiles.close()
+    # verify the reader is gone
+    assert not any(thread.name == "pyre.h5.raster" for thread in threading.enumerate())
+    # and it stopped reading early
+    assert dataset._pyre_id.reads < 64
+
+    # make a dataset with a tile that can't be read
+    dataset = Dataset(shape=(64, 8), failure=[8, 0])
+    raster = Raster(dataset=dataset)
+    # the tiles we got
+    origins = []
+    # carefully
+    try:
+        # go through the tiles
+        for tile in raster.tiles(shape=(4, 8)):
+            # and record their origin
+            origins.append(tile.origin)
+        # this should be unreachable
+        assert False, "unreachable"
+    # the reader's error should have been raised here
+    except ValueError as error:
+        # check the message
+        assert str(error) == "could not read the tile @[8, 0]"
+    # verify we got the tiles before the bad one
+    assert origins == [[0, 0], [4, 0]]
+    # and the reader is gone
+    assert not any(thread.name == "pyre.h5.raster" for thread in threading.enumerate())
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # drive
+    test()
+
+
+# end of file
@@ -11,7 +11,7 @@ include pyre.def
 
 all: test
 
-test: sanity channels scheduler selector clean
+test: sanity channels scheduler selector poller clean
 
 sanity:
 	${PYTHON} ./sanity.py
@@ -22,11 +22,14 @@ sanity:
 channels:
 	${PYTHON} ./pickler_over_pipe.py
 	${PYTHON} ./pickler_over_tcp.py
+	${PYTHON} ./pickler_buffers.py
 
 scheduler:
 	${PYTHON} ./scheduler.py
 	${PYTHON} ./scheduler_instantiation.py
 	${PYTHON} ./scheduler_alarms.py
+	${PYTHON} ./scheduler_cancel.py
+	${PYTHON} ./scheduler_throughput.py
 
 selector:
 	${PYTHON} ./selector.py
@@ -36,5 +39,10 @@ selector:
 	${PYTHON} ./selector_pickler_over_pipe.py
 	${PYTHON} ./selector_pickler_over_tcp.py
 
+poller:
+	${PYTHON} ./poller_pickler_over_pipe.py
+	${PYTHON} ./poller_exceptions.py
+	${PYTHON} ./poller_throughput.py
+
 
 # end of file
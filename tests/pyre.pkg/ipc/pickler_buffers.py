@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that the pickler ships large buffers out of band, over both pipes and sockets
+"""
+
+
+# externals
+import os
+import pickle
+import socket
+import pyre.ipc
+
+
+def test():
+    # make a pickler
+    m = pyre.ipc.newPickler()
+    # a payload with a couple of large buffers, a small one, and some regular objects; objects
+    # that own memory, such as {numpy} arrays, expose it to the pickler as {PickleBuffer}
+    # instances
+    payload = {
+        "large": pickle.PickleBuffer(bytearray(os.urandom(3*1024*1024))),
+        "medium": pickle.PickleBuffer(bytearray(b"x" * 2*m.threshold)),
+        "small": pickle.PickleBuffer(bytearray(b"small")),
+        "blob": os.urandom(1024),
+        "tag": "payload",
+        }
+
+    # verify that the pickler separates the large buffers from the rest of the payload
+    buffers = []
+    pickle.dumps(payload, protocol=m.protocol, buffer_callback=m.collect(buffers=buffers))
+    assert [ buffer.nbytes for buffer in buffers ] == [3*1024*1024, 2*m.threshold]
+
+    # make a pair of pipes
+    parent, child = pyre.ipc.pipe()
+    # fork
+    pid = os.fork()
+    # in the child
+    if pid == 0:
+        # bounce the payload back and forth a few times
+        for _ in range(3):
+            m.send(m.recv(child), child)
+        # and exit without running the parent's cleanup
+        os._exit(0)
+    # in the parent, send the payload and check what comes back
+    for _ in range(3):
+        # send it
+        m.send(payload, parent)
+        # get the response
+        echo = m.recv(parent)
+        # and check it
+        check(payload=payload, echo=echo)
+    # wait for the child to exit
+    _, status = os.waitpid(pid, 0)
+    # verify it was happy
+    assert status == 0
+    # clean up
+    parent.close()
+    child.close()
+
+    # now make a pair of connected sockets
+    left, right = socket.socketpair()
+    # and wrap them as channels
+    from pyre.ipc.SocketTCP import SocketTCP
+    left = SocketTCP(left.family, left.type, left.proto, fileno=left.detach())
+    right = SocketTCP(right.family, right.type, right.proto, fileno=right.detach())
+    # fork
+    pid = os.fork()
+    # in the child
+    if pid == 0:
+        # echo the payload
+        m.send(m.recv(right), right)
+        # and exit
+        os._exit(0)
+    # in the parent, send the payload
+    m.send(payload, left)
+    # check what comes back
+    check(payload=payload, echo=m.recv(left))
+    # wait for the child to exit
+    _, status = os.waitpid(pid, 0)
+    # verify it was happy
+    assert status == 0
+
+    # finally, verify that a closed channel is detected
+    right.close()
+    # by attempting to read from its peer
+    try:
+        # this should fail
+        m.recv(left)
+        # so we shouldn't get here
+        assert False, "unreachable"
+    # if it fails as expected
+    except EOFError:
+        # all good
+        pass
+    # clean up
+    left.close()
+
+    # all done
+    return m
+
+
+def check(payload, echo):
+    """
+    Verify that {echo} is a faithful copy of {payload}
+    """
+    # check the regular objects
+    assert echo["tag"] == payload["tag"]
+    assert echo["blob"] == payload["blob"]
+    # and the buffers
+    for name in ["large", "medium", "small"]:
+        assert bytes(echo[name]) == bytes(payload[name])
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
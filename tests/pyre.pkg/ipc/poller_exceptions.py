@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that the poller invokes exception handlers when urgent data arrive on a descriptor that
+is not watched for anything else, even when the descriptor is too large for {select}
+"""
+
+# externals
+import os
+import resource
+import socket
+import pyre.ipc
+
+
+# the largest descriptor the {select} system call can handle on most platforms
+FD_SETSIZE = 1024
+
+
+# a minimal channel
+class endpoint:
+    """A stand-in for a channel that reads from and writes to the given descriptors"""
+
+    def __init__(self, inbound, outbound=None):
+        self.inbound = inbound
+        self.outbound = outbound
+        return
+
+
+def test():
+    # we need a large descriptor; get the resource limits
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    # if the hard limit is larger than the current one
+    if hard == resource.RLIM_INFINITY or hard > soft:
+        # raise the soft limit as much as we can
+        limit = 1 << 16 if hard == resource.RLIM_INFINITY else hard
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+        # and update
+        soft = limit
+    # pick a descriptor beyond the reach of {select}, if we can
+    large = min(2 * FD_SETSIZE, soft - 1)
+
+    # make a listener
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    # connect to it
+    client = socket.create_connection(listener.getsockname())
+    # and accept the connection
+    server, _ = listener.accept()
+    # move the server side to the large descriptor
+    fd = os.dup2(server.fileno(), large)
+
+    # carefully
+    try:
+        # build the dispatcher
+        dispatcher = pyre.ipc.newPoller()
+        # the urgent data received
+        received = []
+        # the exception handler
+        def urgent(channel, **kwds):
+            # get a socket for the descriptor without taking ownership of it
+            peer = socket.socket(fileno=os.dup(channel.inbound))
+            # read the urgent byte
+            received.append(peer.recv(1, socket.MSG_OOB))
+            # clean up
+            peer.close()
+            # stop the dispatcher
+            dispatcher.stop()
+            # and stop watching this channel
+            return False
+        # register it
+        dispatcher.whenException(channel=endpoint(inbound=fd), call=urgent)
+
+        # a timer that stops the dispatcher if the handler is never invoked
+        def expire(**kwds):
+            # stop the dispatcher
+            dispatcher.stop()
+            # and don't reschedule
+            return
+        # set it
+        alarm = dispatcher.alarm(interval=5*dispatcher.second, call=expire)
+
+        # send some ordinary data, which is not exceptional
+        client.send(b"ordinary")
+        # followed by an urgent byte
+        client.send(b"!", socket.MSG_OOB)
+        # watch
+        dispatcher.watch()
+        # verify the handler was invoked exactly once
+        assert received == [b"!"]
+        # cancel the alarm
+        dispatcher.cancel(alarm)
+        # and verify the dispatcher has nothing left to watch
+        dispatcher.watch()
+
+        # the ordinary data are still there
+        assert server.recv(16) == b"ordinary"
+    # no matter what happens
+    finally:
+        # close everything
+        os.close(fd)
+        for sock in [server, client, listener]:
+            sock.close()
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Compare the throughput of the poller and the selector in the presence of idle channels
+"""
+
+# externals
+import os
+import resource
+import pyre.ipc
+
+# if necessary
+import journal
+channel = journal.debug("poller.throughput")
+# channel.active = True
+
+
+# the largest descriptor the {select} system call can handle on most platforms
+FD_SETSIZE = 1024
+
+
+# a minimal channel
+class endpoint:
+    """A stand-in for a channel that reads from and writes to the given descriptors"""
+
+    def __init__(self, inbound, outbound=None):
+        self.inbound = inbound
+        self.outbound = outbound
+        return
+
+
+def measure(factory, idle, rounds):
+    """
+    Use the dispatcher built by {factory} to ping a descriptor {rounds} times while another
+    {idle} descriptors are being watched; returns the elapsed time in seconds, or {None} if the
+    dispatcher can't watch that many descriptors
+    """
+    # make a pipe that will never have any data in it
+    quiet, silent = os.pipe()
+    # and one for the active channel
+    inbound, outbound = os.pipe()
+    # make copies of the quiet end of the pipe; they never become ready for reading
+    idlers = [ os.dup(quiet) for _ in range(idle) ]
+    # carefully
+    try:
+        # the {select} system call can't handle large descriptors
+        if factory is pyre.ipc.newSelector and max(idlers + [inbound]) >= FD_SETSIZE:
+            # so skip this one
+            return None
+
+        # build the dispatcher
+        dispatcher = factory()
+        # the idle channels never do anything
+        def ignore(**kwds):
+            # if we ever get here, something is wrong
+            assert False, "unreachable"
+        # register them
+        for fd in idlers:
+            dispatcher.whenReadReady(channel=endpoint(inbound=fd), call=ignore)
+
+        # the number of messages received
+        received = 0
+        # the active channel bounces a byte back to itself
+        def bounce(channel, **kwds):
+            # get access to the counter
+            nonlocal received
+            # get the byte
+            os.read(channel.inbound, 1)
+            # count it
+            received += 1
+            # if we are done
+            if received == rounds:
+                # stop the dispatcher
+                dispatcher.stop()
+                # and stop watching this channel
+                return False
+            # otherwise, send the byte back
+            os.write(channel.outbound, b"x")
+            # and keep watching
+            return True
+        # register it
+        active = endpoint(inbound=inbound, outbound=outbound)
+        dispatcher.whenReadReady(channel=active, call=bounce)
+
+        # make a timer
+        timer = pyre.timers.wall(name=f"tests.ipc.{factory.__name__}.{idle}")
+        # start it
+        timer.start()
+        # prime the pump
+        os.write(outbound, b"x")
+        # and watch
+        dispatcher.watch()
+        # stop the timer
+        timer.stop()
+
+        # verify all messages made it through
+        assert received == rounds
+        # and return the elapsed time
+        return timer.sec()
+    # no matter what happens
+    finally:
+        # close all descriptors
+        for fd in idlers + [quiet, silent, inbound, outbound]:
+            os.close(fd)
+
+
+def test():
+    # we need lots of descriptors; get the resource limits
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    # if the hard limit is larger than the current one
+    if hard == resource.RLIM_INFINITY or hard > soft:
+        # raise the soft limit as much as we can
+        limit = 1 << 16 if hard == resource.RLIM_INFINITY else hard
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+        # and update
+        soft = limit
+
+    # the number of messages to send
+    rounds = 1000
+    # go through the loads
+    for idle in [10, 1000, 10000]:
+        # make sure we can open enough descriptors
+        if idle + 64 > soft:
+            # and skip the ones we can't handle
+            channel.log(f"skipping {idle} idle channels: not enough descriptors")
+            continue
+        # go through the dispatchers
+        for factory in [pyre.ipc.newSelector, pyre.ipc.newPoller]:
+            # measure
+            elapsed = measure(factory=factory, idle=idle, rounds=rounds)
+            # if the dispatcher can't handle this load
+            if elapsed is None:
+                # say so
+                channel.log(f"{factory.__name__}: {idle} idle channels: not supported")
+                # and move on
+                continue
+            # otherwise, report the throughput
+            channel.log(
+                f"{factory.__name__}: {idle} idle channels: {rounds/elapsed:.0f} messages/s")
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
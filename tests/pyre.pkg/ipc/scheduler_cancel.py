@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that alarms can be cancelled
+"""
+
+
+def test():
+    # access the package
+    import pyre.ipc
+    # instantiate a scheduler
+    s = pyre.ipc.newScheduler()
+    # get the units of time
+    from pyre.units.SI import second
+
+    # the record of alarms raised
+    raised = []
+    # build a handler factory
+    def handler(tag, repeat=0):
+        # the handler
+        def alarm(timestamp):
+            # record the alarm
+            raised.append(tag)
+            # reschedule as requested
+            return repeat
+        # all done
+        return alarm
+
+    # setup some alarms
+    first = s.alarm(interval=0*second, call=handler(tag="first"))
+    second_ = s.alarm(interval=0*second, call=handler(tag="second"))
+    third = s.alarm(interval=0*second, call=handler(tag="third"))
+    # and a recurring one
+    recurring = s.alarm(interval=0*second, call=handler(tag="recurring", repeat=1e-9*second))
+
+    # cancel one of them
+    s.cancel(second_)
+    # cancelling twice is harmless
+    s.cancel(second_)
+    # raise the alarms
+    s.awaken()
+    # verify the cancelled one did not go off, and the others went off in order
+    assert raised == ["first", "third", "recurring"]
+
+    # the recurring alarm is still scheduled
+    assert s.poll() is not None
+    # cancel it through the handle returned when it was first scheduled
+    s.cancel(recurring)
+    # verify there is nothing left
+    assert s.poll() is None
+
+    # cancelling alarms that already went off is harmless
+    s.cancel(first)
+    s.cancel(third)
+
+    # now schedule lots of alarms
+    alarms = [ s.alarm(interval=0*second, call=handler(tag=idx)) for idx in range(100) ]
+    # cancel most of them
+    for alarm in alarms[10:]:
+        s.cancel(alarm)
+    # verify that the heap got compacted
+    assert len(s._alarms) < 100
+    # raise the rest
+    raised = []
+    s.awaken()
+    # verify that only the survivors went off, in order
+    assert raised == list(range(10))
+
+    # and return the scheduler
+    return s
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
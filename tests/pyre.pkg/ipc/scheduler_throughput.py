@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Measure the cost of maintaining a large number of recurring alarms
+"""
+
+# externals
+import pyre.ipc
+from pyre.units.SI import second
+
+# if necessary
+import journal
+channel = journal.debug("scheduler.throughput")
+# channel.active = True
+
+
+def test():
+    # the number of alarms
+    alarms = 100000
+    # the number of times each one goes off
+    rounds = 5
+
+    # instantiate a scheduler
+    s = pyre.ipc.newScheduler()
+    # the number of alarms raised
+    raised = 0
+    # the handler reschedules its alarm right away
+    def heartbeat(timestamp):
+        # get access to the counter
+        nonlocal raised
+        # count
+        raised += 1
+        # and reschedule
+        return 1e-9 * second
+
+    # make a timer
+    timer = pyre.timers.wall(name="tests.ipc.scheduler")
+    # start it
+    timer.start()
+    # schedule the alarms, one at a time
+    handles = [ s.alarm(interval=0*second, call=heartbeat) for _ in range(alarms) ]
+    # stop the timer
+    timer.stop()
+    # report
+    channel.log(f"scheduled {alarms} alarms in {timer.ms():.0f}ms")
+
+    # reset the timer
+    timer.reset()
+    # start it
+    timer.start()
+    # raise the alarms a few times
+    for _ in range(rounds):
+        s.awaken()
+    # stop the timer
+    timer.stop()
+    # report
+    channel.log(f"raised {raised} alarms in {timer.ms():.0f}ms")
+    # verify they all went off
+    assert raised == rounds * alarms
+
+    # reset the timer
+    timer.reset()
+    # start it
+    timer.start()
+    # cancel all of them
+    for handle in handles:
+        s.cancel(handle)
+    # stop the timer
+    timer.stop()
+    # report
+    channel.log(f"cancelled {alarms} alarms in {timer.ms():.0f}ms")
+    # verify there is nothing left
+    assert s.poll() is None
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -24,5 +24,12 @@ nodes:
 teams:
 	${PYTHON} ./pool.py
 	${PYTHON} ./pool.py --tasks=4 --team.size=2
+	${PYTHON} ./pool.py --tasks=8 --team.size=2 --team.batch=3 --team.prefetch=2
+	${PYTHON} ./pool_throughput.py
+	${PYTHON} ./pool.py --tasks=8 --team.size=2 --team.prefetch=3 --team.workplan=priority
+	${PYTHON} ./pool_rebalancing.py
+	${PYTHON} ./pool.py --tasks=8 --team.size=2 --team.recruiter=standby --team.recruiter.recycle=2
+	${PYTHON} ./pool_standby.py
+	${PYTHON} ./pool_remote.py
 
 # end of file
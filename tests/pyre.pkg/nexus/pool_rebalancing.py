@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that every task is executed exactly once when idle crew members take over the queued
+tasks of their busier peers, and compare the time it takes to complete a workplan with a long
+task with and without prioritization and rebalancing
+"""
+
+
+# externals
+import os
+import time
+import shutil
+import tempfile
+import pyre
+from pyre.nexus.Pool import Pool
+
+# if necessary
+import journal
+channel = journal.debug("pool.rebalancing")
+# channel.active = True
+
+
+# a task that leaves a trace
+class Task(pyre.nexus.task):
+    """
+    A task that sleeps for a while and records its execution in a log file
+    """
+
+    # interface
+    def execute(self, **kwds):
+        """
+        The body of the task
+        """
+        # sleep for a while
+        time.sleep(self.cost)
+        # open the log
+        with open(self.log, "a") as log:
+            # record my execution
+            print(self.tag, file=log)
+        # all done
+        return self.tag
+
+    # meta-methods
+    def __init__(self, tag, cost, log, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.tag = tag
+        self.cost = cost
+        self.log = log
+        # all done
+        return
+
+
+def measure(workplan, scratch):
+    """
+    Execute a workplan with a long task and a few short ones using the given {workplan}
+    component; returns the elapsed time in seconds
+    """
+    # the name of the log file
+    log = os.path.join(scratch, f"{workplan}.log")
+    # make the tasks: a long one that holds up the tasks queued up behind it
+    tasks = [ Task(tag=0, cost=1, log=log) ]
+    # and some short ones
+    tasks += [ Task(tag=tag, cost=.05, log=log) for tag in range(1, 17) ]
+
+    # make a team
+    team = Pool(name=f"tests.nexus.pool.{workplan}")
+    # configure it
+    team.size = 2
+    team.prefetch = 4
+    team.workplan = workplan
+
+    # make a timer
+    timer = pyre.timers.wall(name=f"tests.nexus.pool.{workplan}")
+    # start it
+    timer.start()
+    # hand the team the workplan
+    team.assemble(workplan=tasks)
+    # and execute it
+    team.run()
+    # stop the timer
+    timer.stop()
+
+    # verify the workplan was completed
+    assert not team.workplan
+    # and every task was executed exactly once
+    with open(log) as stream:
+        assert sorted(int(line) for line in stream) == list(range(len(tasks)))
+
+    # return the elapsed time
+    return timer.sec()
+
+
+def test():
+    # verify that the priority workplan hands out tasks in the right order
+    workplan = pyre.nexus.priority()()
+    # make some tasks
+    low = Task(tag=0, cost=1, log=None)
+    cheap = Task(tag=1, cost=1, log=None)
+    costly = Task(tag=2, cost=5, log=None)
+    urgent = Task(tag=3, cost=1, log=None)
+    urgent.priority = 1
+    # add them
+    workplan.add(low)
+    workplan.update([cheap, costly, urgent])
+    # check the size
+    assert len(workplan) == 4
+    # and the order
+    assert [ workplan.pop() for _ in range(4) ] == [urgent, costly, low, cheap]
+
+    # make a scratch area
+    scratch = tempfile.mkdtemp()
+    # remember who i am; the crew members are clones of this process, and they leave by raising
+    # {SystemExit}, so they pass through here on their way out
+    pid = os.getpid()
+    # carefully
+    try:
+        # go through the workplans
+        for workplan in ["bag", "priority"]:
+            # measure
+            elapsed = measure(workplan=workplan, scratch=scratch)
+            # report
+            channel.log(f"{workplan}: {elapsed:.3f} sec")
+    # no matter what happens
+    finally:
+        # if i'm the original process
+        if os.getpid() == pid:
+            # clean up
+            shutil.rmtree(scratch)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
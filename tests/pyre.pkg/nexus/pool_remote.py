@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that a team can recruit crew members among workers that connect to it over TCP, and
+that the tasks of the crew members it loses are executed by the rest of the team
+"""
+
+
+# externals
+import os
+import sys
+import time
+import signal
+import socket
+import shutil
+import tempfile
+import subprocess
+import collections
+import pyre
+from pyre.nexus.Pool import Pool
+
+# if necessary
+import journal
+channel = journal.debug("pool.remote")
+# channel.active = True
+
+
+# the units of time
+from pyre.units.SI import second
+
+
+# the tasks
+class Task(pyre.nexus.task):
+    """
+    A task that records the id of the process that executed it in a log file
+    """
+
+    # interface
+    def execute(self, **kwds):
+        """
+        The body of the task
+        """
+        # take a while
+        time.sleep(.02)
+        # open the log
+        with open(self.log, "a") as log:
+            # record my tag and the process id
+            print(self.tag, os.getpid(), file=log)
+        # all done
+        return
+
+    # meta-methods
+    def __init__(self, tag, log, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.tag = tag
+        self.log = log
+        # all done
+        return
+
+
+class Fatal(Task):
+    """
+    A task that kills the process that executes it the first time it runs
+    """
+
+    # interface
+    def execute(self, **kwds):
+        """
+        The body of the task
+        """
+        # if this is the first attempt
+        if not os.path.exists(self.marker):
+            # leave a mark
+            open(self.marker, "w").close()
+            # and die
+            os.kill(os.getpid(), signal.SIGKILL)
+        # otherwise, behave
+        return super().execute(**kwds)
+
+    # meta-methods
+    def __init__(self, marker, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.marker = marker
+        # all done
+        return
+
+
+class Stall(Fatal):
+    """
+    A task that freezes the process that executes it the first time it runs, long enough for
+    its team to give up on it
+    """
+
+    # interface
+    def execute(self, **kwds):
+        """
+        The body of the task
+        """
+        # if this is a repeat attempt
+        if os.path.exists(self.marker):
+            # behave
+            return Task.execute(self, **kwds)
+        # otherwise, leave a mark with my process id
+        with open(self.marker, "w") as marker:
+            print(os.getpid(), file=marker)
+        # make a process that will wake me up
+        if os.fork() == 0:
+            # after a while
+            time.sleep(self.delay)
+            # wake up the process that made me
+            os.kill(os.getppid(), signal.SIGCONT)
+            # and exit without any clean up
+            os._exit(0)
+        # freeze
+        os.kill(os.getpid(), signal.SIGSTOP)
+        # when i wake up, the team has moved on
+        return
+
+    # meta-methods
+    def __init__(self, delay, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.delay = delay
+        # all done
+        return
+
+
+def volunteer(address, authkey):
+    """
+    Offer the services of this process to the team at {address}
+    """
+    # make a recruiter
+    recruiter = pyre.nexus.remote()(name="tests.nexus.remote.volunteer")
+    # configure it
+    recruiter.address = address
+    recruiter.authkey = authkey
+    recruiter.heartbeat = .1*second
+    # enough attempts to outlast the pauses between workplans
+    recruiter.retries = 4
+    # offer my services until i'm let go
+    return recruiter.volunteer()
+
+
+def execute(team, tasks, log):
+    """
+    Ask {team} to execute the workplan with the given {tasks}; returns a map from the task tags
+    to the ids of the processes that executed them
+    """
+    # start with a clean log
+    open(log, "w").close()
+    # hand the team the workplan
+    team.assemble(workplan=tasks)
+    # and execute it
+    team.run()
+    # verify the workplan was completed
+    assert not team.workplan
+    # make a pile
+    executions = collections.defaultdict(list)
+    # read the log
+    with open(log) as stream:
+        # go through the entries
+        for line in stream:
+            # unpack
+            tag, pid = map(int, line.split())
+            # and record the execution
+            executions[tag].append(pid)
+    # verify every task was executed exactly once
+    assert sorted(executions) == sorted(task.tag for task in tasks)
+    assert all(len(pids) == 1 for pids in executions.values())
+    # return the map
+    return { tag: pids[0] for tag, pids in executions.items() }
+
+
+def test():
+    # make a scratch area
+    scratch = tempfile.mkdtemp()
+    # the log file
+    log = os.path.join(scratch, "remote.log")
+
+    # make a recruiter
+    recruiter = pyre.nexus.remote()(name="tests.nexus.remote.team")
+    # configure it
+    recruiter.address = "ip4:localhost:0"
+    recruiter.heartbeat = .1*second
+    recruiter.patience = 3
+    recruiter.authkey = "tests.nexus.remote"
+    # start listening
+    address = recruiter.listen()
+    # and build the address for the workers
+    spec = f"ip4:{address.host}:{address.port}"
+
+    # launch the workers, each in its own process
+    workers = [
+        subprocess.Popen([sys.executable, __file__, "--volunteer", spec, recruiter.authkey])
+        for _ in range(3)
+        ]
+    # and an impostor that doesn't know the secret
+    impostor = subprocess.Popen([sys.executable, __file__, "--volunteer", spec, "impostor"])
+    # along with a connection that never says anything
+    stray = socket.create_connection((address.host, address.port))
+
+    # make a team
+    team = Pool(name="tests.nexus.pool.remote")
+    # configure it
+    team.size = 3
+    team.recruiter = recruiter
+
+    # carefully
+    try:
+        # execute a workplan with a task that kills the worker that executes it
+        tasks = [ Task(tag=tag, log=log) for tag in range(30) ]
+        tasks.append(Fatal(tag=30, log=log, marker=os.path.join(scratch, "fatal")))
+        executions = execute(team=team, tasks=tasks, log=log)
+        # verify the impostor was turned away
+        assert impostor.wait(timeout=10) == 1
+        assert impostor.pid not in executions.values()
+        # and the stray connection got its challenge and was dropped without holding up the team
+        stray.settimeout(10)
+        assert len(stray.recv(1024)) == recruiter.nonce
+        assert stray.recv(1024) == b""
+        # verify the fatal task was attempted
+        assert os.path.exists(os.path.join(scratch, "fatal"))
+        # and that the team lost a worker
+        assert sum(worker.poll() is not None for worker in workers) == 1
+        # tell me
+        channel.log(f"lost a worker: {len(set(executions.values()))} workers")
+
+        # execute a workplan with a task that freezes the worker that executes it for long
+        # enough to miss a few heartbeats
+        marker = os.path.join(scratch, "stall")
+        tasks = [ Task(tag=tag, log=log) for tag in range(30) ]
+        tasks.append(Stall(tag=30, log=log, marker=marker, delay=1))
+        execute(team=team, tasks=tasks, log=log)
+        # get the id of the process that froze
+        with open(marker) as stream:
+            stalled = int(stream.read())
+
+        # give it a chance to wake up and reconnect
+        time.sleep(1.5)
+        # execute another workplan
+        tasks = [ Task(tag=tag, log=log) for tag in range(40) ]
+        executions = execute(team=team, tasks=tasks, log=log)
+        # verify the frozen worker rejoined the team
+        assert stalled in executions.values()
+        # tell me
+        channel.log(f"worker {stalled} rejoined the team")
+    # no matter what happens
+    finally:
+        # let the workers go
+        recruiter.release()
+        # wait for them to exit
+        for worker in workers:
+            worker.wait(timeout=10)
+        # hang up the stray connection
+        stray.close()
+        # and clean up
+        shutil.rmtree(scratch)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # if i was launched as a worker
+    if len(sys.argv) > 2 and sys.argv[1] == "--volunteer":
+        # offer my services to the team
+        raise SystemExit(volunteer(address=sys.argv[2], authkey=sys.argv[3]))
+    # otherwise, run the test
+    test()
+
+
+# end of file
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that the standby recruiter reassigns its crew members to later workplans, replaces
+them after they have executed their share of tasks, and compare the cost of executing a
+sequence of small workplans with and without it
+"""
+
+
+# externals
+import os
+import shutil
+import tempfile
+import collections
+import pyre
+from pyre.nexus.Pool import Pool
+
+# if necessary
+import journal
+channel = journal.debug("pool.standby")
+# channel.active = True
+
+
+# a task that leaves a trace
+class Task(pyre.nexus.task):
+    """
+    A task that records the id of the process that executed it in a log file
+    """
+
+    # interface
+    def execute(self, **kwds):
+        """
+        The body of the task
+        """
+        # open the log
+        with open(self.log, "a") as log:
+            # record the process id
+            print(os.getpid(), file=log)
+        # all done
+        return
+
+    # meta-methods
+    def __init__(self, log, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my state
+        self.log = log
+        # all done
+        return
+
+
+def execute(team, tasks, log):
+    """
+    Ask {team} to execute a workplan with the given number of {tasks}; returns a map from the
+    ids of the processes that executed the tasks to the number of tasks each executed
+    """
+    # start with a clean log
+    open(log, "w").close()
+    # hand the team the workplan
+    team.assemble(workplan=[ Task(log=log) for _ in range(tasks) ])
+    # and execute it
+    team.run()
+    # verify the workplan was completed
+    assert not team.workplan
+    # read the log
+    with open(log) as stream:
+        # and count the tasks executed by each process
+        return collections.Counter(int(line) for line in stream)
+
+
+def reuse(scratch):
+    """
+    Verify crew members are reassigned to later workplans
+    """
+    # the log file
+    log = os.path.join(scratch, "reuse.log")
+    # make a recruiter
+    recruiter = pyre.nexus.standby()(name="tests.nexus.standby.reuse")
+    # and a team
+    team = Pool(name="tests.nexus.pool.reuse")
+    # configure it
+    team.size = 2
+    team.recruiter = recruiter
+
+    # execute a workplan
+    first = execute(team=team, tasks=8, log=log)
+    # all tasks were executed by the crew
+    assert sum(first.values()) == 8
+    assert os.getpid() not in first
+    # the crew members are now on standby
+    assert len(recruiter.standby) == 2
+
+    # execute another one
+    second = execute(team=team, tasks=8, log=log)
+    # verify it was executed by the same crew members
+    assert set(second) <= {crew.pid for crew in team.retired}
+    assert set(second) <= set(first) | {crew.pid for crew in recruiter.standby}
+
+    # get the activity report
+    survey = team.survey()
+    # verify it accounts for all the tasks
+    assert sum(tasks for _, tasks, _ in survey) == 16
+    # and that the memory footprint of each crew member was reported
+    assert all(rss > 0 for _, _, rss in survey)
+
+    # terminate the crew
+    recruiter.release()
+    # and verify there is nobody on standby any more
+    assert not recruiter.standby
+
+    # all done
+    return
+
+
+def recycle(scratch):
+    """
+    Verify crew members are replaced after they have executed their share of tasks
+    """
+    # the log file
+    log = os.path.join(scratch, "recycle.log")
+    # make a recruiter
+    recruiter = pyre.nexus.standby()(name="tests.nexus.standby.recycle")
+    # that replaces its workers every three tasks
+    recruiter.recycle = 3
+    # make a team
+    team = Pool(name="tests.nexus.pool.recycle")
+    # configure it
+    team.size = 2
+    team.recruiter = recruiter
+
+    # execute a workplan
+    counts = execute(team=team, tasks=12, log=log)
+    # verify all tasks were executed
+    assert sum(counts.values()) == 12
+    # and that no process executed more than its share
+    assert max(counts.values()) <= 3
+    # so it took at least four processes
+    assert len(counts) >= 4
+
+    # terminate the crew
+    recruiter.release()
+
+    # all done
+    return
+
+
+def measure(recruiter, scratch, rounds):
+    """
+    Execute {rounds} small workplans using {recruiter}; returns the elapsed time in seconds
+    """
+    # the log file
+    log = os.path.join(scratch, f"{recruiter}.log")
+    # make a team
+    team = Pool(name=f"tests.nexus.pool.{recruiter}")
+    # configure it
+    team.size = 4
+    team.recruiter = recruiter
+
+    # make a timer
+    timer = pyre.timers.wall(name=f"tests.nexus.pool.{recruiter}")
+    # start it
+    timer.start()
+    # go through the rounds
+    for _ in range(rounds):
+        # execute a workplan
+        execute(team=team, tasks=4, log=log)
+    # stop the timer
+    timer.stop()
+
+    # if the recruiter keeps its crew around
+    if recruiter == "standby":
+        # terminate them
+        team.recruiter.release()
+
+    # return the elapsed time
+    return timer.sec()
+
+
+def test():
+    # make a scratch area
+    scratch = tempfile.mkdtemp()
+    # remember who i am; the crew members are clones of this process, and they leave by raising
+    # {SystemExit}, so they pass through here on their way out
+    pid = os.getpid()
+    # carefully
+    try:
+        # check reassignment
+        reuse(scratch=scratch)
+        # and recycling
+        recycle(scratch=scratch)
+        # go through the recruiters
+        for recruiter in ["fork", "standby"]:
+            # measure
+            elapsed = measure(recruiter=recruiter, scratch=scratch, rounds=20)
+            # report
+            channel.log(f"{recruiter}: {1e3*elapsed/20:.1f} ms/workplan")
+    # no matter what happens
+    finally:
+        # if i'm the original process
+        if os.getpid() == pid:
+            # clean up
+            shutil.rmtree(scratch)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Measure the task throughput of a pool for a workplan with many small tasks, with and without
+batching and pipelining
+"""
+
+
+# externals
+import pyre
+from pyre.nexus.Pool import Pool
+
+# if necessary
+import journal
+channel = journal.debug("pool.throughput")
+# channel.active = True
+
+
+# a minimal task
+class Task(pyre.nexus.task):
+    """
+    A task that does no work, so that the cost of shipping it around dominates
+    """
+
+    # interface
+    def execute(self, **kwds):
+        """
+        The body of the task
+        """
+        # nothing to do
+        return self.value
+
+    # meta-methods
+    def __init__(self, value, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # save my value
+        self.value = value
+        # all done
+        return
+
+
+def measure(tasks, size, batch, prefetch):
+    """
+    Use a team of {size} members to execute {tasks} trivial tasks, shipping them in batches of
+    {batch} tasks with up to {prefetch} batches in flight; returns the elapsed time in seconds
+    """
+    # make a team
+    team = Pool(name=f"tests.nexus.pool.{batch}x{prefetch}")
+    # configure it
+    team.size = size
+    team.batch = batch
+    team.prefetch = prefetch
+
+    # make a timer
+    timer = pyre.timers.wall(name=f"tests.nexus.pool.{batch}x{prefetch}")
+    # start it
+    timer.start()
+    # make the workplan
+    team.assemble(workplan={ Task(value=value) for value in range(tasks) })
+    # and execute it
+    team.run()
+    # stop the timer
+    timer.stop()
+
+    # verify the workplan was completed
+    assert not team.workplan
+    # and all crew members were dismissed
+    assert not team.active
+    assert len(team.retired) == size
+
+    # return the elapsed time
+    return timer.sec()
+
+
+def test():
+    # the number of tasks
+    tasks = 10000
+    # the size of the team
+    size = 2
+    # go through the configurations; the first one corresponds to shipping one task at a time
+    for batch, prefetch in [(1, 1), (1, 4), (64, 1), (64, 4)]:
+        # measure
+        elapsed = measure(tasks=tasks, size=size, batch=batch, prefetch=prefetch)
+        # report
+        channel.log(
+            f"batch={batch}, prefetch={prefetch}: {tasks/elapsed:.0f} tasks/s")
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
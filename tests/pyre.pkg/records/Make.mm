@@ -51,6 +51,7 @@ complex-immutable:
 	${PYTHON} ./complex_immutable_kwds.py
 	${PYTHON} ./complex_immutable_conversions.py
 	${PYTHON} ./complex_immutable_validations.py
+	${PYTHON} ./complex_immutable_specialized.py
 
 complex-mutable:
 	${PYTHON} ./complex_mutable_data.py
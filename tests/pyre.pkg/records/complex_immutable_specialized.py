@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that the extraction functions generated for immutable records build the same tuples as
+the generic strategies, and compare their cost
+"""
+
+
+# externals
+import pyre
+
+# if necessary
+import journal
+channel = journal.debug("records.specialized")
+# channel.active = True
+
+
+def build(record, strategy, rows):
+    """
+    Use the extraction {strategy} to build a tuple out of each one of the {rows}
+    """
+    # go through the rows and build the tuples
+    return [ tuple(strategy(record=record, source=iter(row))) for row in rows ]
+
+
+def test():
+    import pyre.records
+    import pyre.constraints
+    from pyre.records.Evaluator import Evaluator
+    from pyre.records.Extractor import Extractor
+    from pyre.records.Specializer import Specializer
+
+    # a record with derivations
+    class item(pyre.records.record):
+        """
+        A sample record
+        """
+        # the fields
+        sku = pyre.records.str()
+        production = pyre.records.float()
+        overhead = pyre.records.float()
+        margin = pyre.records.float()
+        # derived quantities
+        cost = production*(1 + overhead/100)
+        price = cost*(1 + margin/100)
+        # constraints
+        margin.validators = pyre.constraints.isPositive()
+
+    # a simple one
+    class entry(pyre.records.record):
+        """
+        Another sample record
+        """
+        # the fields
+        sku = pyre.records.str()
+        count = pyre.records.int()
+        weight = pyre.records.float()
+
+    # the data
+    rows = [ (f"{4000+n}", f"{.5+n}", f"{n%20}", f"{10+n%50}") for n in range(10000) ]
+
+    # a specializer for each record
+    complex = Specializer(fallback=Evaluator())
+    simple = Specializer(fallback=Extractor())
+    # verify they build the same tuples as the generic strategies
+    assert build(item, complex, rows) == build(item, Evaluator(), rows)
+    assert build(entry, simple, rows) == build(entry, Extractor(), rows)
+
+    # verify the records build their tuples with generated functions
+    record = item.pyre_immutable(data=rows[1])
+    assert not isinstance(item.pyre_immutableTuple.pyre_extract, Specializer)
+    # and check the values
+    assert record.sku == "4001"
+    assert record.cost == 1.5 * 1.01
+    assert record.price == 1.5 * 1.01 * 1.11
+    # build one from keywords
+    record = item.pyre_immutable(sku="4002", production=2, overhead=0, margin=50)
+    # check
+    assert record.cost == 2
+    assert record.price == 3
+
+    # verify validation errors are reported
+    try:
+        item.pyre_immutable(data=("4003", "1", "0", "-1"))
+        assert False, "unreachable"
+    except item.ConstraintViolationError as error:
+        pass
+    # as are short rows
+    try:
+        item.pyre_immutable(data=("4003", "1"))
+        assert False, "unreachable"
+    except RuntimeError:
+        pass
+
+    # compare the cost of the two strategies
+    for strategy in [Evaluator(), Specializer(fallback=Evaluator())]:
+        # make a timer
+        timer = pyre.timers.wall(name=f"tests.records.{type(strategy).__name__}")
+        # start it
+        timer.start()
+        # build the tuples
+        build(item, strategy, rows)
+        # stop the timer
+        timer.stop()
+        # and report
+        channel.log(f"{type(strategy).__name__}: {1e3*timer.sec():.1f} ms")
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
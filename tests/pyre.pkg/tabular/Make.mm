@@ -30,11 +30,13 @@ sheets:
 	${PYTHON} ./sheet_columns.py
 	${PYTHON} ./sheet_index.py
 	${PYTHON} ./sheet_updates.py
+	${PYTHON} ./sheet_columnar.py
 
 views:
 	${PYTHON} ./view.py
 
 charts:
+	${PYTHON} ./bitmap.py
 	${PYTHON} ./chart.py
 	${PYTHON} ./chart_class_layout.py
 	${PYTHON} ./chart_class_inheritance.py
@@ -44,13 +46,16 @@ charts:
 	${PYTHON} ./chart_interval.py
 	${PYTHON} ./chart_filter.py
 	${PYTHON} ./chart_sales.py
+	${PYTHON} ./chart_incremental.py
 
 pivots:
 	${PYTHON} ./pivot.py
+	${PYTHON} ./pivot_reductions.py
 
 csv:
 	${PYTHON} ./csv_instance.py
 	${PYTHON} ./csv_read.py
+	${PYTHON} ./csv_chunked.py
 
 
 # end of file
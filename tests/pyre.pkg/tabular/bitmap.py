@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that bitmaps behave like sets of row numbers
+"""
+
+
+def test():
+    # externals
+    import random
+    # get the package
+    import pyre.tabular
+
+    # the number of rows
+    size = 5 * pyre.tabular.bitmap.span
+    # make some sets of rows with different densities
+    sets = [
+        set(),
+        {0, 1, 2, size-1},
+        set(random.sample(range(size), 1000)),
+        set(random.sample(range(size), size // 2)),
+        set(range(pyre.tabular.bitmap.span, 3*pyre.tabular.bitmap.span)),
+        ]
+    # and the corresponding bitmaps
+    bitmaps = [ pyre.tabular.bitmap(rows) for rows in sets ]
+
+    # check the contents
+    for rows, bitmap in zip(sets, bitmaps):
+        # verify they have the same members, in order
+        assert list(bitmap) == sorted(rows)
+        # count them
+        assert len(bitmap) == len(rows)
+        # and check for membership
+        assert all(row in bitmap for row in rows)
+        assert bool(bitmap) == bool(rows)
+
+    # go through all pairs
+    for left, leftmap in zip(sets, bitmaps):
+        for right, rightmap in zip(sets, bitmaps):
+            # check the intersection
+            assert (leftmap & rightmap) == (left & right)
+            # and the union
+            assert (leftmap | rightmap) == (left | right)
+            # the in-place versions
+            bitmap = leftmap.copy()
+            bitmap |= rightmap
+            assert bitmap == left | right
+            bitmap &= rightmap
+            assert bitmap == right
+            # and verify the operands were not affected
+            assert leftmap == left
+            assert rightmap == right
+
+    # build one a row at a time, out of order
+    bitmap = pyre.tabular.bitmap()
+    # pick some rows
+    rows = random.sample(range(size), 10000)
+    # add them
+    for row in rows:
+        bitmap.add(row)
+    # and check
+    assert bitmap == set(rows)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that the bins of charts are brought up to date as rows are added to their sheets, and
+measure the cost of slicing a large sheet along multiple dimensions
+"""
+
+
+# externals
+import random
+import pyre.tabular
+
+# if necessary
+import journal
+channel = journal.debug("tabular.bitmap")
+# channel.active = True
+
+
+# the sheet
+class sales(pyre.tabular.sheet):
+    """The transaction data"""
+    # layout
+    date = pyre.tabular.str()
+    time = pyre.tabular.str()
+    sku = pyre.tabular.str()
+    quantity = pyre.tabular.float()
+    discount = pyre.tabular.float()
+    sale = pyre.tabular.float()
+
+
+# the chart
+class chart(pyre.tabular.chart, sheet=sales):
+    """
+    Aggregate the information in the {sales} table
+    """
+    date = pyre.tabular.inferred(sales.date)
+    sku = pyre.tabular.inferred(sales.sku)
+    quantity = pyre.tabular.interval(measure=sales.quantity, interval=(0, 10), subdivisions=5)
+
+
+def update():
+    """
+    Verify that the bins are maintained as rows are appended
+    """
+    # read the data
+    data = [ tuple(row) for row in pyre.tabular.csv().read(layout=sales, uri="sales.csv") ]
+    # go through both kinds of sheets
+    for layout in [sales, type("sales", (pyre.tabular.columnar, sales), {})]:
+        # make a sheet out of the first half of the data
+        transactions = layout(name="sales").pyre_immutable(data[:20])
+        # build a chart
+        cube = chart(sheet=transactions)
+        # get the bins of the first half
+        first = cube.pyre_filter(sku="4000", quantity=0)
+        # save its rows
+        rows = set(first)
+
+        # add the rest of the data
+        transactions.pyre_immutable(data[20:])
+        # slice the data
+        slice = cube.pyre_filter(sku="4000", quantity=0)
+        # verify the result we got earlier was not affected
+        assert first == rows
+        # verify the new rows were binned
+        assert slice == {
+            row for row, record in enumerate(transactions)
+            if record.sku == "4000" and 0 <= record.quantity < 2 }
+        # check against a freshly built chart
+        fresh = chart(sheet=transactions)
+        assert cube.sku == fresh.sku
+        assert list(cube.quantity) == list(fresh.quantity)
+        assert cube.quantity.rejects == fresh.quantity.rejects
+        # and verify that a refresh rebuilds the bins
+        assert cube.pyre_refresh().sku == fresh.sku
+
+    # all done
+    return
+
+
+def slice():
+    """
+    Slice a large sheet along multiple dimensions
+    """
+    # the number of rows
+    rows = 200000
+    # make a sheet
+    transactions = sales(name="sales").pyre_immutable(
+        (f"2010/11/{random.randrange(1, 31):02}", f"{random.randrange(24):02}:00:00",
+         f"{random.randrange(4000, 4100)}",
+         f"{random.randrange(10)}", f"{random.random()}", f"{10*random.random()}")
+        for _ in range(rows))
+    # and a chart
+    cube = chart(sheet=transactions)
+
+    # make a timer
+    timer = pyre.timers.wall(name="tests.tabular.bins")
+    # start it
+    timer.start()
+    # bin the data
+    cube.date, cube.sku, cube.quantity
+    # stop the timer
+    timer.stop()
+    # report
+    channel.log(f"binning: {1e3*timer.sec():.1f} ms")
+
+    # make a timer
+    timer = pyre.timers.wall(name="tests.tabular.slicing")
+    # start it
+    timer.start()
+    # go through some slices
+    for day in range(1, 31):
+        # slice
+        selection = cube.pyre_filter(date=f"2010/11/{day:02}", sku="4050", quantity=2)
+        # and count
+        len(selection)
+    # stop the timer
+    timer.stop()
+    # report
+    channel.log(f"slicing: {1e3*timer.sec()/30:.2f} ms per slice")
+
+    # check the last slice
+    assert selection == {
+        row for row, record in enumerate(transactions)
+        if record.date == "2010/11/30" and record.sku == "4050" and 4 <= record.quantity < 6 }
+
+    # all done
+    return
+
+
+def test():
+    # check the incremental maintenance
+    update()
+    # and measure slicing
+    slice()
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
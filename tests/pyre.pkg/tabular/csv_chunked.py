@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Read a large csv file in chunks, serially and in parallel, and feed the batches to sheets
+"""
+
+
+# externals
+import os
+import random
+import tempfile
+import pyre.tabular
+
+# if necessary
+import journal
+channel = journal.debug("tabular.csv")
+# channel.active = True
+
+
+# the sheet; it must live at module scope so the workers can find it
+class sales(pyre.tabular.sheet):
+    """The transaction data"""
+    # layout
+    date = pyre.tabular.str()
+    time = pyre.tabular.str()
+    sku = pyre.tabular.str()
+    quantity = pyre.tabular.float()
+    discount = pyre.tabular.float()
+    sale = pyre.tabular.float()
+
+
+def ingest(uri, **kwds):
+    """
+    Read {uri} in batches, convert them in the workers, and populate a columnar sheet
+    """
+    # make a sheet
+    sheet = type("sales", (pyre.tabular.columnar, sales), {})(name="sales")
+    # make a timer
+    timer = pyre.timers.wall(name=f"tests.tabular.csv.{kwds.get('workers', 0)}")
+    # start it
+    timer.start()
+    # go through the batches
+    for batch in pyre.tabular.csv().batches(layout=sales, uri=uri, convert=True, **kwds):
+        # and add them to the sheet
+        sheet.pyre_extend(rows=batch)
+    # stop the timer
+    timer.stop()
+    # report
+    channel.log(f"{kwds}: {len(sheet)} rows in {timer.sec():.2f} s")
+    # all done
+    return sheet
+
+
+def test():
+    # the number of rows
+    rows = 20000
+    # make a scratch area
+    with tempfile.TemporaryDirectory() as scratch:
+        # the name of the file
+        uri = os.path.join(scratch, "sales.csv")
+        # make a file with some transactions; put the columns in a different order
+        with open(uri, "w") as stream:
+            # the headers
+            print("sku,extra,date,time,quantity,discount,sale", file=stream)
+            # and the data
+            for row in range(rows):
+                print(
+                    f"{random.randrange(4000, 4100)},\"x, {row}\",2010/11/{row % 30 + 1:02},",
+                    f"12:00:00,{random.randrange(10)},{random.random()},{10*random.random()}",
+                    sep="", file=stream)
+
+        # make a reader
+        csv = pyre.tabular.csv()
+        # read it the traditional way
+        expected = [ tuple(row) for row in csv.read(layout=sales, uri=uri) ]
+        # and populate a sheet
+        reference = sales(name="sales").pyre_immutable(expected)
+
+        # read it serially in small chunks
+        batches = list(csv.batches(layout=sales, uri=uri, chunk=1 << 14))
+        # verify it was split
+        assert len(batches) > 1
+        # and that we got the same rows
+        assert [ row for batch in batches for row in batch ] == expected
+        # do it again from a stream
+        with open(uri, newline='') as stream:
+            # parse
+            rows = [ row for batch in csv.batches(layout=sales, stream=stream) for row in batch ]
+        # and check
+        assert rows == expected
+
+        # read it in parallel without converting, and feed the batches to a sheet
+        sheet = sales(name="sales")
+        for batch in csv.batches(layout=sales, uri=uri, chunk=1 << 14, workers=2, backlog=1):
+            sheet.pyre_immutable(batch)
+        # check
+        assert list(sheet) == list(reference)
+
+        # convert in the workers
+        sheet = ingest(uri=uri, chunk=1 << 16, workers=2)
+        # and check
+        assert list(sheet) == list(reference)
+        # compare with the serial version
+        assert list(ingest(uri=uri)) == list(reference)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
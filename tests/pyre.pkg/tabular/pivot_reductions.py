@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that pivots compute their reductions over the cells of a chart, keep them up to date as
+rows are added to the sheet, and roll them up along any subset of the dimensions
+"""
+
+
+# externals
+import pyre.tabular
+
+
+# the sheet
+class sales(pyre.tabular.sheet):
+    """The transaction data"""
+    # layout
+    date = pyre.tabular.str()
+    time = pyre.tabular.str()
+    sku = pyre.tabular.str()
+    quantity = pyre.tabular.float()
+    discount = pyre.tabular.float()
+    sale = pyre.tabular.float()
+
+
+# the chart
+class chart(pyre.tabular.chart, sheet=sales):
+    """
+    Aggregate the information in the {sales} table
+    """
+    sku = pyre.tabular.inferred(sales.sku)
+    quantity = pyre.tabular.interval(measure=sales.quantity, interval=(0, 10), subdivisions=5)
+
+
+# the pivot
+class totals(pyre.tabular.pivot):
+    """
+    Summarize the transactions in each cell
+    """
+    revenue = pyre.tabular.sum(sales.sale)
+    transactions = pyre.tabular.count()
+    average = pyre.tabular.average(sales.sale)
+    smallest = pyre.tabular.min(sales.sale)
+    largest = pyre.tabular.max(sales.sale)
+
+
+def groupby(records):
+    """
+    Compute the expected contents of the cells by brute force
+    """
+    # sort the records into cells
+    cells = {}
+    # go through them
+    for record in records:
+        # compute the bin of the quantity
+        rank = int(record.quantity / 2)
+        # skip the ones that don't belong in any bin
+        if not 0 <= rank < 5: continue
+        # add the sale to the pile of its cell
+        cells.setdefault((record.sku, rank), []).append(record.sale)
+    # all done
+    return cells
+
+
+def check(cube, records):
+    """
+    Verify the contents of {cube} against {records}
+    """
+    # compute the expected contents of the cells
+    cells = groupby(records)
+    # check the reductions
+    assert cube.transactions == { cell: len(sales) for cell, sales in cells.items() }
+    assert cube.smallest == { cell: min(sales) for cell, sales in cells.items() }
+    assert cube.largest == { cell: max(sales) for cell, sales in cells.items() }
+    # the rest, within roundoff
+    for cell, sales in cells.items():
+        assert abs(cube.revenue[cell] - sum(sales)) < 1e-9
+        assert abs(cube.average[cell] - sum(sales)/len(sales)) < 1e-9
+    # all done
+    return
+
+
+def test():
+    # read the data
+    data = [ tuple(row) for row in pyre.tabular.csv().read(layout=sales, uri="sales.csv") ]
+    # go through both kinds of sheets
+    for layout in [sales, type("sales", (pyre.tabular.columnar, sales), {})]:
+        # make a sheet out of the first half of the data
+        transactions = layout(name="sales").pyre_immutable(data[:20])
+        # build a chart
+        cube = chart(sheet=transactions)
+        # and a pivot
+        summary = totals(chart=cube)
+        # check it
+        check(cube=summary, records=transactions)
+
+        # add the rest of the data
+        transactions.pyre_immutable(data[20:])
+        # verify the new rows were folded in
+        check(cube=summary, records=transactions)
+        # and that the cube has the same cells as a freshly built one
+        fresh = totals(chart=chart(sheet=transactions))
+        assert summary.transactions == fresh.transactions
+
+        # roll up all the cells of an sku
+        rollup = summary.pyre_rollup(sku="4000")
+        # compute the expected values
+        expected = [ record.sale for record in transactions
+                     if record.sku == "4000" and 0 <= record.quantity < 10 ]
+        # check
+        assert rollup["transactions"] == len(expected)
+        assert rollup["smallest"] == min(expected)
+        assert rollup["largest"] == max(expected)
+        assert abs(rollup["revenue"] - sum(expected)) < 1e-9
+        # roll up the entire cube
+        assert summary.pyre_rollup()["transactions"] == sum(summary.transactions.values())
+        # and verify that empty rollups have no values
+        assert summary.pyre_rollup(sku="no such sku") == dict.fromkeys(
+            ["revenue", "transactions", "average", "smallest", "largest"])
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that columnar sheets hold the same data as regular ones, and compare their cost
+"""
+
+
+# externals
+import gc
+import random
+import tracemalloc
+import pyre.tabular
+
+# if necessary
+import journal
+channel = journal.debug("tabular.columnar")
+# channel.active = True
+
+
+def layout(base):
+    """
+    Build a sheet that derives from {base} and a chart over it
+    """
+    # the sheet
+    class sales(base):
+        """The transaction data"""
+        # layout
+        date = pyre.tabular.str()
+        time = pyre.tabular.str()
+        sku = pyre.tabular.str()
+        quantity = pyre.tabular.float()
+        discount = pyre.tabular.float()
+        sale = pyre.tabular.float()
+        # a derived quantity
+        total = quantity * sale
+
+    # the chart
+    class chart(pyre.tabular.chart, sheet=sales):
+        """
+        Aggregate the information in the {sales} table
+        """
+        sku = pyre.tabular.inferred(sales.sku)
+        quantity = pyre.tabular.interval(measure=sales.quantity, interval=(0, 10), subdivisions=4)
+
+    # all done
+    return sales, chart
+
+
+def compare():
+    """
+    Verify that the two kinds of sheets have the same contents
+    """
+    # get the layout of a regular sheet and its chart
+    sales, chart = layout(pyre.tabular.sheet)
+    # read the data
+    data = [ tuple(row) for row in pyre.tabular.csv().read(layout=sales, uri="sales.csv") ]
+
+    # build the sheet and the chart
+    rows = sales(name="rows").pyre_immutable(data)
+    rowChart = chart(sheet=rows)
+    # and a columnar one
+    sales, chart = layout(pyre.tabular.columnar)
+    columns = sales(name="columns").pyre_immutable(data)
+    columnChart = chart(sheet=columns)
+
+    # verify the sheets have the same contents
+    assert len(rows) == len(columns)
+    assert list(rows) == list(columns)
+    assert rows[3] == columns[3]
+    assert rows[-1] == columns[-1]
+    # including ranges of rows
+    assert rows.pyre_data[2:5] == columns.pyre_data[2:5]
+    assert rows.pyre_data[::-3] == columns.pyre_data[::-3]
+    assert columns.pyre_data[len(columns):] == []
+    # that the rows are records
+    assert columns[0].sku == rows[0].sku
+    assert columns[0].total == rows[0].total
+    # and that the columns match
+    assert list(rows.sku) == list(columns.sku)
+    assert list(rows.total) == list(columns.total)
+
+    # verify the charts classify the rows the same way
+    assert rowChart.sku == columnChart.sku
+    assert list(rowChart.quantity) == list(columnChart.quantity)
+    assert rowChart.quantity.rejects == columnChart.quantity.rejects
+    # including when filtering
+    assert rowChart.pyre_filter(sku="4000") == columnChart.pyre_filter(sku="4000")
+
+    # all done
+    return
+
+
+def adapt():
+    """
+    Verify that columns with values that don't fit in their storage are converted
+    """
+    # make a sheet
+    class inventory(pyre.tabular.columnar):
+        """The stock in the warehouse"""
+        # layout
+        sku = pyre.tabular.str().primary()
+        count = pyre.tabular.int()
+
+    # our data set
+    data = [ ("4000", "15"), ("4001", "none"), ("4002", str(2**70)) ]
+    # make a sheet
+    stock = inventory(name="stock").pyre_immutable(data)
+
+    # verify that the values survived
+    assert list(stock.count) == [15, None, 2**70]
+    # and that the index over the primary key works
+    assert stock.sku["4001"].count is None
+
+    # columnar sheets don't hold mutable records; silence the complaint
+    journal.firewall("pyre.tabular").quiet()
+    # carefully
+    try:
+        # so this should fail
+        inventory(name="stock").pyre_mutable(data)
+        assert False, "unreachable"
+    # with a firewall
+    except journal.FirewallError:
+        pass
+
+    # all done
+    return
+
+
+def measure(base, data):
+    """
+    Build a sheet derived from {base} out of {data}, and report its cost
+    """
+    # get the layouts
+    sales, chart = layout(base)
+    # start watching memory
+    tracemalloc.start()
+    # build the sheet
+    sheet = sales(name="sales").pyre_immutable(data)
+    # measure its footprint
+    footprint, _ = tracemalloc.get_traced_memory()
+    # and stop watching
+    tracemalloc.stop()
+    # clean up, so the timings are not polluted by garbage collection
+    gc.collect()
+
+    # make a timer
+    timer = pyre.timers.wall(name=f"tests.tabular.{base.__name__}")
+    # start it
+    timer.start()
+    # build the chart
+    cube = chart(sheet=sheet)
+    # bin the data
+    cube.sku
+    cube.quantity
+    # stop the timer
+    timer.stop()
+
+    # report
+    channel.log(f"{base.__name__}: {footprint/2**20:.1f} MB, charts in {1e3*timer.sec():.1f} ms")
+    # all done
+    return
+
+
+def test():
+    # verify the contents of the two kinds of sheets match
+    compare()
+    # and that columnar storage adapts to the values it sees
+    adapt()
+
+    # make a large data set, with all values as strings, as if they were read from a file
+    data = [
+        (f"2010/11/{random.randrange(1, 31):02}", f"{random.randrange(24):02}:00:00",
+         f"{random.randrange(4000, 4100)}",
+         f"{random.randrange(10)}", f"{random.random()}", f"{10*random.random()}")
+        for _ in range(20000)
+        ]
+    # compare the cost of the two kinds of sheets
+    for base in [pyre.tabular.sheet, pyre.tabular.columnar]:
+        measure(base=base, data=data)
+
+    # all done
+    return
+
+
+# main
+if __name__ == "__main__":
+    # skip pyre initialization since we don't rely on the executive
+    pyre_noboot = True
+    # do...
+    test()
+
+
+# end of file
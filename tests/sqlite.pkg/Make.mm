@@ -24,6 +24,11 @@ components:
 	${PYTHON} ./sqlite_attach.py
 	${PYTHON} ./sqlite_table.py
 	${PYTHON} ./sqlite_references.py
+	${PYTHON} ./sqlite_prepared.py
+	${PYTHON} ./sqlite_load.py
+	${PYTHON} ./sqlite_stream.py
+	${PYTHON} ./sqlite_pool.py
+	${PYTHON} ./sqlite_cache.py
 
 
 # end of file
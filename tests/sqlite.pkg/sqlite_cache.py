@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that query results are cached, evicted and invalidated when their tables are modified
+"""
+
+
+import time
+import pyre.db
+from pyre.units.SI import second
+
+
+class Customer(pyre.db.table, id="customers"):
+    """
+    Simple customer table
+    """
+    # the data fields
+    cid = pyre.db.int().primary()
+    name = pyre.db.str().notNull()
+    balance = pyre.db.decimal(precision=7, scale=2)
+
+
+class Order(pyre.db.table, id="orders"):
+    """
+    Simple order table
+    """
+    # the data fields
+    oid = pyre.db.int().primary()
+    cid = pyre.db.reference(key=Customer.cid)
+
+
+class debtors(pyre.db.query, customer=Customer):
+    """
+    The customers with a negative balance
+    """
+    # the fields
+    cid = customer.cid
+    name = customer.name
+    # the restriction
+    where = (customer.balance < 0)
+
+
+def test():
+    # build a database component; the default configuration uses an in-memory database
+    db = pyre.db.sqlite(name="cache").attach()
+    # enable the cache
+    db.cache = 2
+    # create the tables
+    db.createTable(Customer)
+    db.createTable(Order)
+    # add some customers
+    with db:
+        db.insert(
+            Customer.pyre_immutable(cid=1023, name="Bit Twiddle", balance=1000),
+            Customer.pyre_immutable(cid=1024, name="Eva Lu Ator", balance=-50),
+            )
+
+    # look for the debtors
+    once = list(db.select(debtors))
+    # again
+    again = list(db.select(debtors))
+    # verify the second set came from the cache
+    assert once == again
+    assert all(left is right for left, right in zip(once, again))
+    assert db.statistics()["hits"] == 1
+    assert db.statistics()["misses"] == 1
+
+    # modifying an unrelated table leaves the cache alone
+    with db:
+        db.insert(Order.pyre_immutable(oid=1, cid=1024))
+    assert db.statistics()["entries"] == 1
+    # but adding a debtor invalidates the results
+    with db:
+        db.insert(Customer.pyre_immutable(cid=1025, name="Broke N' Homeless", balance=-10))
+    assert db.statistics()["invalidations"] == 1
+    # so the query sees the new customer
+    assert [ row.cid for row in db.select(debtors) ] == [1024, 1025]
+
+    # so does an update
+    eva = pyre.db.template(Customer)
+    eva.balance = 0
+    with db:
+        db.update((eva, Customer.cid == 1024))
+    assert [ row.cid for row in db.select(debtors) ] == [1025]
+    # and a deletion
+    with db:
+        db.delete(Customer, Customer.cid == 1025)
+    assert list(db.select(debtors)) == []
+    # and a bulk load
+    with db:
+        db.load([Customer.pyre_immutable(cid=1026, name="Ni Hilist", balance=-1)])
+    assert [ row.cid for row in db.select(debtors) ] == [1026]
+    # check the bookkeeping
+    assert db.statistics()["invalidations"] == 4
+
+    # fill the cache with other queries
+    list(db.select(Customer))
+    list(db.select(Order))
+    # verify the least recently used entry was evicted
+    assert db.statistics()["evictions"] == 1
+    assert db.statistics()["entries"] == 2
+    # so the debtors are retrieved from the database again
+    misses = db.statistics()["misses"]
+    list(db.select(debtors))
+    assert db.statistics()["misses"] == misses + 1
+
+    # start over
+    db.invalidate()
+    assert db.statistics()["entries"] == 0
+    # shorten the lifetime of the entries
+    db.lifetime = 0.01 * second
+    # cache a query
+    list(db.select(Order))
+    # wait for it to expire
+    time.sleep(0.02)
+    # and try again
+    list(db.select(Order))
+    # check
+    assert db.statistics()["expirations"] == 1
+
+    # restore the lifetime of the entries
+    db.lifetime = 60 * second
+
+    # cache the debtors and the orders
+    assert [ row.cid for row in db.select(debtors) ] == [1026]
+    assert len(list(db.select(Order))) == 1
+    # in a transaction that gets rolled back
+    try:
+        # in a transaction
+        with db:
+            # add a debtor
+            db.insert(Customer.pyre_immutable(cid=1027, name="Al Gorithm", balance=-5))
+            # queries that depend on the modified table bypass the cache
+            hits = db.statistics()["hits"]
+            assert [ row.cid for row in db.select(debtors) ] == [1026, 1027]
+            assert [ row.cid for row in db.select(debtors) ] == [1026, 1027]
+            assert db.statistics()["hits"] == hits
+            # but the rest don't
+            assert len(list(db.select(Order))) == 1
+            assert db.statistics()["hits"] == hits + 1
+            # bail
+            raise ValueError("bail")
+    # if all went well
+    except ValueError:
+        # no problem
+        pass
+    # verify the debtor is gone
+    assert [ row.cid for row in db.select(debtors) ] == [1026]
+    # cache the debtors
+    assert [ row.cid for row in db.select(debtors) ] == [1026]
+    # changes made behind the back of the cache require explicit invalidation
+    db.execute("DELETE FROM customers WHERE cid = 1026;")
+    assert [ row.cid for row in db.select(debtors) ] == [1026]
+    db.invalidate(tables=[Customer])
+    assert list(db.select(debtors)) == []
+
+    # detach
+    db.detach()
+    # all done
+    return db
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Load a large number of records in batches and compare with inserting them one at a time
+"""
+
+
+import pyre.db
+import journal
+
+# if necessary
+channel = journal.debug("sqlite.load")
+# channel.active = True
+
+
+class Person(pyre.db.table, id="persons"):
+    """
+    Simple person table
+    """
+    # the data fields
+    id = pyre.db.int().primary()
+    name = pyre.db.str().notNull()
+    weight = pyre.db.float()
+
+
+class Customer(pyre.db.table, id="customers"):
+    """
+    Simple customer table
+    """
+    # the data fields
+    cid = pyre.db.int().primary()
+    pid = pyre.db.reference(key=Person.id)
+    balance = pyre.db.decimal(precision=7, scale=2)
+
+
+def records(count):
+    """
+    Generate {count} persons, each followed by a customer
+    """
+    # go through the ids
+    for id in range(count):
+        # make a person
+        yield Person.pyre_immutable(
+            id=id, name="person {}".format(id), weight=Person.null if id % 7 else 150 + id % 50)
+        # and a customer
+        yield Customer.pyre_immutable(cid=id, pid=id, balance=id % 1000)
+    # all done
+    return
+
+
+def test():
+    # the number of records
+    count = 10000
+
+    # build a database component; the default configuration uses an in-memory database
+    db = pyre.db.sqlite(name="load").attach()
+    # create the tables
+    db.createTable(Person)
+    db.createTable(Customer)
+
+    # make a timer
+    timer = pyre.timers.wall(name="tests.sqlite.load")
+    # start it
+    timer.start()
+    # load the records
+    loaded = db.load(records(count), batch=1000)
+    # stop the timer
+    timer.stop()
+    # report
+    channel.log("load: {:.1f} us per record".format(1e6 * timer.sec() / loaded))
+    # check
+    assert loaded == 2 * count
+    assert tuple(db.execute("SELECT COUNT(*) FROM persons;")) == ((count,),)
+    assert tuple(db.execute("SELECT COUNT(*) FROM customers;")) == ((count,),)
+    assert tuple(db.execute("SELECT COUNT(*) FROM persons WHERE weight IS NULL;")) == (
+        (count - len(range(0, count, 7)),),)
+    assert tuple(db.execute("SELECT balance FROM customers WHERE cid = 1234;")) == ((234,),)
+
+    # now, empty the tables
+    db.execute("DELETE FROM customers;")
+    db.execute("DELETE FROM persons;")
+    # make a timer
+    timer = pyre.timers.wall(name="tests.sqlite.insert")
+    # start it
+    timer.start()
+    # insert a tenth of the records one at a time, since this is much slower
+    db.insert(*records(count // 10))
+    # stop the timer
+    timer.stop()
+    # report
+    channel.log("insert: {:.1f} us per record".format(1e6 * timer.sec() / (count // 5)))
+    # check
+    assert tuple(db.execute("SELECT COUNT(*) FROM customers;")) == ((count // 10,),)
+
+    # empty the tables again, and commit
+    with db:
+        db.execute("DELETE FROM customers;")
+        db.execute("DELETE FROM persons;")
+    # loads join transactions in progress
+    try:
+        # in a transaction
+        with db:
+            # get some records
+            batch = records(5)
+            # insert the first one
+            db.insert(next(batch))
+            # load the rest
+            db.load(batch)
+            # and bail
+            raise ValueError("bail")
+    # if all went well
+    except ValueError:
+        # no problem
+        pass
+    # so they are rolled back along with the rest of the transaction
+    assert tuple(db.execute("SELECT COUNT(*) FROM persons;")) == ((0,),)
+    assert tuple(db.execute("SELECT COUNT(*) FROM customers;")) == ((0,),)
+    # even when the load is the first thing in the transaction
+    try:
+        # in a transaction
+        with db:
+            # load some records
+            db.load(records(5))
+            # and bail
+            raise ValueError("bail")
+    # if all went well
+    except ValueError:
+        # no problem
+        pass
+    # check
+    assert tuple(db.execute("SELECT COUNT(*) FROM persons;")) == ((0,),)
+
+    # detach
+    db.detach()
+    # all done
+    return db
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
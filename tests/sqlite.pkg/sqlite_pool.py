@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Share a pool of connections among threads
+"""
+
+
+import os
+import threading
+import pyre.db
+from pyre.units.SI import second
+
+
+class Event(pyre.db.table, id="events"):
+    """
+    Simple event table
+    """
+    # the data fields
+    id = pyre.db.int().primary()
+    source = pyre.db.int().notNull()
+
+
+class Reading(pyre.db.table, id="readings"):
+    """
+    Simple reading table
+    """
+    # the data fields
+    id = pyre.db.int().primary()
+    source = pyre.db.int().notNull()
+    label = pyre.db.str()
+
+
+class origin(pyre.db.query, event=Event):
+    """
+    The events from the first source
+    """
+    # the fields
+    id = event.id
+    # the restriction
+    where = (event.source == 0)
+
+
+def test():
+    # the database file
+    database = "pool.sql"
+    # the number of threads
+    threads = 6
+    # the number of transactions per thread
+    transactions = 20
+    # and the number of readings each thread records and retrieves
+    readings = 300
+
+    # build a pool
+    pool = pyre.db.pool(name="pool")
+    # of connections to a database file, since in-memory databases are private to their
+    # connection
+    pool.server = pyre.db.sqlite(name="events", database=database)
+    # with a query result cache
+    pool.server.cache = 16
+    # configure it
+    pool.minimum = 1
+    pool.maximum = 3
+    # and open the initial connections
+    pool.attach()
+    # check
+    assert pool.statistics()["connections"] == 1
+
+    # create the table
+    with pool.connection() as db:
+        db.createTable(Event)
+
+    # the body of the threads
+    def work(source):
+        # go through the transactions
+        for n in range(transactions):
+            # in a transaction
+            with pool.connection() as db:
+                # record an event
+                db.insert(Event.pyre_immutable(id=source * transactions + n, source=source))
+        # all done
+        return
+    # make the threads
+    workers = [ threading.Thread(target=work, args=(source,)) for source in range(threads) ]
+    # start them
+    for worker in workers: worker.start()
+    # and wait for them to finish
+    for worker in workers: worker.join()
+
+    # get the statistics
+    statistics = pool.statistics()
+    # verify the limits were respected
+    assert statistics["peak"] <= pool.maximum
+    assert statistics["connections"] <= pool.maximum
+    # and all connections were returned
+    assert statistics["leased"] == 0
+    assert statistics["utilization"] == 0
+    # check the bookkeeping
+    assert statistics["checkouts"] == threads * transactions + 1
+    # and the data
+    with pool.connection() as db:
+        assert tuple(db.execute("SELECT COUNT(*) FROM events;")) == ((threads*transactions,),)
+
+    # make another table
+    with pool.connection() as db:
+        # each connection renders its statements with a mill of its own
+        assert db.sql is not pool.server.sql
+        # create the table
+        db.createTable(Reading)
+    # the problems encountered by the threads
+    errors = []
+    # the body of the threads
+    def record(source):
+        # carefully
+        try:
+            # go through the readings
+            for n in range(readings):
+                # make an id
+                rid = source * readings + n
+                # and a label; some are {NULL}, so the statements have different parameters
+                label = Reading.null if n % 3 else "reading {}".format(rid)
+                # build a query for the reading
+                class reading(pyre.db.query, entry=Reading):
+                    """
+                    The reading with the given id
+                    """
+                    # the fields
+                    source = entry.source
+                    label = entry.label
+                    # the restriction
+                    where = (entry.id == rid)
+                # in a transaction
+                with pool.connection() as db:
+                    # record a reading
+                    db.insert(Reading.pyre_immutable(id=rid, source=source, label=label))
+                    # read it back
+                    rows = [ tuple(row) for row in db.select(reading) ]
+                # check
+                assert rows == [(source, None if label is Reading.null else label)], rows
+        # if anything goes wrong
+        except Exception as error:
+            # save it
+            errors.append(error)
+        # all done
+        return
+    # make the threads
+    workers = [ threading.Thread(target=record, args=(source,)) for source in range(threads) ]
+    # start them
+    for worker in workers: worker.start()
+    # and wait for them to finish
+    for worker in workers: worker.join()
+    # verify there were no problems
+    assert errors == [], errors
+    # check the data
+    with pool.connection() as db:
+        assert tuple(db.execute("SELECT COUNT(*) FROM readings;")) == ((threads*readings,),)
+
+    # lease two connections
+    mine, theirs = pool.checkout(), pool.checkout()
+    # they share the query result cache
+    assert mine.results is theirs.results
+    # look up the events of the first source through one of them
+    assert len(list(mine.select(origin))) == transactions
+    # add an event through the other
+    with theirs:
+        theirs.insert(Event.pyre_immutable(id=-2, source=0))
+    # the first one sees it
+    assert len(list(mine.select(origin))) == transactions + 1
+    # remove it
+    with theirs:
+        theirs.delete(Event, Event.id == -2)
+    # and check again
+    assert len(list(mine.select(origin))) == transactions
+
+    # make sure the next query misses
+    mine.invalidate()
+    # get the statement executor of one of the connections
+    run = mine.run
+    # and replace it with one that
+    def interfere(template, parameters=()):
+        # executes the statement and retrieves the rows
+        rows = list(run(template, parameters))
+        # and then adds an event through the other connection, before the rows are cached
+        with theirs:
+            theirs.insert(Event.pyre_immutable(id=-3, source=0))
+        # hand the rows over
+        return rows
+    # install it
+    mine.run = interfere
+    # the query doesn't see the new event
+    assert len(list(mine.select(origin))) == transactions
+    # restore the executor
+    mine.run = run
+    # verify the results were not cached, since they were out of date before they were stored
+    assert mine.statistics()["stale"] == 1
+    # so the next query sees the new event
+    assert len(list(mine.select(origin))) == transactions + 1
+    # remove it
+    with theirs:
+        theirs.delete(Event, Event.id == -3)
+    # return the connections
+    pool.checkin(server=mine)
+    pool.checkin(server=theirs)
+
+    # lease all connections
+    leased = [ pool.checkout() for _ in range(pool.maximum) ]
+    # check
+    assert pool.statistics()["utilization"] == 1
+    # don't wait for long
+    pool.timeout = 0.05 * second
+    # attempt to get one more
+    try:
+        # this should fail
+        pool.checkout()
+        # so we shouldn't get here
+        assert False, "unreachable"
+    # if it did
+    except pool.exceptions.PoolExhaustedError:
+        # no problem
+        pass
+    # verify it was counted
+    assert pool.statistics()["timeouts"] == 1
+
+    # break one of the connections
+    leased[-1].detach()
+    # and return them all, marking the broken one as suspect
+    for db in leased: pool.checkin(server=db, suspect=db is leased[-1])
+    # the broken connection is the first one to be leased again
+    with pool.connection() as db:
+        # so it has been replaced
+        assert db is not leased[-1]
+        # and it works
+        assert tuple(db.execute("SELECT COUNT(*) FROM events;")) == ((threads*transactions,),)
+    # check
+    assert pool.statistics()["failures"] == 1
+
+    # transactions that fail are rolled back
+    try:
+        # in a transaction
+        with pool.connection() as db:
+            # add an event
+            db.insert(Event.pyre_immutable(id=-1, source=-1))
+            # and bail
+            raise ValueError("bail")
+    # if all went well
+    except ValueError:
+        # no problem
+        pass
+    # check
+    with pool.connection() as db:
+        assert tuple(db.execute("SELECT COUNT(*) FROM events;")) == ((threads*transactions,),)
+
+    # expire the idle connections
+    pool.idle = 0 * second
+    # return one more, which prunes the rest
+    pool.checkin(server=pool.checkout())
+    # verify only the minimum is left
+    assert pool.statistics()["connections"] == pool.minimum
+
+    # close the pool
+    pool.detach()
+    # check
+    assert pool.statistics()["connections"] == 0
+    # clean up
+    os.remove(database)
+    # all done
+    return pool
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
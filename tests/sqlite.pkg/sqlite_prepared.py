@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Verify that records are inserted, updated, selected and deleted through prepared statements
+"""
+
+
+import sqlite3
+import pyre.db
+
+
+class Customer(pyre.db.table, id="customers"):
+    """
+    Simple customer table
+    """
+    # the data fields
+    cid = pyre.db.int().primary()
+    name = pyre.db.str().notNull()
+    balance = pyre.db.decimal(precision=7, scale=2).setDefault(0)
+
+
+class debtors(pyre.db.query, customer=Customer):
+    """
+    The customers with a negative balance
+    """
+    # the fields
+    cid = customer.cid
+    name = customer.name
+    # the restriction
+    where = (customer.balance < 0)
+
+
+def test():
+    # build a database component; the default configuration uses an in-memory database
+    db = pyre.db.sqlite(name="prepared").attach()
+    # create the table
+    db.createTable(Customer)
+
+    # make some customers; strings with quotes are no trouble for parameters
+    customers = [
+        Customer.pyre_immutable(cid=1023, name="Bit Twiddle", balance=1000),
+        Customer.pyre_immutable(cid=1024, name="Eva Lu Ator", balance=-50),
+        Customer.pyre_immutable(cid=1025, name="Broke N' Homeless", balance=-10),
+        Customer.pyre_immutable(cid=1026, name="Ni Hilist", balance=Customer.null),
+        ]
+    # insert them
+    db.insert(*customers)
+    # the records with explicit balances share a template, the one with the {NULL} doesn't
+    assert len(db.statements) == 2
+
+    # look for the debtors
+    rows = sorted(db.select(debtors))
+    # check
+    assert [ (row.cid, row.name) for row in rows ] == [
+        (1024, "Eva Lu Ator"), (1025, "Broke N' Homeless")]
+    # again, to exercise the cache
+    assert sorted(db.select(debtors)) == rows
+    assert len(db.statements) == 3
+
+    # settle a debt
+    eva = pyre.db.template(Customer)
+    eva.balance = 0
+    db.update((eva, Customer.cid == 1024))
+    # and check
+    assert [ row.cid for row in db.select(debtors) ] == [1025]
+
+    # remove a customer
+    db.delete(Customer, Customer.cid == 1025)
+    # and verify there are no more debtors
+    assert list(db.select(debtors)) == []
+
+    # limit the number of rows in each insertion statement
+    db.batch = 2
+    # make some more customers
+    customers = [
+        Customer.pyre_immutable(cid=cid, name="customer {}".format(cid), balance=cid)
+        for cid in range(2000, 2005) ]
+    # get the number of prepared statements
+    prepared = len(db.statements)
+    # insert the customers in a transaction
+    with db:
+        db.insert(*customers)
+    # check
+    assert tuple(db.execute("SELECT cid, balance FROM customers WHERE cid >= 2000;")) == tuple(
+        (cid, cid) for cid in range(2000, 2005))
+    # the rows were spread over three statements, two of which share a template
+    assert len(db.statements) == prepared + 2
+    # insert some more, the last of which clashes with an existing customer
+    try:
+        # this should fail
+        db.insert(*(
+            Customer.pyre_immutable(cid=cid, name="customer {}".format(cid), balance=cid)
+            for cid in (2005, 2006, 2004)))
+        # so we shouldn't get here
+        assert False, "unreachable"
+    # if it did
+    except sqlite3.IntegrityError:
+        # no problem
+        pass
+    # verify that none of them were inserted
+    assert tuple(db.execute("SELECT COUNT(*) FROM customers WHERE cid > 2004;")) == ((0,),)
+
+    # shrink the cache
+    db.prepared = 2
+    # run a new statement
+    db.delete(Customer, Customer.name == "Bit Twiddle")
+    # verify the least recently used statements were evicted
+    assert len(db.statements) == 2
+
+    # detach
+    db.detach()
+    # and verify the cache was cleared
+    assert db.statements == {}
+
+    # all done
+    return db
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file
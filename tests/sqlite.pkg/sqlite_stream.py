@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis
+# orthologue
+# (c) 1998-2023 all rights reserved
+#
+
+
+"""
+Stream the results of a large query and verify that memory usage stays flat
+"""
+
+
+import tracemalloc
+import pyre.db
+import journal
+
+# if necessary
+channel = journal.debug("sqlite.stream")
+# channel.active = True
+
+
+class Measurement(pyre.db.table, id="measurements"):
+    """
+    Simple measurement table
+    """
+    # the data fields
+    id = pyre.db.int().primary()
+    sensor = pyre.db.str().notNull()
+    value = pyre.db.float()
+
+
+class readings(pyre.db.query, measurement=Measurement):
+    """
+    The readings of one of the sensors
+    """
+    # the fields
+    id = measurement.id
+    value = measurement.value
+    # the restriction
+    where = (measurement.sensor == "alpha")
+
+
+def measurements(count):
+    """
+    Generate {count} measurements from a pair of sensors
+    """
+    # go through the ids
+    for id in range(count):
+        # make a measurement
+        yield Measurement.pyre_immutable(
+            id=id, sensor="alpha" if id % 2 else "beta", value=id / 10)
+    # all done
+    return
+
+
+def test():
+    # the number of records
+    count = 100000
+
+    # build a database component; the default configuration uses an in-memory database
+    db = pyre.db.sqlite(name="stream").attach()
+    # create the table
+    db.createTable(Measurement)
+    # and populate it
+    db.load(measurements(count))
+
+    # start tracking memory allocations
+    tracemalloc.start()
+    # stream the readings
+    total = 0
+    for reading in db.stream(readings, fetch=100):
+        # and add them up
+        total += reading.value
+    # get the high water mark
+    _, streamed = tracemalloc.get_traced_memory()
+    # start over
+    tracemalloc.stop()
+    tracemalloc.start()
+    # now, retrieve them all at once
+    selected = list(db.select(readings))
+    # get the high water mark
+    _, held = tracemalloc.get_traced_memory()
+    # done tracking
+    tracemalloc.stop()
+    # report
+    channel.log("stream: {:.1f} kb, select: {:.1f} kb".format(streamed / 1024, held / 1024))
+
+    # check the results
+    assert total == sum(reading.value for reading in selected)
+    # and verify that streaming required a fraction of the memory
+    assert 10 * streamed < held
+
+    # now, ask for columns
+    batches = list(db.stream(readings, fetch=20000, columns=True))
+    # there should be two full batches and a partial one
+    assert [ len(ids) for ids, values in batches ] == [20000, 20000, count // 2 - 40000]
+    # check the contents
+    assert batches[0][0][:3] == (1, 3, 5)
+    assert sum(sum(values) for ids, values in batches) == total
+
+    # abandon a stream part of the way through
+    for reading in db.stream(readings, fetch=10):
+        # after the first one
+        break
+    # and verify the connection is still usable
+    assert tuple(db.execute("SELECT COUNT(*) FROM measurements;")) == ((count,),)
+
+    # detach
+    db.detach()
+    # all done
+    return db
+
+
+# main
+if __name__ == "__main__":
+    test()
+
+
+# end of file